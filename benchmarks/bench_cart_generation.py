@@ -0,0 +1,91 @@
+"""Compare the old scan-and-shuffle cart composition with the inventory sampler.
+
+The old path rebuilt and shuffled the list of in-stock products for every
+cart, which is O(carts x products). ``DataGenerator.iter_cart_data`` now draws
+from ``InventorySampler`` in O(products per cart). Both paths compose the
+same number of carts over the same catalogue; every output is checked against
+the stock and per-cart limits. Run with
+``python -m benchmarks.bench_cart_generation``.
+"""
+
+import argparse
+import random
+import time
+
+from utils.data_generator import DataGenerator
+
+MAX_PRODUCTS_PER_CART = 3
+MAX_QUANTITY_PER_PRODUCT = 3
+
+
+def scan_and_shuffle_carts(product_ids, products_quantity, num_carts, max_products_per_cart, max_quantity_per_product):
+    """Compose carts the old way: scan and shuffle every in-stock id for each cart."""
+    carts = []
+    for _ in range(num_carts):
+        num_products = min(random.randint(1, max_products_per_cart), len(product_ids))
+        available_products = [product_id for product_id in product_ids if products_quantity.get(product_id, 0) > 0]
+        random.shuffle(available_products)
+        products = []
+        for product_id in available_products[:num_products]:
+            quantity = random.randint(1, min(max_quantity_per_product, products_quantity[product_id]))
+            products.append({"idProduto": product_id, "quantidade": quantity})
+            products_quantity[product_id] -= quantity
+        carts.append({"produtos": products})
+    return carts
+
+
+def sampled_carts(product_ids, products_quantity, num_carts, max_products_per_cart, max_quantity_per_product):
+    """Compose carts with the inventory sampler."""
+    return list(
+        DataGenerator.iter_cart_data(
+            product_ids, products_quantity, num_carts, max_products_per_cart, max_quantity_per_product
+        )
+    )
+
+
+def check(carts, stock):
+    """Raise ValueError unless carts respect the starting stock and per-cart limits."""
+    reserved = {}
+    for cart in carts:
+        ids = [product["idProduto"] for product in cart["produtos"]]
+        if len(ids) != len(set(ids)) or len(ids) > MAX_PRODUCTS_PER_CART:
+            raise ValueError(f"Invalid cart composition: {cart}")
+        for product in cart["produtos"]:
+            if not 1 <= product["quantidade"] <= MAX_QUANTITY_PER_PRODUCT:
+                raise ValueError(f"Invalid quantity: {product}")
+            reserved[product["idProduto"]] = reserved.get(product["idProduto"], 0) + product["quantidade"]
+    oversold = [product_id for product_id, quantity in reserved.items() if quantity > stock[product_id]]
+    if oversold:
+        raise ValueError(f"Carts reserve more than the stock of {len(oversold)} product(s)")
+
+
+def run(label, compose, num_products, num_carts):
+    """Compose num_carts carts over num_products products and return carts per second."""
+    product_ids = [f"product-{index}" for index in range(num_products)]
+    stock = {product_id: random.randint(10, 100) for product_id in product_ids}
+    products_quantity = dict(stock)
+
+    started = time.perf_counter()
+    carts = compose(product_ids, products_quantity, num_carts, MAX_PRODUCTS_PER_CART, MAX_QUANTITY_PER_PRODUCT)
+    elapsed = time.perf_counter() - started
+    check(carts, stock)
+    rate = num_carts / elapsed
+    print(f"{label:<22} {num_products:>8} products {num_carts:>8} carts  {elapsed:8.3f} s  {rate:12.1f} carts/s")
+    return rate
+
+
+def main():
+    """Run both paths for each catalogue size and print the speed-up."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", default="1000,10000", help="comma-separated catalogue sizes")
+    parser.add_argument("--carts", type=int, default=2000, help="carts per run")
+    args = parser.parse_args()
+
+    for num_products in (int(value) for value in args.products.split(",")):
+        before = run("scan and shuffle", scan_and_shuffle_carts, num_products, args.carts)
+        after = run("inventory sampler", sampled_carts, num_products, args.carts)
+        print(f"speed-up {after / before:.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
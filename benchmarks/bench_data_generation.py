@@ -0,0 +1,52 @@
+"""Compare per-record Faker generation with the batched DataGenerator path.
+
+Builds the same number of user and product payloads with per-call Faker
+methods (``DataGenerator.fake_*``, the old behaviour) and with
+``DataGenerator.batch_*`` (values drawn in bulk from pre-sampled provider
+pools), and prints records per second and the speed-up. Run with
+``python -m benchmarks.bench_data_generation``.
+"""
+
+import argparse
+import random
+import time
+
+from utils.data_generator import DataGenerator
+
+
+def run(label, build, num_records):
+    """Build num_records records with build and return records per second."""
+    started = time.perf_counter()
+    records = build(num_records)
+    elapsed = time.perf_counter() - started
+    if len(records) != num_records:
+        raise ValueError(f"{label} built {len(records)} records instead of {num_records}")
+    rate = num_records / elapsed
+    print(f"{label:<28} {num_records:>8} records  {elapsed:8.3f} s  {rate:12.1f} rec/s")
+    return rate
+
+
+def main():
+    """Run both paths for users and products and print the speed-up."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--records", type=int, default=20000, help="records per variant")
+    args = parser.parse_args()
+
+    variants = {
+        "users": (
+            lambda n: [DataGenerator.fake_user_data(random.random() < 0.2) for _ in range(n)],
+            DataGenerator.batch_user_data,
+        ),
+        "products": (
+            lambda n: [DataGenerator.fake_product_data() for _ in range(n)],
+            DataGenerator.batch_product_data,
+        ),
+    }
+    for kind, (per_record, batched) in variants.items():
+        before = run(f"{kind}: per-record Faker", per_record, args.records)
+        after = run(f"{kind}: batched pools", batched, args.records)
+        print(f"{kind}: speed-up {after / before:.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
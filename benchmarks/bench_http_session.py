@@ -0,0 +1,47 @@
+"""Compare per-call connections with the pooled keep-alive session.
+
+Starts the bundled fake ServeRest on an ephemeral port and issues the
+same GET with ``requests.get`` (a new TCP connection per call, the old
+behaviour) and with the shared session from ``utils.session`` (connections
+reused from the pool). Run with ``python -m benchmarks.bench_http_session``.
+"""
+
+import argparse
+import time
+
+import requests
+
+from fake_serverest import FakeServeRest
+from utils.session import SessionManager
+
+
+def run(label, call, url, num_requests):
+    """Issue num_requests calls and return requests per second."""
+    started = time.perf_counter()
+    for _ in range(num_requests):
+        call(url).raise_for_status()
+    elapsed = time.perf_counter() - started
+    rate = num_requests / elapsed
+    print(f"{label:<28} {num_requests:>6} requests  {elapsed:8.3f} s  {rate:10.1f} req/s")
+    return rate
+
+
+def main():
+    """Run both variants against the fake server and print the speed-up."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--requests", type=int, default=2000, help="requests per variant")
+    args = parser.parse_args()
+
+    with FakeServeRest() as server:
+        url = f"{server.url}/produtos"
+        try:
+            before = run("requests.get (no pooling)", requests.get, url, args.requests)
+            session = SessionManager.get_session()
+            after = run("pooled keep-alive session", session.get, url, args.requests)
+            print(f"speed-up: {after / before:.2f}x")
+        finally:
+            SessionManager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Measure JSON encode/decode cost per request for each serializer backend.
+
+Encodes request payloads (a user, a product, a three-line cart) and decodes
+response bodies (a login answer, product listings of 50 and 500 items) with
+the stdlib and orjson backends of ``utils.serializer``. It also shows what
+lazy decoding saves on responses nobody reads: the old eager path decoded
+text and parsed JSON for every call. Run with ``python -m benchmarks.bench_json``.
+"""
+
+import argparse
+import json
+import timeit
+
+from utils.data_generator import DataGenerator
+from utils.request import APIResponse
+from utils.serializer import OrjsonSerializer, StdlibSerializer
+
+
+def payloads():
+    """Return (label, request payload) pairs of realistic sizes."""
+    user = DataGenerator.batch_user_data(1)[0]
+    product = DataGenerator.batch_product_data(1)[0]
+    cart = {"produtos": [{"idProduto": f"BeeJh5lz3k6kSIzA{index}", "quantidade": 2} for index in range(3)]}
+    return [("user payload", user), ("product payload", product), ("cart payload", cart)]
+
+
+def bodies():
+    """Return (label, response body bytes) pairs of realistic sizes."""
+    login = {"message": "Login realizado com sucesso", "authorization": "Bearer " + "x" * 160}
+
+    def listing(count):
+        products = [
+            {**product, "_id": f"id{index:014d}"}
+            for index, product in enumerate(DataGenerator.batch_product_data(count))
+        ]
+        return {"quantidade": count, "produtos": products}
+
+    return [
+        ("login response", json.dumps(login).encode()),
+        ("50-product listing", json.dumps(listing(50)).encode()),
+        ("500-product listing", json.dumps(listing(500)).encode()),
+    ]
+
+
+def per_call(func, number):
+    """Return microseconds per call of func."""
+    return timeit.timeit(func, number=number) / number * 1e6
+
+
+def main():
+    """Print encode and decode cost per call for each backend and payload."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=2000, help="calls per measurement")
+    args = parser.parse_args()
+
+    backends = [StdlibSerializer()]
+    try:
+        backends.append(OrjsonSerializer())
+    except ImportError:
+        print("orjson is not installed; only the stdlib backend is measured\n")
+
+    header = f"{'':<26} {'bytes':>7}" + "".join(f" {backend.name + ' µs':>12}" for backend in backends)
+    print(header)
+    for label, payload in payloads():
+        size = len(backends[0].dumps(payload))
+        costs = "".join(
+            f" {per_call(lambda b=backend, p=payload: b.dumps(p), args.number):>12.2f}" for backend in backends
+        )
+        print(f"encode {label:<19} {size:>7}{costs}")
+    for label, body in bodies():
+        costs = "".join(
+            f" {per_call(lambda b=backend, d=body: b.loads(d), args.number):>12.2f}" for backend in backends
+        )
+        print(f"decode {label:<19} {len(body):>7}{costs}")
+
+    print()
+    for label, body in bodies():
+        eager = per_call(lambda body=body: (body.decode("utf-8"), json.loads(body)), args.number)
+        lazy = per_call(lambda body=body: APIResponse(200, body, {}), args.number)
+        print(f"unread {label:<22} eager {eager:>9.2f} µs  lazy {lazy:>7.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
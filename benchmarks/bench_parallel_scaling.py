@@ -0,0 +1,47 @@
+"""Measure wall-clock time of the test suite by pytest-xdist worker count.
+
+Runs the suite in subprocesses against the bundled fake ServeRest (every
+worker starts its own) with ``-n 0`` (no xdist), ``-n 2``, ``-n 4``, ... and
+prints the duration and speed-up of each run. ``--latency`` delays every fake
+response to mimic the round trip to a remote API, which is where parallel
+workers pay off. Run with ``python -m benchmarks.bench_parallel_scaling``.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+
+def run_suite(workers, latency, extra_args):
+    """Run the suite once with the given worker count and return (seconds, exit code)."""
+    env = {**os.environ, "FAKE_SERVER": "true", "FAKE_SERVER_LATENCY": str(latency)}
+    command = [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "-n", str(workers), *extra_args]
+    started = time.perf_counter()
+    result = subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+    return time.perf_counter() - started, result.returncode
+
+
+def main():
+    """Run the suite for each worker count and print the scaling table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default="0,2,4", help="comma-separated worker counts; 0 runs without xdist")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake server delay per response in seconds")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per worker count; the fastest is reported")
+    parser.add_argument("pytest_args", nargs="*", help="extra pytest arguments, after --")
+    args = parser.parse_args()
+
+    baseline = None
+    print(f"{'workers':>7} {'wall s':>9} {'speed-up':>9}")
+    for workers in (int(value) for value in args.workers.split(",")):
+        runs = [run_suite(workers, args.latency, args.pytest_args) for _ in range(args.repeat)]
+        elapsed = min(seconds for seconds, _ in runs)
+        failed = any(code != 0 for _, code in runs)
+        baseline = baseline or elapsed
+        note = "  (tests failed)" if failed else ""
+        print(f"{workers:>7} {elapsed:>9.2f} {baseline / elapsed:>8.2f}x{note}")
+
+
+if __name__ == "__main__":
+    main()
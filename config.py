@@ -15,6 +15,10 @@ load_dotenv()
 
 # API Configuration
 BASE_URI = os.getenv("BASE_URI", "https://serverest.dev")
+# Run tests against the bundled in-memory ServeRest (fake_serverest) on a local ephemeral port
+FAKE_SERVER = os.getenv("FAKE_SERVER", "false").lower() == "true"
+# Seconds the fake server waits before every response, to mimic a network round trip
+FAKE_SERVER_LATENCY = float(os.getenv("FAKE_SERVER_LATENCY", "0"))
 
 # Test Data Limits Configuration
 # These values control how many test entities are created during test execution
@@ -22,7 +26,104 @@ MAX_USERS_COUNT = int(os.getenv("MAX_USERS_COUNT", "3"))
 MAX_PRODUCTS_COUNT = int(os.getenv("MAX_PRODUCTS_COUNT", "6"))
 MAX_CARTS_COUNT = int(os.getenv("MAX_CARTS_COUNT", "3"))
 
+# Seed for reproducible test data; empty picks a fresh one, shown in the pytest header
+DATA_SEED = int(os.environ["DATA_SEED"]) if os.getenv("DATA_SEED") else None
+# Records DataGenerator builds per batch when streaming users and products
+DATA_BATCH_SIZE = int(os.getenv("DATA_BATCH_SIZE", "1000"))
+
+# Save generated test data to tests/data (written in the background) for debugging
+DATA_SNAPSHOT = os.getenv("DATA_SNAPSHOT", "false").lower() == "true"
+
 # Cart Configuration
 # These values control cart creation behavior
 MAX_PRODUCTS_PER_CART_COUNT = int(os.getenv("MAX_PRODUCTS_PER_CART_COUNT", "3"))
 MAX_QUANTITY_PER_PRODUCT = int(os.getenv("MAX_QUANTITY_PER_PRODUCT", "3"))
+
+# HTTP Session Configuration
+# These values control the pooled keep-alive session shared by all API clients
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+HTTP_KEEP_ALIVE = os.getenv("HTTP_KEEP_ALIVE", "true").lower() == "true"
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+
+# HTTP Retry Configuration
+# Retries after a transport error or a status in HTTP_RETRY_STATUSES, with jittered exponential backoff;
+# add POST to HTTP_RETRY_METHODS only if repeating a create after a lost answer is acceptable
+HTTP_RETRY_ATTEMPTS = int(os.getenv("HTTP_RETRY_ATTEMPTS", "2"))
+HTTP_RETRY_METHODS = tuple(filter(None, os.getenv("HTTP_RETRY_METHODS", "GET,PUT,DELETE").upper().split(",")))
+HTTP_RETRY_STATUSES = tuple(
+    int(code) for code in os.getenv("HTTP_RETRY_STATUSES", "429,502,503,504").split(",") if code
+)
+HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", "0.2"))
+HTTP_RETRY_BACKOFF_MAX = float(os.getenv("HTTP_RETRY_BACKOFF_MAX", "5"))
+# Consecutive failures (transport errors, 429, 5xx) that open an endpoint's circuit; 0 disables the breaker
+HTTP_BREAKER_THRESHOLD = int(os.getenv("HTTP_BREAKER_THRESHOLD", "5"))
+# Seconds an open circuit fails fast before one trial call is let through
+HTTP_BREAKER_RESET_TIMEOUT = float(os.getenv("HTTP_BREAKER_RESET_TIMEOUT", "10"))
+
+# HTTP Rate Limit Configuration
+# Token-bucket pacing of every API call, e.g. to avoid throttling on a shared staging server; 0 is unlimited
+HTTP_RATE_LIMIT = float(os.getenv("HTTP_RATE_LIMIT", "0"))
+# Calls allowed back to back before pacing starts, for the global and per-endpoint buckets
+HTTP_RATE_BURST = int(os.getenv("HTTP_RATE_BURST", "10"))
+# Comma-separated "/<endpoint>=<req/s>[:<burst>]" entries, e.g. "/produtos=5,/carrinhos=5:10"
+HTTP_ENDPOINT_RATE_LIMITS = os.getenv("HTTP_ENDPOINT_RATE_LIMITS", "")
+
+# HTTP Response Cache Configuration
+# Opt-in TTL + LRU cache of GET responses shared by all clients; writes invalidate the touched resource
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "false").lower() == "true"
+HTTP_CACHE_TTL = float(os.getenv("HTTP_CACHE_TTL", "30"))
+HTTP_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "1024"))
+
+# Login Token Configuration
+# Tokens are cached per credential; TOKEN_TTL is the lifetime assumed when a token carries no JWT exp claim
+TOKEN_TTL = float(os.getenv("TOKEN_TTL", "600"))
+# Seconds before expiry a cached token is renewed
+TOKEN_REFRESH_MARGIN = float(os.getenv("TOKEN_REFRESH_MARGIN", "60"))
+# "true" renews tokens from a background thread; "false" renews them on their next use
+TOKEN_AUTO_REFRESH = os.getenv("TOKEN_AUTO_REFRESH", "true").lower() == "true"
+
+# JSON Configuration
+# "auto" uses orjson when installed and the standard library otherwise; "stdlib" or "orjson" force one
+JSON_BACKEND = os.getenv("JSON_BACKEND", "auto")
+
+# Async Client Configuration
+# Connections, and so requests in flight, per async client stack and event loop; no thread is held per request
+ASYNC_MAX_CONNECTIONS = int(os.getenv("ASYNC_MAX_CONNECTIONS", "100"))
+
+# Bulk Seeding Configuration
+# Number of concurrent workers used by fixtures to create users, products and carts
+SEED_CONCURRENCY = int(os.getenv("SEED_CONCURRENCY", "8"))
+# Records a streaming seed (utils.stream_seed) keeps in flight; bounds its memory use
+SEED_STREAM_WINDOW = int(os.getenv("SEED_STREAM_WINDOW", "1000"))
+# Delete every user, product and cart the run created once it is over (plugins.teardown)
+SESSION_TEARDOWN = os.getenv("SESSION_TEARDOWN", "true").lower() == "true"
+
+# Log Writer Configuration
+# These values control the background thread that writes HTTP logs to disk
+LOG_BUFFER_SIZE = int(os.getenv("LOG_BUFFER_SIZE", "10000"))
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "256"))
+LOG_FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL", "0.5"))
+# "block" waits for buffer space (backpressure), "drop" discards new records when full
+LOG_OVERFLOW_POLICY = os.getenv("LOG_OVERFLOW_POLICY", "block")
+
+# Structured Log Configuration
+# JSON Lines request log (one record per HTTP call) for querying with utils.log_reader
+STRUCTURED_LOG_ENABLED = os.getenv("STRUCTURED_LOG_ENABLED", "true").lower() == "true"
+# "none", "gzip" or "zstd" (zstd requires the zstandard package)
+STRUCTURED_LOG_COMPRESSION = os.getenv("STRUCTURED_LOG_COMPRESSION", "gzip")
+STRUCTURED_LOG_MAX_BYTES = int(os.getenv("STRUCTURED_LOG_MAX_BYTES", str(100 * 1024 * 1024)))
+
+# Latency Recorder Configuration
+# Call durations kept per endpoint and per client operation for percentiles (a uniform sample beyond that)
+LATENCY_RESERVOIR_SIZE = int(os.getenv("LATENCY_RESERVOIR_SIZE", "10000"))
+# Most recent calls kept in full, e.g. for per-test latency budgets
+LATENCY_RECENT_SAMPLES = int(os.getenv("LATENCY_RECENT_SAMPLES", "10000"))
+
+# Latency Budget Configuration
+# Comma-separated "<Client>.<method>:<pNN|max>=<milliseconds>" entries,
+# e.g. "Products.get_product:p95=150,Login.login:p99=300"
+LATENCY_BUDGETS = os.getenv("LATENCY_BUDGETS", "")
+# "warn" reports exceeded budgets, "fail" also fails the run
+LATENCY_BUDGET_MODE = os.getenv("LATENCY_BUDGET_MODE", "warn")
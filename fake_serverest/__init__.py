@@ -0,0 +1,6 @@
+"""Local, in-memory ServeRest stand-in for offline and high-rate runs."""
+
+from fake_serverest.server import FakeServeRest
+from fake_serverest.store import ServeRestStore
+
+__all__ = ["FakeServeRest", "ServeRestStore"]
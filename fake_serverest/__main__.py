@@ -0,0 +1,24 @@
+"""Run the fake ServeRest server in the foreground: ``python -m fake_serverest``."""
+
+import argparse
+import contextlib
+import threading
+
+from fake_serverest.server import FakeServeRest
+
+
+def main():
+    """Serve until interrupted."""
+    parser = argparse.ArgumentParser(description="Local in-memory ServeRest stand-in.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind")
+    parser.add_argument("--port", type=int, default=3000, help="port to listen on (0 picks a free one)")
+    args = parser.parse_args()
+
+    with FakeServeRest(args.host, args.port) as server:
+        print(f"Fake ServeRest listening on {server.url} (Ctrl+C to stop)")
+        with contextlib.suppress(KeyboardInterrupt):
+            threading.Event().wait()
+
+
+if __name__ == "__main__":
+    main()
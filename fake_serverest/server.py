@@ -0,0 +1,200 @@
+"""HTTP/1.1 front end serving a ServeRestStore on a local port."""
+
+import hashlib
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from fake_serverest.store import ServeRestStore
+
+MSG_BAD_JSON = "Adicione aspas em todos os valores. Para mais informações acesse a issue https://github.com/ServeRest/ServeRest/issues/225"
+
+
+class ServeRestHandler(BaseHTTPRequestHandler):
+    """Route ServeRest requests to the server's store and write JSON answers."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # delayed-ACK interaction stalls every reused connection by ~40 ms.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        """Answer list and lookup requests."""
+        self._dispatch("GET")
+
+    def do_POST(self):
+        """Answer create and login requests."""
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        """Answer update requests."""
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        """Answer delete and cart-closing requests."""
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        """Silence per-request access logs."""
+        pass
+
+    def _dispatch(self, method):
+        """Parse the request, run the matching store operation and send its answer."""
+        store = self.server.store
+        parts = urlsplit(self.path)
+        segments = [segment for segment in parts.path.split("/") if segment]
+        resource = segments[0] if segments else ""
+        record_id = segments[1] if len(segments) == 2 else None
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        authorization = self.headers.get("Authorization")
+
+        body = {}
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            raw = self.rfile.read(length)
+            if method in ("POST", "PUT"):
+                try:
+                    body = json.loads(raw)
+                except ValueError:
+                    body = None
+                if not isinstance(body, dict):
+                    return self._send(400, {"message": MSG_BAD_JSON})
+
+        route = (method, resource, record_id is not None) if len(segments) <= 2 else None
+        if route == ("GET", "usuarios", False):
+            answer = store.list_users(query)
+        elif route == ("POST", "usuarios", False):
+            answer = store.create_user(body)
+        elif route == ("GET", "usuarios", True):
+            answer = store.get_user(record_id)
+        elif route == ("PUT", "usuarios", True):
+            answer = store.update_user(record_id, body)
+        elif route == ("DELETE", "usuarios", True):
+            answer = store.delete_user(record_id)
+        elif route == ("POST", "login", False):
+            answer = store.login(body)
+        elif route == ("GET", "produtos", False):
+            answer = store.list_products(query)
+        elif route == ("POST", "produtos", False):
+            answer = store.create_product(authorization, body)
+        elif route == ("GET", "produtos", True):
+            answer = store.get_product(record_id)
+        elif route == ("PUT", "produtos", True):
+            answer = store.update_product(authorization, record_id, body)
+        elif route == ("DELETE", "produtos", True):
+            answer = store.delete_product(authorization, record_id)
+        elif route == ("GET", "carrinhos", False):
+            answer = store.list_carts(query)
+        elif route == ("POST", "carrinhos", False):
+            answer = store.create_cart(authorization, body)
+        elif route == ("DELETE", "carrinhos", True) and record_id in ("concluir-compra", "cancelar-compra"):
+            answer = store.close_cart(authorization, restock=record_id == "cancelar-compra")
+        elif route == ("GET", "carrinhos", True):
+            answer = store.get_cart(record_id)
+        else:
+            answer = (
+                405,
+                {
+                    "message": f"Não é possível realizar {method} em {parts.path}. "
+                    "Acesse https://serverest.dev para ver as rotas disponíveis e como utilizá-las."
+                },
+            )
+        self._send(*answer, conditional=method == "GET")
+
+    def _send(self, status, body, conditional=False):
+        """Write a JSON response; successful GETs carry an ETag and honour If-None-Match."""
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        payload = json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        etag = None
+        if conditional and status == 200:
+            etag = f'W/"{len(payload):x}-{hashlib.blake2b(payload, digest_size=12).hexdigest()}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class ServeRestHTTPServer(ThreadingHTTPServer):
+    """Threading HTTP server holding the shared store."""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address, store, latency=0.0):
+        """Bind to address and serve store, delaying every response by latency seconds."""
+        self.store = store
+        self.latency = latency
+        super().__init__(address, ServeRestHandler)
+
+    def handle_error(self, request, client_address):
+        """Ignore clients that hung up before their answer was sent, e.g. after a read timeout."""
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class FakeServeRest:
+    """Local ServeRest stand-in running on a background thread.
+
+    ``port=0`` picks a free ephemeral port; read the address from ``url``.
+    ``latency`` adds a fixed delay to every response to mimic a network hop::
+
+        with FakeServeRest() as server:
+            users = Users(base_uri=server.url)
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, store=None, latency=0.0):
+        """Configure the address, the store to serve and the per-response delay in seconds."""
+        self.host = host
+        self.port = port
+        self.store = store or ServeRestStore()
+        self.latency = latency
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        """Return the base URI of the running server."""
+        if self._server is None:
+            raise ValueError("FakeServeRest is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Bind the socket and start serving; return self."""
+        if self._server is None:
+            self._server = ServeRestHTTPServer((self.host, self.port), self.store, self.latency)
+            self._thread = threading.Thread(target=self._server.serve_forever, name="fake-serverest", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the socket."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self):
+        """Start the server for a with block."""
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        """Stop the server at the end of a with block."""
+        self.stop()
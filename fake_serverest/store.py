@@ -0,0 +1,477 @@
+"""In-memory ServeRest data with the indexes and business rules of the real API.
+
+Every operation returns ``(status, body)`` exactly as ServeRest would answer
+it, messages included. Records are never changed in place: updates store a
+new dict, so a record handed out can be serialised outside the lock.
+"""
+
+import random
+import re
+import secrets
+import string
+import threading
+import time
+from collections import deque
+
+ID_LENGTH = 16
+ID_ALPHABET = string.ascii_letters + string.digits
+ID_PATTERN = re.compile(rf"^[A-Za-z0-9]{{{ID_LENGTH}}}$")
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+# ServeRest tokens are JWTs valid for 600 seconds
+TOKEN_TTL = 600
+
+MSG_CREATED = "Cadastro realizado com sucesso"
+MSG_UPDATED = "Registro alterado com sucesso"
+MSG_DELETED = "Registro excluído com sucesso"
+MSG_NOTHING_DELETED = "Nenhum registro excluído"
+MSG_LOGIN = "Login realizado com sucesso"
+MSG_LOGIN_FAILED = "Email e/ou senha inválidos"
+MSG_UNAUTHORIZED = "Token de acesso ausente, inválido, expirado ou usuário do token não existe mais"
+MSG_ADMIN_ONLY = "Rota exclusiva para administradores"
+MSG_EMAIL_TAKEN = "Este email já está sendo usado"
+MSG_NAME_TAKEN = "Já existe produto com esse nome"
+MSG_USER_NOT_FOUND = "Usuário não encontrado"
+MSG_PRODUCT_NOT_FOUND = "Produto não encontrado"
+MSG_CART_NOT_FOUND = "Carrinho não encontrado"
+MSG_USER_HAS_CART = "Não é permitido excluir usuário com carrinho cadastrado"
+MSG_PRODUCT_IN_CART = "Não é permitido excluir produto que faz parte de carrinho"
+MSG_DUPLICATE_PRODUCT = "Não é permitido possuir produto duplicado"
+MSG_ONE_CART = "Não é permitido ter mais de 1 carrinho"
+MSG_NO_STOCK = "Produto não possui quantidade suficiente"
+MSG_NO_CART = "Não foi encontrado carrinho para esse usuário"
+MSG_RESTOCKED = "Registro excluído com sucesso. Estoque dos produtos reabastecido"
+
+USER_FIELDS = ("nome", "email", "password", "administrador")
+PRODUCT_FIELDS = ("nome", "preco", "descricao", "quantidade")
+CART_FILTERS = ("_id", "precoTotal", "quantidadeTotal", "idUsuario")
+
+
+def new_id():
+    """Return a 16-character alphanumeric id like the ones ServeRest generates."""
+    return "".join(random.choices(ID_ALPHABET, k=ID_LENGTH))
+
+
+def _check_string(body, field, errors, validate=None, message=None):
+    """Add an error unless body[field] is a non-empty string passing validate."""
+    value = body.get(field)
+    if field not in body:
+        errors[field] = f"{field} é obrigatório"
+    elif not isinstance(value, str):
+        errors[field] = f"{field} deve ser uma string"
+    elif not value:
+        errors[field] = f"{field} não pode ficar em branco"
+    elif validate and not validate(value):
+        errors[field] = message
+
+
+def _check_integer(body, field, errors, minimum, message):
+    """Add an error unless body[field] is an integer of at least minimum."""
+    value = body.get(field)
+    if field not in body:
+        errors[field] = f"{field} é obrigatório"
+    elif isinstance(value, bool) or not isinstance(value, int | float):
+        errors[field] = f"{field} deve ser um número"
+    elif value != int(value):
+        errors[field] = f"{field} deve ser um inteiro"
+    elif value < minimum:
+        errors[field] = message
+
+
+def _check_unknown(body, allowed, errors):
+    """Add an error for every field that is not allowed."""
+    for field in body:
+        if field not in allowed:
+            errors[field] = f"{field} não é permitido"
+
+
+def validate_user(body):
+    """Return ServeRest validation errors for a user payload."""
+    errors = {}
+    _check_unknown(body, USER_FIELDS, errors)
+    _check_string(body, "nome", errors)
+    _check_string(body, "email", errors, EMAIL_PATTERN.match, "email deve ser um email válido")
+    _check_string(body, "password", errors)
+    _check_string(
+        body, "administrador", errors, {"true", "false"}.__contains__, "administrador deve ser 'true' ou 'false'"
+    )
+    return errors
+
+
+def validate_product(body):
+    """Return ServeRest validation errors for a product payload."""
+    errors = {}
+    _check_unknown(body, PRODUCT_FIELDS, errors)
+    _check_string(body, "nome", errors)
+    _check_integer(body, "preco", errors, 1, "preco deve ser um número positivo")
+    _check_string(body, "descricao", errors)
+    _check_integer(body, "quantidade", errors, 0, "quantidade deve ser maior ou igual a 0")
+    return errors
+
+
+def validate_cart(body):
+    """Return ServeRest validation errors for a cart payload."""
+    errors = {}
+    _check_unknown(body, ("produtos",), errors)
+    products = body.get("produtos")
+    if "produtos" not in body:
+        errors["produtos"] = "produtos é obrigatório"
+    elif not isinstance(products, list) or not products:
+        errors["produtos"] = "produtos deve ser um array com ao menos 1 item"
+    else:
+        for index, item in enumerate(products):
+            if not isinstance(item, dict):
+                errors[f"produtos[{index}]"] = f"produtos[{index}] deve ser um objeto"
+                continue
+            item_errors = {}
+            _check_unknown(item, ("idProduto", "quantidade"), item_errors)
+            _check_string(item, "idProduto", item_errors)
+            _check_integer(item, "quantidade", item_errors, 1, "quantidade deve ser um número positivo")
+            errors.update({f"produtos[{index}].{field}": message for field, message in item_errors.items()})
+    return errors
+
+
+def validate_id(record_id):
+    """Return a validation error body for a malformed id, or None."""
+    if ID_PATTERN.match(record_id):
+        return None
+    return {"id": f"id deve ter exatamente {ID_LENGTH} caracteres alfanuméricos"}
+
+
+class ServeRestStore:
+    """Users, products, carts and tokens, indexed the way the API looks them up.
+
+    Unique fields (user email, product name), the cart of each user and the
+    carts holding each product have their own dict index, so lookups, conflict
+    checks and delete guards never scan a collection. One lock serialises
+    writes; reads of the immutable records it guards are cheap.
+    """
+
+    def __init__(self):
+        """Start with empty collections."""
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """Drop every record and token."""
+        with self._lock:
+            self.users = {}
+            self.users_by_email = {}
+            self.products = {}
+            self.products_by_name = {}
+            self.carts = {}
+            self.cart_by_user = {}
+            self.carts_by_product = {}
+            self.tokens = {}
+            # (expires, token) in issue order, which is expiry order as every token lives TOKEN_TTL
+            self.token_expiry = deque()
+
+    # Querying
+
+    @staticmethod
+    def _filter(records, query, allowed, indexes):
+        """Return records whose fields equal every query value, compared as strings.
+
+        indexes maps a query key to a function returning the only matching
+        record id (or None), so exact lookups on indexed fields skip the scan.
+        """
+        errors = {key: f"{key} não é permitido" for key in query if key not in allowed}
+        if errors:
+            return errors, None
+        candidates = None
+        for key, lookup in indexes.items():
+            if key in query:
+                record_id = lookup(query[key])
+                candidates = [records[record_id]] if record_id in records else []
+                break
+        if candidates is None:
+            candidates = records.values()
+        matches = [record for record in candidates if all(str(record[key]) == value for key, value in query.items())]
+        return None, matches
+
+    def list_users(self, query):
+        """GET /usuarios."""
+        with self._lock:
+            errors, users = self._filter(
+                self.users,
+                query,
+                ("_id", *USER_FIELDS),
+                {"_id": lambda value: value, "email": self.users_by_email.get},
+            )
+        if errors:
+            return 400, errors
+        return 200, {"quantidade": len(users), "usuarios": users}
+
+    def list_products(self, query):
+        """GET /produtos."""
+        with self._lock:
+            errors, products = self._filter(
+                self.products,
+                query,
+                ("_id", *PRODUCT_FIELDS),
+                {"_id": lambda value: value, "nome": self.products_by_name.get},
+            )
+        if errors:
+            return 400, errors
+        return 200, {"quantidade": len(products), "produtos": products}
+
+    def list_carts(self, query):
+        """GET /carrinhos."""
+        with self._lock:
+            errors, carts = self._filter(
+                self.carts,
+                query,
+                CART_FILTERS,
+                {"_id": lambda value: value, "idUsuario": self.cart_by_user.get},
+            )
+        if errors:
+            return 400, errors
+        return 200, {"quantidade": len(carts), "carrinhos": carts}
+
+    def _get(self, records, record_id, missing_message):
+        """Return one record by id as ServeRest's GET /<resource>/{id}."""
+        error = validate_id(record_id)
+        if error:
+            return 400, error
+        record = records.get(record_id)
+        if record is None:
+            return 400, {"message": missing_message}
+        return 200, record
+
+    def get_user(self, user_id):
+        """GET /usuarios/{_id}."""
+        return self._get(self.users, user_id, MSG_USER_NOT_FOUND)
+
+    def get_product(self, product_id):
+        """GET /produtos/{_id}."""
+        return self._get(self.products, product_id, MSG_PRODUCT_NOT_FOUND)
+
+    def get_cart(self, cart_id):
+        """GET /carrinhos/{_id}."""
+        return self._get(self.carts, cart_id, MSG_CART_NOT_FOUND)
+
+    # Users and login
+
+    def _put_user(self, user_id, body):
+        """Store a user record and index its email."""
+        user = {field: body[field] for field in USER_FIELDS}
+        user["_id"] = user_id
+        previous = self.users.get(user_id)
+        if previous is not None:
+            del self.users_by_email[previous["email"]]
+        self.users[user_id] = user
+        self.users_by_email[user["email"]] = user_id
+
+    def create_user(self, body):
+        """POST /usuarios."""
+        errors = validate_user(body)
+        if errors:
+            return 400, errors
+        with self._lock:
+            if body["email"] in self.users_by_email:
+                return 400, {"message": MSG_EMAIL_TAKEN}
+            user_id = new_id()
+            self._put_user(user_id, body)
+        return 201, {"message": MSG_CREATED, "_id": user_id}
+
+    def update_user(self, user_id, body):
+        """PUT /usuarios/{_id}; an unknown id registers a new user instead."""
+        errors = validate_user(body)
+        if errors:
+            return 400, errors
+        with self._lock:
+            owner = self.users_by_email.get(body["email"])
+            if owner is not None and owner != user_id:
+                return 400, {"message": MSG_EMAIL_TAKEN}
+            if user_id not in self.users:
+                new_user_id = new_id()
+                self._put_user(new_user_id, body)
+                return 201, {"message": MSG_CREATED, "_id": new_user_id}
+            self._put_user(user_id, body)
+        return 200, {"message": MSG_UPDATED}
+
+    def delete_user(self, user_id):
+        """DELETE /usuarios/{_id}; users with a cart are kept."""
+        with self._lock:
+            if user_id in self.cart_by_user:
+                return 400, {"message": MSG_USER_HAS_CART, "idCarrinho": self.cart_by_user[user_id]}
+            user = self.users.pop(user_id, None)
+            if user is None:
+                return 200, {"message": MSG_NOTHING_DELETED}
+            del self.users_by_email[user["email"]]
+        return 200, {"message": MSG_DELETED}
+
+    def login(self, body):
+        """POST /login."""
+        errors = {}
+        _check_unknown(body, ("email", "password"), errors)
+        _check_string(body, "email", errors, EMAIL_PATTERN.match, "email deve ser um email válido")
+        _check_string(body, "password", errors)
+        if errors:
+            return 400, errors
+        with self._lock:
+            user = self.users.get(self.users_by_email.get(body["email"]))
+            if user is None or user["password"] != body["password"]:
+                return 401, {"message": MSG_LOGIN_FAILED}
+            now = time.monotonic()
+            self._prune_tokens(now)
+            token = secrets.token_urlsafe(24)
+            self.tokens[token] = (user["email"], user["password"], now + TOKEN_TTL)
+            self.token_expiry.append((now + TOKEN_TTL, token))
+        return 200, {"message": MSG_LOGIN, "authorization": f"Bearer {token}"}
+
+    def _prune_tokens(self, now):
+        """Drop tokens expired by now, so a long load test does not pile up dead ones."""
+        while self.token_expiry and self.token_expiry[0][0] < now:
+            _, token = self.token_expiry.popleft()
+            self.tokens.pop(token, None)
+
+    def _authorize(self, authorization, admin=False):
+        """Return (user, None) for a valid token, or (None, (status, body)).
+
+        Like ServeRest's JWT check, a token stops working once it expires or
+        once its user no longer exists with the same email and password.
+        """
+        scheme, _, token = (authorization or "").partition(" ")
+        entry = self.tokens.get(token) if scheme == "Bearer" else None
+        user = None
+        if entry is not None:
+            email, password, expires = entry
+            user = self.users.get(self.users_by_email.get(email))
+            if time.monotonic() > expires or user is None or user["password"] != password:
+                self.tokens.pop(token, None)
+                user = None
+        if user is None:
+            return None, (401, {"message": MSG_UNAUTHORIZED})
+        if admin and user["administrador"] != "true":
+            return None, (403, {"message": MSG_ADMIN_ONLY})
+        return user, None
+
+    # Products
+
+    def _put_product(self, product_id, body):
+        """Store a product record and index its name."""
+        product = {field: body[field] for field in PRODUCT_FIELDS}
+        product["_id"] = product_id
+        previous = self.products.get(product_id)
+        if previous is not None:
+            del self.products_by_name[previous["nome"]]
+        self.products[product_id] = product
+        self.products_by_name[product["nome"]] = product_id
+
+    def create_product(self, authorization, body):
+        """POST /produtos; admins only."""
+        with self._lock:
+            _, denied = self._authorize(authorization, admin=True)
+            if denied:
+                return denied
+        errors = validate_product(body)
+        if errors:
+            return 400, errors
+        with self._lock:
+            if body["nome"] in self.products_by_name:
+                return 400, {"message": MSG_NAME_TAKEN}
+            product_id = new_id()
+            self._put_product(product_id, body)
+        return 201, {"message": MSG_CREATED, "_id": product_id}
+
+    def update_product(self, authorization, product_id, body):
+        """PUT /produtos/{_id}; admins only, an unknown id registers a new product."""
+        with self._lock:
+            _, denied = self._authorize(authorization, admin=True)
+            if denied:
+                return denied
+        errors = validate_product(body)
+        if errors:
+            return 400, errors
+        with self._lock:
+            owner = self.products_by_name.get(body["nome"])
+            if owner is not None and owner != product_id:
+                return 400, {"message": MSG_NAME_TAKEN}
+            if product_id not in self.products:
+                new_product_id = new_id()
+                self._put_product(new_product_id, body)
+                return 201, {"message": MSG_CREATED, "_id": new_product_id}
+            self._put_product(product_id, body)
+        return 200, {"message": MSG_UPDATED}
+
+    def delete_product(self, authorization, product_id):
+        """DELETE /produtos/{_id}; admins only, products in a cart are kept."""
+        with self._lock:
+            _, denied = self._authorize(authorization, admin=True)
+            if denied:
+                return denied
+            cart_ids = self.carts_by_product.get(product_id)
+            if cart_ids:
+                return 400, {"message": MSG_PRODUCT_IN_CART, "idCarrinhos": sorted(cart_ids)}
+            product = self.products.pop(product_id, None)
+            if product is None:
+                return 200, {"message": MSG_NOTHING_DELETED}
+            del self.products_by_name[product["nome"]]
+        return 200, {"message": MSG_DELETED}
+
+    def _set_stock(self, product_id, delta):
+        """Replace a product with one whose quantidade changed by delta."""
+        product = self.products[product_id]
+        self.products[product_id] = {**product, "quantidade": product["quantidade"] + delta}
+
+    # Carts
+
+    def create_cart(self, authorization, body):
+        """POST /carrinhos; reserves stock of every product in the cart."""
+        errors = validate_cart(body)
+        with self._lock:
+            user, denied = self._authorize(authorization)
+            if denied:
+                return denied
+            if errors:
+                return 400, errors
+            items = body["produtos"]
+            if len({item["idProduto"] for item in items}) != len(items):
+                return 400, {"message": MSG_DUPLICATE_PRODUCT}
+            if user["_id"] in self.cart_by_user:
+                return 400, {"message": MSG_ONE_CART}
+
+            lines = []
+            for index, item in enumerate(items):
+                product = self.products.get(item["idProduto"])
+                detail = {"idProduto": item["idProduto"], "quantidade": item["quantidade"], "index": index}
+                if product is None:
+                    return 400, {"message": MSG_PRODUCT_NOT_FOUND, "item": detail}
+                if product["quantidade"] < item["quantidade"]:
+                    return 400, {"message": MSG_NO_STOCK, "item": detail}
+                lines.append(
+                    {"idProduto": product["_id"], "quantidade": item["quantidade"], "precoUnitario": product["preco"]}
+                )
+
+            cart_id = new_id()
+            for line in lines:
+                self._set_stock(line["idProduto"], -line["quantidade"])
+                self.carts_by_product.setdefault(line["idProduto"], set()).add(cart_id)
+            self.carts[cart_id] = {
+                "produtos": lines,
+                "precoTotal": sum(line["precoUnitario"] * line["quantidade"] for line in lines),
+                "quantidadeTotal": sum(line["quantidade"] for line in lines),
+                "idUsuario": user["_id"],
+                "_id": cart_id,
+            }
+            self.cart_by_user[user["_id"]] = cart_id
+        return 201, {"message": MSG_CREATED, "_id": cart_id}
+
+    def close_cart(self, authorization, restock):
+        """DELETE /carrinhos/concluir-compra (restock=False) or /cancelar-compra (restock=True)."""
+        with self._lock:
+            user, denied = self._authorize(authorization)
+            if denied:
+                return denied
+            cart_id = self.cart_by_user.pop(user["_id"], None)
+            if cart_id is None:
+                return 200, {"message": MSG_NO_CART}
+            cart = self.carts.pop(cart_id)
+            for line in cart["produtos"]:
+                holders = self.carts_by_product[line["idProduto"]]
+                holders.discard(cart_id)
+                if not holders:
+                    del self.carts_by_product[line["idProduto"]]
+                if restock and line["idProduto"] in self.products:
+                    self._set_stock(line["idProduto"], line["quantidade"])
+        return 200, {"message": MSG_RESTOCKED if restock else MSG_DELETED}
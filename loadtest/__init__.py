@@ -0,0 +1 @@
+"""Load generation with the ServeRest client classes; run with ``python -m loadtest``."""
@@ -0,0 +1,80 @@
+"""Command-line entry point: ``python -m loadtest``.
+
+Examples::
+
+    python -m loadtest --model closed --users 50 --processes 4 --duration 60
+    python -m loadtest --model open --rate 200 --users 100 --mix "browse_products=8,purchase=2"
+    python -m loadtest --output reports/loadtest.csv
+
+The target is ``BASE_URI`` from ``config.py`` unless ``--base-uri`` or
+``--fake-server`` (a local in-memory ServeRest) is given.
+"""
+
+import argparse
+import contextlib
+
+import config
+from fake_serverest import FakeServeRest
+from loadtest.report import format_table, teardown_totals, time_series, totals, write_series
+from loadtest.runner import MODELS, LoadSettings, run
+from loadtest.scenarios import DEFAULT_MIX, SCENARIOS
+
+
+def main():
+    """Parse arguments, run the load test and print or write the results."""
+    parser = argparse.ArgumentParser(description="Generate load with the ServeRest client classes.")
+    parser.add_argument("--model", choices=MODELS, default="closed", help="closed: N looping users; open: fixed rate")
+    parser.add_argument("--users", type=int, default=10, help="virtual users (open model: max in-flight iterations)")
+    parser.add_argument("--rate", type=float, default=10.0, help="open model: scenario iterations started per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load after setup")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes sharing users and rate")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"scenario weights; scenarios: {', '.join(SCENARIOS)}")
+    parser.add_argument("--think-time", type=float, default=0.0, help="closed model: pause between iterations (s)")
+    parser.add_argument("--interval", type=float, default=1.0, help="time series window in seconds")
+    parser.add_argument("--seed", type=int, default=None, help="seed scenario selection for repeatable runs")
+    parser.add_argument("--output", help="write the time series to this .csv or .json file")
+    parser.add_argument("--base-uri", default=config.BASE_URI, help="API to load (default: BASE_URI)")
+    parser.add_argument("--fake-server", action="store_true", help="load a local in-memory ServeRest instead")
+    parser.add_argument("--no-teardown", action="store_true", help="keep the users, products and carts the run created")
+    args = parser.parse_args()
+    if args.interval <= 0:
+        parser.error("--interval must be positive")
+
+    settings = LoadSettings(
+        model=args.model,
+        duration=args.duration,
+        processes=args.processes,
+        users=args.users,
+        rate=args.rate,
+        mix=args.mix,
+        think_time=args.think_time,
+        seed=args.seed,
+        base_uri=args.base_uri,
+        teardown=not args.no_teardown,
+    )
+    try:
+        settings.validate()
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    with FakeServeRest() if args.fake_server else contextlib.nullcontext() as server:
+        if server is not None:
+            settings.base_uri = server.url
+        results = run(settings)
+    series = time_series(results, args.interval)
+    print(format_table([(f"{row.start:g}", row) for row in series]))
+    print()
+    by_scenario = totals(results, by_scenario=True)
+    print(format_table([*by_scenario.items(), ("total", totals(results))], label="scenario"))
+    teardown = teardown_totals(results)
+    if teardown:
+        print()
+        for stats in teardown:
+            print(f"{stats.phase:<18} {stats.deleted:>7} deleted {stats.failed:>5} failed {stats.rate:>9.1f}/s")
+    if args.output:
+        write_series(series, args.output)
+        print(f"\ntime series written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Turn worker samples into throughput, latency and error-rate time series."""
+
+import csv
+import json
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+
+from services.serverest_api.teardown import TeardownStats
+from utils.metrics import percentile
+
+
+@dataclass
+class IntervalStats:
+    """Request statistics for one time window; latencies are in milliseconds."""
+
+    start: float
+    requests: int
+    errors: int
+    dropped: int
+    throughput: float
+    error_rate: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+def summarise(start, width, samples, dropped=()):
+    """Build IntervalStats for samples finished within a window of width seconds."""
+    durations = sorted(sample[2] * 1000 for sample in samples if sample[2] is not None)
+    errors = sum(1 for sample in samples if not sample[3])
+    return IntervalStats(
+        start=round(start, 3),
+        requests=len(samples),
+        errors=errors,
+        dropped=len(dropped),
+        throughput=round(len(samples) / width, 2) if width > 0 else 0.0,
+        error_rate=round(errors / len(samples), 4) if samples else 0.0,
+        p50_ms=round(percentile(durations, 50), 2),
+        p95_ms=round(percentile(durations, 95), 2),
+        p99_ms=round(percentile(durations, 99), 2),
+        max_ms=round(durations[-1], 2) if durations else 0.0,
+    )
+
+
+def time_series(results, interval=1.0):
+    """Return IntervalStats per interval-second window since the earliest worker start."""
+    origin = min(result.started for result in results)
+    buckets = {}
+    for result in results:
+        for sample in result.samples:
+            buckets.setdefault(max(0, int((sample[0] - origin) // interval)), ([], []))[0].append(sample)
+        for arrival in result.dropped:
+            buckets.setdefault(max(0, int((arrival - origin) // interval)), ([], []))[1].append(arrival)
+    if not buckets:
+        return []
+    return [summarise(index * interval, interval, *buckets.get(index, ([], []))) for index in range(max(buckets) + 1)]
+
+
+def totals(results, by_scenario=False):
+    """Return whole-run IntervalStats, overall or keyed by scenario name."""
+    origin = min(result.started for result in results)
+    samples = [sample for result in results for sample in result.samples]
+    dropped = [arrival for result in results for arrival in result.dropped]
+    width = max((sample[0] for sample in samples), default=origin) - origin
+    if not by_scenario:
+        return summarise(0.0, width, samples, dropped)
+    grouped = {}
+    for sample in samples:
+        grouped.setdefault(sample[1], []).append(sample)
+    return {name: summarise(0.0, width, grouped[name]) for name in sorted(grouped)}
+
+
+def teardown_totals(results):
+    """Return the workers' TeardownStats merged per phase, in teardown order."""
+    phases = {}
+    for result in results:
+        for stats in result.teardown:
+            phases.setdefault(stats.phase, TeardownStats(stats.phase)).merge(stats)
+    return list(phases.values())
+
+
+def write_series(series, path):
+    """Write the time series as CSV or, for a .json path, as a JSON list."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".json":
+        path.write_text(json.dumps([asdict(row) for row in series], indent=2))
+        return
+    with path.open("w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=[field.name for field in fields(IntervalStats)])
+        writer.writeheader()
+        writer.writerows(asdict(row) for row in series)
+
+
+def format_table(rows, label="t (s)"):
+    """Return rows of (name, IntervalStats) as a fixed-width text table."""
+    lines = [
+        f"{label:<18} {'requests':>9} {'req/s':>9} {'errors':>7} {'err %':>7} {'dropped':>8} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    ]
+    for name, stats in rows:
+        lines.append(
+            f"{name:<18} {stats.requests:>9} {stats.throughput:>9.1f} {stats.errors:>7} "
+            f"{stats.error_rate * 100:>7.2f} {stats.dropped:>8} {stats.p50_ms:>9.1f} {stats.p95_ms:>9.1f} "
+            f"{stats.p99_ms:>9.1f} {stats.max_ms:>9.1f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,184 @@
+"""Closed- and open-model load execution spread over worker processes.
+
+Closed model: ``users`` virtual users loop over the scenario mix, each
+starting its next iteration when the previous one (plus think time) ends.
+Open model: iterations start at a fixed ``rate`` per second whatever the
+response times; ``users`` bounds how many may be in flight, and arrivals
+finding no free virtual user are counted as dropped instead of queued, so
+slow responses cannot hide behind a delayed schedule.
+
+Every worker tracks the users, products and carts its virtual users create
+(``EntityTracker``) and, unless ``teardown`` is off, deletes what is left
+once the load has stopped, outside the measured window.
+"""
+
+import logging
+import multiprocessing
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from loadtest.scenarios import DEFAULT_MIX, ScenarioMix, VirtualUser
+from services.serverest_api.teardown import Teardown
+from utils.entity_tracker import EntityTracker
+from utils.logger import Logger
+from utils.session import SessionManager
+from utils.token_manager import TokenManager
+
+logger = logging.getLogger(__name__)
+
+MODELS = ("closed", "open")
+SETUP_TIMEOUT = 300
+
+
+@dataclass
+class LoadSettings:
+    """Parameters of one load-test run."""
+
+    model: str = "closed"
+    duration: float = 30.0
+    processes: int = 1
+    users: int = 10
+    rate: float = 10.0
+    mix: str = DEFAULT_MIX
+    think_time: float = 0.0
+    seed: int | None = None
+    base_uri: str | None = None
+    teardown: bool = True
+
+    def validate(self):
+        """Raise ValueError for settings that cannot be run."""
+        if self.model not in MODELS:
+            raise ValueError(f"model must be one of {MODELS}, got '{self.model}'")
+        if self.duration <= 0:
+            raise ValueError("duration must be positive")
+        if self.processes < 1 or self.users < self.processes:
+            raise ValueError("need at least one process and one virtual user per process")
+        if self.model == "open" and self.rate <= 0:
+            raise ValueError("rate must be positive in the open model")
+        ScenarioMix.parse(self.mix)
+
+
+@dataclass
+class WorkerResult:
+    """Samples collected by one worker process; times are epoch seconds."""
+
+    started: float
+    samples: list
+    dropped: list
+    teardown: list = field(default_factory=list)
+
+
+def share(total, parts, index):
+    """Return the part of total assigned to index when split as evenly as possible."""
+    return total // parts + (1 if index < total % parts else 0)
+
+
+def run(settings):
+    """Run the load test and return one WorkerResult per process."""
+    settings.validate()
+    context = multiprocessing.get_context()
+    with context.Manager() as manager:
+        barrier = manager.Barrier(settings.processes)
+        with ProcessPoolExecutor(settings.processes, mp_context=context) as pool:
+            futures = [pool.submit(run_worker, settings, index, barrier) for index in range(settings.processes)]
+            return [future.result() for future in futures]
+
+
+def run_worker(settings, index, barrier):
+    """Set up this process's virtual users, wait for the others, generate load, then delete what it created."""
+    # Each worker writes its own log files; sharing them would interleave and corrupt the compressed ones
+    Logger.add_worker_suffix(f"_lt{index}")
+    num_users = share(settings.users, settings.processes, index)
+    seed = None if settings.seed is None else settings.seed + index
+    rng = random.Random(seed)
+    tracker = EntityTracker.activate() if settings.teardown else None
+    session = SessionManager.create_session(pool_connections=1, pool_maxsize=num_users)
+    tokens = TokenManager(settings.base_uri)
+    vus = [VirtualUser(session, random.Random(rng.random()), settings.base_uri, tokens) for _ in range(num_users)]
+    try:
+        with ThreadPoolExecutor(min(num_users, 16), thread_name_prefix="loadtest-setup") as executor:
+            list(executor.map(lambda vu: vu.setup(), vus))
+    except Exception:
+        barrier.abort()
+        tokens.close()
+        cleanup(tracker)
+        Logger.close()
+        raise
+    barrier.wait(SETUP_TIMEOUT)
+
+    mix = ScenarioMix.parse(settings.mix)
+    started = time.time()
+    deadline = started + settings.duration
+    try:
+        if settings.model == "closed":
+            dropped = run_closed(vus, mix, deadline, settings.think_time)
+        else:
+            dropped = run_open(vus, mix, started, deadline, settings.rate / settings.processes)
+    finally:
+        session.close()
+        tokens.close()
+        teardown = cleanup(tracker)
+        Logger.close()
+
+    samples = [sample for vu in vus for sample in vu.samples]
+    logger.info(f"Worker {index}: {len(samples)} requests from {num_users} virtual users")
+    return WorkerResult(started, samples, dropped, teardown)
+
+
+def cleanup(tracker):
+    """Stop tracking and delete what tracker holds; return the TeardownStats, or [] when tracking was off."""
+    if tracker is None:
+        return []
+    EntityTracker.deactivate()
+    phases = Teardown().run(tracker)
+    for stats in phases:
+        logger.info(f"Teardown phase '{stats.phase}': {stats.deleted} deleted, {stats.failed} failed")
+    return phases
+
+
+def run_closed(vus, mix, deadline, think_time):
+    """Loop every virtual user over the mix until the deadline; nothing is ever dropped."""
+
+    def loop(vu):
+        while time.time() < deadline:
+            vu.run(mix.pick(vu.rng))
+            if think_time:
+                time.sleep(think_time)
+
+    threads = [threading.Thread(target=loop, args=(vu,), name=f"loadtest-vu-{i}") for i, vu in enumerate(vus)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return []
+
+
+def run_open(vus, mix, started, deadline, rate):
+    """Start iterations at a fixed rate; return the arrival times that found no free virtual user."""
+    idle = queue.SimpleQueue()
+    for vu in vus:
+        idle.put(vu)
+    dropped = []
+
+    def iteration(vu):
+        try:
+            vu.run(mix.pick(vu.rng))
+        finally:
+            idle.put(vu)
+
+    with ThreadPoolExecutor(len(vus), thread_name_prefix="loadtest-vu") as executor:
+        arrival = 0
+        while (due := started + arrival / rate) < deadline:
+            delay = due - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                executor.submit(iteration, idle.get_nowait())
+            except queue.Empty:
+                dropped.append(due)
+            arrival += 1
+    return dropped
@@ -0,0 +1,194 @@
+"""Weighted load-test scenarios composed from the ServeRest client methods.
+
+A scenario is a function taking a ``VirtualUser``; every response it checks
+becomes one request sample. Mixes are written as ``name=weight`` pairs, e.g.
+``"browse_products=5,purchase=1"``.
+"""
+
+import random
+import time
+import uuid
+
+from services.serverest_api.api.carts import Carts
+from services.serverest_api.api.login import Login
+from services.serverest_api.api.products import Products
+from services.serverest_api.api.users import Users
+from utils.request import APIRequest
+from utils.token_manager import TokenManager
+
+PRODUCT_STOCK = 1_000_000
+
+
+def new_user_payload(admin=False):
+    """Return a user payload with an email that is unique across processes."""
+    key = uuid.uuid4().hex
+    return {
+        "nome": f"Load Test {key[:8]}",
+        "email": f"loadtest_{key}@example.com",
+        "password": key[:12],
+        "administrador": str(admin).lower(),
+    }
+
+
+def new_product_payload():
+    """Return a product payload with a unique name and stock for many purchases."""
+    key = uuid.uuid4().hex
+    return {
+        "nome": f"Load Test Product {key}",
+        "preco": 100,
+        "descricao": "Load test product",
+        "quantidade": PRODUCT_STOCK,
+    }
+
+
+class VirtualUser:
+    """One simulated user with its own clients, credentials and request samples.
+
+    A sample is ``(finished, scenario, elapsed, ok)``; ``elapsed`` is None when
+    the call raised before a response arrived. The token of the virtual
+    user's admin comes from ``tokens``, a TokenManager that renews it before
+    it expires, so scenarios keep working in runs longer than a token's life.
+    """
+
+    def __init__(self, session=None, rng=None, base_uri=None, tokens=None):
+        """Create the clients, optionally on a dedicated pooled session, for another base URI and sharing tokens."""
+        self.rng = rng or random.Random()
+        self.tokens = tokens or TokenManager(base_uri)
+        self.users = Users(base_uri)
+        self.products = Products(base_uri)
+        self.carts = Carts(base_uri)
+        self.login = Login(base_uri)
+        if session is not None:
+            request = APIRequest(session=session)
+            for client in (self.users, self.products, self.carts, self.login):
+                client.request = request
+
+        self.scenario = "setup"
+        self.samples = []
+        self.credentials = None
+        self.user_id = None
+        self.product_ids = []
+
+    @property
+    def token(self):
+        """Return a fresh token of the virtual user's admin."""
+        return self.tokens.token(self.credentials)
+
+    def check(self, response, *expected_statuses):
+        """Record response as a sample, successful if its status is expected."""
+        ok = response.status_code in expected_statuses
+        self.samples.append((time.time(), self.scenario, response.elapsed, ok))
+        return response
+
+    def setup(self, num_products=3):
+        """Register an admin, log in and create the products the scenarios use."""
+        payload = new_user_payload(admin=True)
+        self.user_id = self._require(self.users.create_user(payload), 201).as_dict["_id"]
+        self.credentials = {"email": payload["email"], "password": payload["password"]}
+        token = self.token
+        for _ in range(num_products):
+            response = self._require(self.products.create_product(new_product_payload(), token), 201)
+            self.product_ids.append(response.as_dict["_id"])
+        self.samples = []
+
+    def run(self, scenario):
+        """Run one iteration of the named scenario, recording a failed sample if it raises."""
+        self.scenario = scenario
+        try:
+            SCENARIOS[scenario](self)
+        except Exception:
+            self.samples.append((time.time(), scenario, None, False))
+
+    def _require(self, response, status):
+        """Return response, or raise when a setup call did not succeed."""
+        if response.status_code != status:
+            raise RuntimeError(f"Load-test setup failed with {response.status_code}: {response.text}")
+        return response
+
+
+def browse_products(vu):
+    """List products, then open one of them."""
+    vu.check(vu.products.get_product(), 200)
+    vu.check(vu.products.get_product_by_id(vu.rng.choice(vu.product_ids)), 200)
+
+
+def search_users(vu):
+    """Filter users by role, then open the virtual user's own record."""
+    vu.check(vu.users.get_user(administrador="true"), 200)
+    vu.check(vu.users.get_user_by_id(vu.user_id), 200)
+
+
+def login(vu):
+    """Log in again with the virtual user's credentials."""
+    vu.check(vu.login.login(vu.credentials), 200)
+
+
+def register(vu):
+    """Sign up a new user and log in as them."""
+    payload = new_user_payload()
+    vu.check(vu.users.create_user(payload), 201)
+    vu.check(vu.login.login({"email": payload["email"], "password": payload["password"]}), 200)
+
+
+def purchase(vu):
+    """Put a product in the cart and complete the purchase."""
+    cart = {"produtos": [{"idProduto": vu.rng.choice(vu.product_ids), "quantidade": 1}]}
+    token = vu.token
+    vu.check(vu.carts.create_cart(cart, token), 201)
+    vu.check(vu.carts.checkout(token), 200)
+
+
+def abandon_cart(vu):
+    """Put a product in the cart and cancel the purchase."""
+    cart = {"produtos": [{"idProduto": vu.rng.choice(vu.product_ids), "quantidade": 1}]}
+    token = vu.token
+    vu.check(vu.carts.create_cart(cart, token), 201)
+    vu.check(vu.carts.delete_cart(token), 200)
+
+
+SCENARIOS = {
+    "browse_products": browse_products,
+    "search_users": search_users,
+    "login": login,
+    "register": register,
+    "purchase": purchase,
+    "abandon_cart": abandon_cart,
+}
+DEFAULT_MIX = "browse_products=5,search_users=2,login=2,register=1,purchase=1,abandon_cart=1"
+
+
+class ScenarioMix:
+    """Weighted choice between scenarios."""
+
+    def __init__(self, weights):
+        """Keep scenarios with a positive weight; weights maps name to weight."""
+        unknown = sorted(set(weights) - set(SCENARIOS))
+        if unknown:
+            raise ValueError(f"Unknown scenario(s) {unknown}, expected some of {sorted(SCENARIOS)}")
+        self.weights = {name: weight for name, weight in weights.items() if weight > 0}
+        if not self.weights:
+            raise ValueError("Scenario mix needs at least one scenario with a positive weight")
+        self._names = list(self.weights)
+        self._cum_weights = []
+        total = 0.0
+        for name in self._names:
+            total += self.weights[name]
+            self._cum_weights.append(total)
+
+    @classmethod
+    def parse(cls, spec):
+        """Build a mix from a 'name=weight,name=weight' string."""
+        weights = {}
+        for entry in (part.strip() for part in spec.split(",")):
+            if not entry:
+                continue
+            name, _, weight = entry.partition("=")
+            try:
+                weights[name.strip()] = float(weight) if weight else 1.0
+            except ValueError as exc:
+                raise ValueError(f"Invalid scenario weight '{entry}', expected 'name=weight'") from exc
+        return cls(weights)
+
+    def pick(self, rng):
+        """Return the name of a scenario drawn according to the weights."""
+        return rng.choices(self._names, cum_weights=self._cum_weights)[0]
@@ -0,0 +1,56 @@
+"""Pytest plugin making generated test data reproducible.
+
+Every run seeds ``DataGenerator`` and prints the seed in the report header;
+``--data-seed N`` (or ``DATA_SEED=N``) replays the same data. Under
+pytest-xdist the controller picks the seed and each worker derives its own
+stream from it and its worker id. Each worker also namespaces its emails
+and product names with its worker id (``a.b.gw0@x.com``, ``Robust hub
+gw0``), so workers never generate the same ones: distinct seeds alone
+would not keep their values apart.
+"""
+
+import os
+
+import pytest
+
+import config as settings
+from utils.data_generator import DataGenerator
+
+seed_key = pytest.StashKey[int]()
+
+
+def pytest_addoption(parser):
+    """Add the --data-seed option."""
+    parser.addoption(
+        "--data-seed",
+        type=int,
+        default=settings.DATA_SEED,
+        help="seed for generated test data (default: DATA_SEED, or a fresh seed shown in the header)",
+    )
+
+
+def pytest_configure(config):
+    """Pick the run's seed, or take it from the xdist controller, and seed the generator."""
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        seed = workerinput["data_seed"]
+    else:
+        seed = config.getoption("--data-seed")
+        if seed is None:
+            seed = DataGenerator.seed()
+    config.stash[seed_key] = seed
+
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    DataGenerator.seed(f"{seed}-{worker}" if worker else seed, namespace=worker)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Hand the controller's seed to a pytest-xdist worker."""
+    node.workerinput["data_seed"] = node.config.stash[seed_key]
+
+
+def pytest_report_header(config):
+    """Show the seed needed to reproduce this run's data."""
+    seed = config.stash[seed_key]
+    return f"data seed: {seed} (reproduce with --data-seed {seed})"
@@ -0,0 +1,62 @@
+"""Pytest plugin running the suite against the bundled fake ServeRest.
+
+With ``--fake-server`` (or ``FAKE_SERVER=true``) a ``FakeServeRest`` is
+started on an ephemeral port before collection and ``config.BASE_URI`` points
+at it, so every client built afterwards talks to it. Under pytest-xdist each
+worker runs its own server. The ``fake_serverest`` fixture returns that
+server, or starts a session-scoped one when the option is off.
+"""
+
+import pytest
+
+import config as settings
+from fake_serverest import FakeServeRest
+from utils.entity_tracker import EntityTracker
+
+server_key = pytest.StashKey[FakeServeRest]()
+
+
+def pytest_addoption(parser):
+    """Add the --fake-server switch."""
+    parser.addoption(
+        "--fake-server",
+        action="store_true",
+        default=settings.FAKE_SERVER,
+        help="run against a local in-memory ServeRest instead of BASE_URI",
+    )
+
+
+def pytest_configure(config):
+    """Start the fake server and point BASE_URI at it before test modules build clients."""
+    if config.getoption("--fake-server"):
+        server = FakeServeRest(latency=settings.FAKE_SERVER_LATENCY).start()
+        config.stash[server_key] = server
+        settings.BASE_URI = server.url
+
+
+def pytest_unconfigure(config):
+    """Stop the fake server started for the run."""
+    server = config.stash.get(server_key, None)
+    if server is not None:
+        server.stop()
+
+
+def pytest_report_header(config):
+    """Show where the run sends its requests."""
+    server = config.stash.get(server_key, None)
+    return f"fake ServeRest: {server.url}" if server is not None else None
+
+
+@pytest.fixture(scope="session")
+def fake_serverest(request):
+    """Return the run's fake server, or a session-scoped one on an ephemeral port."""
+    server = request.config.stash.get(server_key, None)
+    if server is not None:
+        yield server
+        return
+    with FakeServeRest(latency=settings.FAKE_SERVER_LATENCY) as server:
+        yield server
+    # Its entities went away with it; keep the session teardown from calling a stopped server
+    tracker = EntityTracker.active()
+    if tracker is not None:
+        tracker.forget(server.url)
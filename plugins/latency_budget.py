@@ -0,0 +1,180 @@
+"""Pytest plugin enforcing latency budgets per client method.
+
+Budgets name a client operation (``<Client>.<method>``, async clients use the
+same names), a statistic (``p50``, ``p95``, ``p99``, ... or ``max``) and a
+limit in milliseconds. ``max`` is the exact slowest call; percentiles come
+from the sampled reservoir once an operation has more calls than it holds.
+Budgets come from two places:
+
+* ``LATENCY_BUDGETS`` in ``config.py``, e.g.
+  ``"Products.get_product:p95=150,Login.login:p99=300"``; checked once over
+  every call made during the run, fixtures included.
+* ``@pytest.mark.latency_budget("Products.get_product_by_id", p95=150)``;
+  checked over the calls made by that test's body.
+
+In ``warn`` mode exceeded budgets are reported; in ``fail`` mode marked tests
+fail and a run-wide violation makes the session exit with a failure code.
+Token renewals by the TokenManager background refresher are recorded as
+``token_refresh``, not ``Login.login``, so they never count against the budget
+of whichever test happens to be running.
+"""
+
+import warnings
+from dataclasses import dataclass
+
+import pytest
+
+from config import LATENCY_BUDGET_MODE, LATENCY_BUDGETS
+from utils.metrics import LatencyRecorder, percentile
+
+BUDGET_MODES = ("warn", "fail")
+budgets_key = pytest.StashKey[list]()
+violations_key = pytest.StashKey[list]()
+
+
+class LatencyBudgetWarning(UserWarning):
+    """Issued for an exceeded latency budget in warn mode."""
+
+
+@dataclass
+class LatencyBudget:
+    """Upper limit for one latency statistic of one client operation."""
+
+    operation: str
+    statistic: str
+    limit_ms: float
+
+    def check(self, reservoirs):
+        """Return a violation message, or None when the budget holds or has no data.
+
+        reservoirs maps operations to LatencyReservoir; max is the exact
+        slowest call, percentiles come from the (possibly sampled) durations.
+        """
+        reservoir = reservoirs.get(self.operation)
+        if reservoir is None or not reservoir.count:
+            return None
+        if self.statistic == "max":
+            value = reservoir.max * 1000
+        else:
+            value = percentile(sorted(reservoir.durations), float(self.statistic[1:])) * 1000
+        if value <= self.limit_ms:
+            return None
+        return (
+            f"{self.operation} {self.statistic} = {value:.1f} ms exceeds budget of "
+            f"{self.limit_ms:g} ms ({reservoir.count} call(s))"
+        )
+
+
+def validate_statistic(statistic):
+    """Return statistic if it is 'max' or 'pNN' with 0 < NN <= 100."""
+    statistic = statistic.strip().lower()
+    if statistic == "max":
+        return statistic
+    if statistic.startswith("p"):
+        try:
+            if 0 < float(statistic[1:]) <= 100:
+                return statistic
+        except ValueError:
+            pass
+    raise ValueError(f"Unknown latency statistic '{statistic}', expected 'pNN' or 'max'")
+
+
+def parse_budgets(spec):
+    """Parse a LATENCY_BUDGETS string into LatencyBudget objects."""
+    budgets = []
+    for entry in (part.strip() for part in spec.split(",")):
+        if not entry:
+            continue
+        try:
+            operation, rule = entry.split(":", 1)
+            statistic, limit = rule.split("=", 1)
+            budgets.append(LatencyBudget(operation.strip(), validate_statistic(statistic), float(limit)))
+        except ValueError as exc:
+            raise ValueError(f"Invalid latency budget '{entry}', expected '<Client>.<method>:<pNN|max>=<ms>'") from exc
+    return budgets
+
+
+def marker_budgets(item):
+    """Return budgets declared on a test with @pytest.mark.latency_budget."""
+    budgets = []
+    for marker in item.iter_markers("latency_budget"):
+        if len(marker.args) != 1 or not marker.kwargs:
+            raise ValueError('latency_budget marker expects an operation and limits, e.g. ("Login.login", p99=300)')
+        for statistic, limit in marker.kwargs.items():
+            budgets.append(LatencyBudget(marker.args[0], validate_statistic(statistic), float(limit)))
+    return budgets
+
+
+def pytest_addoption(parser):
+    """Allow overriding the budget mode from the command line."""
+    parser.addoption(
+        "--latency-budget-mode",
+        choices=BUDGET_MODES,
+        default=None,
+        help=f"warn or fail when a latency budget is exceeded (default: {LATENCY_BUDGET_MODE})",
+    )
+
+
+def pytest_configure(config):
+    """Register the marker and parse run-wide budgets."""
+    config.addinivalue_line(
+        "markers",
+        "latency_budget(operation, **limits): fail or warn when the test's calls to operation exceed "
+        "the given limits in ms, e.g. p95=150, max=400",
+    )
+    mode = config.getoption("--latency-budget-mode") or LATENCY_BUDGET_MODE
+    if mode not in BUDGET_MODES:
+        raise pytest.UsageError(f"LATENCY_BUDGET_MODE must be one of {BUDGET_MODES}, got '{mode}'")
+    config.option.latency_budget_mode = mode
+    config.stash[budgets_key] = parse_budgets(LATENCY_BUDGETS)
+    config.stash[violations_key] = []
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Check marker budgets against the calls made by the test body."""
+    budgets = marker_budgets(item)
+    start = LatencyRecorder.count()
+    result = yield
+    if not budgets:
+        return result
+
+    reservoirs = LatencyRecorder.operation_reservoirs(LatencyRecorder.samples(start))
+    violations = [message for message in (budget.check(reservoirs) for budget in budgets) if message]
+    if not violations:
+        return result
+
+    if item.config.option.latency_budget_mode == "fail":
+        pytest.fail("Latency budget exceeded:\n" + "\n".join(violations), pytrace=False)
+    for message in violations:
+        warnings.warn(LatencyBudgetWarning(message), stacklevel=1)
+    return result
+
+
+def pytest_sessionfinish(session):
+    """Check run-wide budgets once every sample, including xdist workers', is in."""
+    config = session.config
+    if hasattr(config, "workeroutput") or not config.stash[budgets_key]:
+        return
+
+    reservoirs = LatencyRecorder.operation_reservoirs()
+    violations = [message for message in (budget.check(reservoirs) for budget in config.stash[budgets_key]) if message]
+    config.stash[violations_key] = violations
+    if violations and config.option.latency_budget_mode == "fail":
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Report run-wide budget results."""
+    budgets = config.stash[budgets_key]
+    if not budgets or hasattr(config, "workeroutput"):
+        return
+
+    violations = config.stash[violations_key]
+    terminalreporter.write_sep("-", "latency budgets")
+    if not violations:
+        terminalreporter.write_line(f"all {len(budgets)} budget(s) met")
+        return
+    label = "FAILED" if config.option.latency_budget_mode == "fail" else "WARNING"
+    for message in violations:
+        terminalreporter.write_line(f"{label}: {message}", red=label == "FAILED", yellow=label == "WARNING")
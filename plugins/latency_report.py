@@ -0,0 +1,71 @@
+"""Pytest plugin reporting per-endpoint latency percentiles and throughput.
+
+Every call made through ``utils.request.APIRequest`` is timed and stored in
+``LatencyRecorder``. At the end of the run this plugin prints one row per
+ServeRest endpoint (``/usuarios``, ``/produtos``, ``/carrinhos``, ``/login``)
+in the terminal summary and in the pytest-html report. Under pytest-xdist the
+workers ship their samples to the controller, which reports the merged data.
+"""
+
+import html
+
+import pytest
+
+from utils.metrics import LatencyRecorder
+
+HEADERS = ("endpoint", "calls", "p50 ms", "p90 ms", "p99 ms", "max ms", "req/s")
+
+
+def summary_rows():
+    """Return the report rows as tuples of display strings."""
+    return [
+        (
+            stats.endpoint,
+            str(stats.count),
+            f"{stats.p50 * 1000:.1f}",
+            f"{stats.p90 * 1000:.1f}",
+            f"{stats.p99 * 1000:.1f}",
+            f"{stats.max * 1000:.1f}",
+            f"{stats.throughput:.1f}",
+        )
+        for stats in LatencyRecorder.summary()
+    ]
+
+
+def pytest_sessionfinish(session):
+    """Hand this worker's samples to the pytest-xdist controller."""
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["latency_samples"] = LatencyRecorder.export()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Merge samples sent by a finished pytest-xdist worker."""
+    samples = getattr(node, "workeroutput", {}).get("latency_samples")
+    if samples:
+        LatencyRecorder.merge(samples)
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Print the per-endpoint latency table."""
+    rows = summary_rows()
+    if not rows:
+        return
+
+    terminalreporter.write_sep("-", "endpoint latency")
+    terminalreporter.write_line(f"{HEADERS[0]:<12}" + "".join(f"{header:>10}" for header in HEADERS[1:]))
+    for row in rows:
+        terminalreporter.write_line(f"{row[0]:<12}" + "".join(f"{value:>10}" for value in row[1:]))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix):
+    """Add the per-endpoint latency table to the pytest-html summary."""
+    rows = summary_rows()
+    if not rows:
+        return
+
+    header = "".join(f"<th>{html.escape(title)}</th>" for title in HEADERS)
+    body = "".join("<tr>" + "".join(f"<td>{html.escape(value)}</td>" for value in row) + "</tr>" for row in rows)
+    prefix.append(f"<h2>Endpoint latency</h2><table><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table>")
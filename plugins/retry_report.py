@@ -0,0 +1,67 @@
+"""Pytest plugin reporting retries and circuit breaker state per endpoint.
+
+``utils.request.APIRequest`` retries transient failures and guards every
+ServeRest endpoint with a circuit breaker (``utils.retry``). When anything
+was retried, exhausted its retries, tripped a breaker or was rejected by an
+open one, this plugin prints one row per endpoint with those counts and the
+breaker's state in the terminal summary and in the pytest-html report. Under
+pytest-xdist the workers ship their counters to the controller.
+"""
+
+import html
+
+import pytest
+
+from utils.retry import CLOSED, CircuitBreakers
+
+HEADERS = ("endpoint", "retries", "exhausted", "trips", "rejected", "state")
+
+
+def summary_rows():
+    """Return the report rows as tuples of display strings, or [] when nothing happened."""
+    stats = CircuitBreakers.summary()
+    if not any(row.retries or row.trips or row.rejected or row.state != CLOSED for row in stats):
+        return []
+    return [
+        (row.endpoint, str(row.retries), str(row.exhausted), str(row.trips), str(row.rejected), row.state)
+        for row in stats
+    ]
+
+
+def pytest_sessionfinish(session):
+    """Hand this worker's counters to the pytest-xdist controller."""
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["circuit_breakers"] = CircuitBreakers.export()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Merge counters sent by a finished pytest-xdist worker."""
+    exported = getattr(node, "workeroutput", {}).get("circuit_breakers")
+    if exported:
+        CircuitBreakers.merge(exported)
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Print the per-endpoint retry and circuit breaker table."""
+    rows = summary_rows()
+    if not rows:
+        return
+
+    terminalreporter.write_sep("-", "http retries")
+    terminalreporter.write_line(f"{HEADERS[0]:<12}" + "".join(f"{header:>11}" for header in HEADERS[1:]))
+    for row in rows:
+        terminalreporter.write_line(f"{row[0]:<12}" + "".join(f"{value:>11}" for value in row[1:]))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix):
+    """Add the retry and circuit breaker table to the pytest-html summary."""
+    rows = summary_rows()
+    if not rows:
+        return
+
+    header = "".join(f"<th>{html.escape(title)}</th>" for title in HEADERS)
+    body = "".join("<tr>" + "".join(f"<td>{html.escape(value)}</td>" for value in row) + "</tr>" for row in rows)
+    prefix.append(f"<h2>HTTP retries</h2><table><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table>")
@@ -0,0 +1,83 @@
+"""Pytest plugin deleting every entity the run created once it is over.
+
+While the run is active, ``utils.request.APIRequest`` reports each created
+and deleted user, product and cart to an ``EntityTracker``. At session end
+whatever is left is removed concurrently in dependency order (carts, then
+products, then users) by ``services.serverest_api.teardown.Teardown``, and
+the terminal summary shows per phase how many entities were deleted, how
+many could not be and the deletion rate. Under pytest-xdist every worker
+cleans up its own entities and ships its counts to the controller.
+``--no-teardown`` (or ``SESSION_TEARDOWN=false``) keeps the data, e.g. to
+inspect it after a failure.
+"""
+
+from dataclasses import asdict
+
+import pytest
+
+import config as settings
+from services.serverest_api.teardown import Teardown, TeardownStats
+from utils.entity_tracker import EntityTracker
+
+stats_key = pytest.StashKey[dict]()
+
+
+def pytest_addoption(parser):
+    """Add the --no-teardown switch."""
+    parser.addoption(
+        "--no-teardown",
+        action="store_false",
+        dest="session_teardown",
+        default=settings.SESSION_TEARDOWN,
+        help="keep the users, products and carts the run created instead of deleting them at session end",
+    )
+
+
+def pytest_configure(config):
+    """Start tracking created entities before any client is used."""
+    config.stash[stats_key] = {}
+    if config.getoption("session_teardown"):
+        EntityTracker.activate()
+
+
+def merge_stats(config, phases):
+    """Add TeardownStats to the run's per-phase totals."""
+    totals = config.stash[stats_key]
+    for stats in phases:
+        totals.setdefault(stats.phase, TeardownStats(stats.phase)).merge(stats)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session):
+    """Delete what the run left behind, before logs are flushed and connections closed."""
+    tracker = EntityTracker.deactivate()
+    if tracker is None:
+        return
+    phases = Teardown().run(tracker)
+    merge_stats(session.config, phases)
+
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["teardown"] = [asdict(stats) for stats in phases]
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Merge the teardown counts of a finished pytest-xdist worker."""
+    exported = getattr(node, "workeroutput", {}).get("teardown")
+    if exported:
+        merge_stats(node.config, [TeardownStats(**data) for data in exported])
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Print how many entities each teardown phase deleted and how fast."""
+    totals = config.stash.get(stats_key, {})
+    if not any(stats.deleted or stats.failed for stats in totals.values()):
+        return
+
+    terminalreporter.write_sep("-", "teardown")
+    for stats in totals.values():
+        terminalreporter.write_line(
+            f"{stats.phase:<18} {stats.deleted:>7} deleted {stats.failed:>5} failed "
+            f"{stats.elapsed:>9.3f}s {stats.rate:>9.1f}/s"
+        )
@@ -1,14 +1,24 @@
+from types import MappingProxyType
+
+DEFAULT_HEADERS = MappingProxyType(
+    {
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+    }
+)
+
+
 class BaseClient:
-    """Provide shared headers for ServeRest API clients."""
-
-    def __init__(self):
-        """Populate default headers used by child clients."""
-        self.headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
-        self.headers_with_token = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "Authorization": "",
-        }
+    """Provide shared headers for ServeRest API clients.
+
+    Clients keep no per-call state: ``headers`` is read-only and authorized
+    calls build their own dict with ``auth_headers``, so one client instance
+    can be shared by any number of threads or coroutines.
+    """
+
+    headers = DEFAULT_HEADERS
+
+    @staticmethod
+    def auth_headers(token):
+        """Return new request headers carrying token as Authorization."""
+        return {**DEFAULT_HEADERS, "Authorization": token}
@@ -1,22 +1,19 @@
-import json
-
-from config import BASE_URI
 from services.serverest_api.serverest_client import ServeRestClient
+from utils.serializer import dumps
 
 
 class Carts(ServeRestClient):
     """ServeRest client wrapper for cart endpoints."""
 
-    def __init__(self):
+    def __init__(self, base_uri=None):
         """Configure base URL for cart operations."""
-        super().__init__()
-        self.carts_url = f"{BASE_URI}/carrinhos"
+        super().__init__(base_uri)
+        self.carts_url = f"{self.base_uri}/carrinhos"
 
     def create_cart(self, payload, token):
         """POST a cart using the provided token."""
         url = f"{self.carts_url}"
-        self.headers_with_token["Authorization"] = token
-        return self.request.post_request(url, json.dumps(payload), self.headers_with_token)
+        return self.request.post_request(url, dumps(payload), self.auth_headers(token))
 
     def get_carts(self, **kwargs):
         """GET carts with optional filters."""
@@ -33,11 +30,9 @@ class Carts(ServeRestClient):
     def checkout(self, token):
         """DELETE the user's cart via checkout endpoint."""
         url = f"{self.carts_url}/concluir-compra"
-        self.headers_with_token["Authorization"] = token
-        return self.request.delete_request(url, self.headers_with_token)
+        return self.request.delete_request(url, self.auth_headers(token))
 
     def delete_cart(self, token):
         """DELETE the user's cart via cancel endpoint."""
         url = f"{self.carts_url}/cancelar-compra"
-        self.headers_with_token["Authorization"] = token
-        return self.request.delete_request(url, self.headers_with_token)
+        return self.request.delete_request(url, self.auth_headers(token))
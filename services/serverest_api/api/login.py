@@ -1,18 +1,16 @@
-import json
-
-from config import BASE_URI
 from services.serverest_api.serverest_client import ServeRestClient
+from utils.serializer import dumps
 
 
 class Login(ServeRestClient):
     """ServeRest client wrapper for login endpoint."""
 
-    def __init__(self):
+    def __init__(self, base_uri=None):
         """Configure base URL for login operations."""
-        super().__init__()
-        self.login_url = f"{BASE_URI}/login"
+        super().__init__(base_uri)
+        self.login_url = f"{self.base_uri}/login"
 
     def login(self, payload):
         """POST credentials and return the API response."""
         url = f"{self.login_url}"
-        return self.request.post_request(url, json.dumps(payload), self.headers)
+        return self.request.post_request(url, dumps(payload), self.headers)
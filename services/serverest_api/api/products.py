@@ -1,22 +1,19 @@
-import json
-
-from config import BASE_URI
 from services.serverest_api.serverest_client import ServeRestClient
+from utils.serializer import dumps
 
 
 class Products(ServeRestClient):
     """ServeRest client wrapper for product endpoints."""
 
-    def __init__(self):
+    def __init__(self, base_uri=None):
         """Configure base URL for product operations."""
-        super().__init__()
-        self.products_url = f"{BASE_URI}/produtos"
+        super().__init__(base_uri)
+        self.products_url = f"{self.base_uri}/produtos"
 
     def create_product(self, payload, token):
         """POST a product using the provided token."""
         url = f"{self.products_url}"
-        self.headers_with_token["Authorization"] = token
-        return self.request.post_request(url, json.dumps(payload), self.headers_with_token)
+        return self.request.post_request(url, dumps(payload), self.auth_headers(token))
 
     def get_product(self, **kwargs):
         """GET products with optional filters."""
@@ -33,11 +30,9 @@ class Products(ServeRestClient):
     def update_product(self, product_id, payload, token):
         """PUT updated product details."""
         url = f"{self.products_url}/{product_id}"
-        self.headers_with_token["Authorization"] = token
-        return self.request.put_request(url, json.dumps(payload), self.headers_with_token)
+        return self.request.put_request(url, dumps(payload), self.auth_headers(token))
 
     def delete_product(self, product_id, token):
         """DELETE a product by id."""
         url = f"{self.products_url}/{product_id}"
-        self.headers_with_token["Authorization"] = token
-        return self.request.delete_request(url, self.headers_with_token)
+        return self.request.delete_request(url, self.auth_headers(token))
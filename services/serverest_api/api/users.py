@@ -1,21 +1,19 @@
-import json
-
-from config import BASE_URI
 from services.serverest_api.serverest_client import ServeRestClient
+from utils.serializer import dumps
 
 
 class Users(ServeRestClient):
     """ServeRest client wrapper for user endpoints."""
 
-    def __init__(self):
+    def __init__(self, base_uri=None):
         """Configure base URL for user operations."""
-        super().__init__()
-        self.users_url = f"{BASE_URI}/usuarios"
+        super().__init__(base_uri)
+        self.users_url = f"{self.base_uri}/usuarios"
 
     def create_user(self, payload):
         """POST a new user."""
         url = f"{self.users_url}"
-        return self.request.post_request(url, json.dumps(payload), self.headers)
+        return self.request.post_request(url, dumps(payload), self.headers)
 
     def get_user(self, **kwargs):
         """GET users with optional filters."""
@@ -32,7 +30,7 @@ class Users(ServeRestClient):
     def update_user(self, user_id, payload):
         """PUT updated details for a user."""
         url = f"{self.users_url}/{user_id}"
-        return self.request.put_request(url, json.dumps(payload), self.headers)
+        return self.request.put_request(url, dumps(payload), self.headers)
 
     def delete_user(self, user_id):
         """DELETE a user by id."""
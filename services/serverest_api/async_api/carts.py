@@ -0,0 +1,38 @@
+from services.serverest_api.async_serverest_client import AsyncServeRestClient
+from utils.serializer import dumps
+
+
+class AsyncCarts(AsyncServeRestClient):
+    """Asyncio ServeRest client wrapper for cart endpoints."""
+
+    def __init__(self, request=None, base_uri=None):
+        """Configure base URL for cart operations."""
+        super().__init__(request, base_uri)
+        self.carts_url = f"{self.base_uri}/carrinhos"
+
+    async def create_cart(self, payload, token):
+        """POST a cart using the provided token."""
+        url = f"{self.carts_url}"
+        return await self.request.post_request(url, dumps(payload), self.auth_headers(token))
+
+    async def get_carts(self, **kwargs):
+        """GET carts with optional filters."""
+        url_params = {key: value for key, value in kwargs.items() if value is not None}
+        url = f"{self.carts_url}?"
+        url += "&".join([f"{key}={value}" for key, value in url_params.items()])
+        return await self.request.get_request(url, self.headers)
+
+    async def get_cart_by_id(self, cart_id):
+        """GET a cart by id."""
+        url = f"{self.carts_url}/{cart_id}"
+        return await self.request.get_request(url, self.headers)
+
+    async def checkout(self, token):
+        """DELETE the user's cart via checkout endpoint."""
+        url = f"{self.carts_url}/concluir-compra"
+        return await self.request.delete_request(url, self.auth_headers(token))
+
+    async def delete_cart(self, token):
+        """DELETE the user's cart via cancel endpoint."""
+        url = f"{self.carts_url}/cancelar-compra"
+        return await self.request.delete_request(url, self.auth_headers(token))
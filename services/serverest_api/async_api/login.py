@@ -0,0 +1,16 @@
+from services.serverest_api.async_serverest_client import AsyncServeRestClient
+from utils.serializer import dumps
+
+
+class AsyncLogin(AsyncServeRestClient):
+    """Asyncio ServeRest client wrapper for login endpoint."""
+
+    def __init__(self, request=None, base_uri=None):
+        """Configure base URL for login operations."""
+        super().__init__(request, base_uri)
+        self.login_url = f"{self.base_uri}/login"
+
+    async def login(self, payload):
+        """POST credentials and return the API response."""
+        url = f"{self.login_url}"
+        return await self.request.post_request(url, dumps(payload), self.headers)
@@ -0,0 +1,38 @@
+from services.serverest_api.async_serverest_client import AsyncServeRestClient
+from utils.serializer import dumps
+
+
+class AsyncProducts(AsyncServeRestClient):
+    """Asyncio ServeRest client wrapper for product endpoints."""
+
+    def __init__(self, request=None, base_uri=None):
+        """Configure base URL for product operations."""
+        super().__init__(request, base_uri)
+        self.products_url = f"{self.base_uri}/produtos"
+
+    async def create_product(self, payload, token):
+        """POST a product using the provided token."""
+        url = f"{self.products_url}"
+        return await self.request.post_request(url, dumps(payload), self.auth_headers(token))
+
+    async def get_product(self, **kwargs):
+        """GET products with optional filters."""
+        url_params = {key: value for key, value in kwargs.items() if value is not None}
+        url = f"{self.products_url}?"
+        url += "&".join([f"{key}={value}" for key, value in url_params.items()])
+        return await self.request.get_request(url, self.headers)
+
+    async def get_product_by_id(self, product_id):
+        """GET a product by id."""
+        url = f"{self.products_url}/{product_id}"
+        return await self.request.get_request(url, self.headers)
+
+    async def update_product(self, product_id, payload, token):
+        """PUT updated product details."""
+        url = f"{self.products_url}/{product_id}"
+        return await self.request.put_request(url, dumps(payload), self.auth_headers(token))
+
+    async def delete_product(self, product_id, token):
+        """DELETE a product by id."""
+        url = f"{self.products_url}/{product_id}"
+        return await self.request.delete_request(url, self.auth_headers(token))
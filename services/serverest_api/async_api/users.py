@@ -0,0 +1,38 @@
+from services.serverest_api.async_serverest_client import AsyncServeRestClient
+from utils.serializer import dumps
+
+
+class AsyncUsers(AsyncServeRestClient):
+    """Asyncio ServeRest client wrapper for user endpoints."""
+
+    def __init__(self, request=None, base_uri=None):
+        """Configure base URL for user operations."""
+        super().__init__(request, base_uri)
+        self.users_url = f"{self.base_uri}/usuarios"
+
+    async def create_user(self, payload):
+        """POST a new user."""
+        url = f"{self.users_url}"
+        return await self.request.post_request(url, dumps(payload), self.headers)
+
+    async def get_user(self, **kwargs):
+        """GET users with optional filters."""
+        url_params = {key: value for key, value in kwargs.items() if value is not None}
+        url = f"{self.users_url}?"
+        url += "&".join([f"{key}={value}" for key, value in url_params.items()])
+        return await self.request.get_request(url, self.headers)
+
+    async def get_user_by_id(self, user_id):
+        """GET a user by id."""
+        url = f"{self.users_url}/{user_id}"
+        return await self.request.get_request(url, self.headers)
+
+    async def update_user(self, user_id, payload):
+        """PUT updated details for a user."""
+        url = f"{self.users_url}/{user_id}"
+        return await self.request.put_request(url, dumps(payload), self.headers)
+
+    async def delete_user(self, user_id):
+        """DELETE a user by id."""
+        url = f"{self.users_url}/{user_id}"
+        return await self.request.delete_request(url, self.headers)
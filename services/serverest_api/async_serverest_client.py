@@ -0,0 +1,23 @@
+import config
+from services.base_client import BaseClient
+from utils.async_request import AsyncAPIRequest
+from utils.metrics import track_public_methods
+
+
+class AsyncServeRestClient(BaseClient):
+    """Base wrapper that wires awaitable, non-blocking ServeRest request helpers."""
+
+    def __init_subclass__(cls, **kwargs):
+        """Attribute requests to the sync operation name, e.g. AsyncUsers.get_user -> 'Users.get_user'."""
+        super().__init_subclass__(**kwargs)
+        track_public_methods(cls, cls.__name__.removeprefix("Async"))
+
+    def __init__(self, request=None, base_uri=None):
+        """Set up the async request helper, optionally shared between clients, and the API address."""
+        super().__init__()
+        self.base_uri = base_uri or config.BASE_URI
+        self.request = request or AsyncAPIRequest()
+
+    async def aclose(self):
+        """Close the pooled connections of the request helper on the running event loop."""
+        await self.request.aclose()
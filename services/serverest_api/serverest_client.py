@@ -1,13 +1,21 @@
+import config
 from services.base_client import BaseClient
+from utils.metrics import track_public_methods
 from utils.request import APIRequest
 
 
 class ServeRestClient(BaseClient):
     """Base wrapper that wires ServeRest-specific request helpers."""
 
-    def __init__(self):
-        """Set up the shared API request helper."""
+    def __init_subclass__(cls, **kwargs):
+        """Attribute requests made by public methods to '<Class>.<method>' for latency budgets."""
+        super().__init_subclass__(**kwargs)
+        track_public_methods(cls, cls.__name__)
+
+    def __init__(self, base_uri=None):
+        """Set up the shared API request helper and the API address (config.BASE_URI by default)."""
         super().__init__()
+        self.base_uri = base_uri or config.BASE_URI
         self.request = APIRequest()
 
     # TODO: Add test after implemented
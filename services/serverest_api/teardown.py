@@ -0,0 +1,146 @@
+import contextlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+import requests
+
+import config
+from config import SEED_CONCURRENCY
+from services.serverest_api.api.carts import Carts
+from services.serverest_api.api.products import Products
+from services.serverest_api.api.users import Users
+from utils.bulk_seeder import BulkSeeder
+from utils.token_manager import TokenManager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TeardownStats:
+    """Outcome of one teardown phase; elapsed is wall-clock seconds."""
+
+    phase: str
+    deleted: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rate(self):
+        """Return deletions attempted per second."""
+        total = self.deleted + self.failed
+        return total / self.elapsed if self.elapsed else 0.0
+
+    def merge(self, other):
+        """Add the counters of other, e.g. from a pytest-xdist worker."""
+        self.deleted += other.deleted
+        self.failed += other.failed
+        self.elapsed += other.elapsed
+
+
+class Teardown:
+    """Delete tracked ServeRest entities concurrently in dependency order.
+
+    Carts are cancelled first with their owner's token, which restocks
+    their products; then products are deleted with their creator's admin
+    token; then users. A token rejected with 401, typically because it
+    expired during a long run, is replaced by a fresh one for the same
+    credentials from a TokenManager, or for products by a pre-warmed admin
+    when the creator's credentials are unknown. Each phase runs on a
+    BulkSeeder thread pool sharing one client per API address.
+    """
+
+    def __init__(self, max_workers=SEED_CONCURRENCY):
+        """Run up to max_workers deletions at once."""
+        self.seeder = BulkSeeder(max_workers, record_timings=False)
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def run(self, tracker):
+        """Delete everything tracker holds and return TeardownStats for carts, products and users."""
+        carts, products, users = tracker.drain()
+        return [
+            self._phase("teardown_carts", self._cancel_cart, carts),
+            self._phase("teardown_products", self._delete_product, products),
+            self._phase("teardown_users", self._delete_user, users),
+        ]
+
+    def _client(self, cls, base_uri):
+        """Return the shared cls client of base_uri."""
+        with self._lock:
+            key = (cls, base_uri)
+            if key not in self._clients:
+                self._clients[key] = cls(base_uri)
+            return self._clients[key]
+
+    def _tokens(self, base_uri):
+        """Return the shared TokenManager for BASE_URI, else one without background renewal for base_uri."""
+        if base_uri == config.BASE_URI.rstrip("/"):
+            return TokenManager.shared()
+        with self._lock:
+            key = (TokenManager, base_uri)
+            if key not in self._clients:
+                self._clients[key] = TokenManager(base_uri, auto_refresh=False)
+            return self._clients[key]
+
+    def _fresh_token(self, base_uri, credentials):
+        """Return a valid token for credentials, or None when they are unknown or rejected."""
+        if credentials is None:
+            return None
+        try:
+            return self._tokens(base_uri).token(credentials)
+        except ValueError:
+            return None
+
+    def _cancel_cart(self, cart):
+        """Cancel a cart with its owner's token, logging the owner in again once that has expired."""
+        base_uri, token, credentials = cart
+        client = self._client(Carts, base_uri)
+        response = client.delete_cart(token)
+        if response.status_code == 401:
+            fresh = self._fresh_token(base_uri, credentials)
+            if fresh is not None:
+                response = client.delete_cart(fresh)
+        return response
+
+    def _delete_product(self, product):
+        """Delete a product with its creator's token, renewed or replaced by a pre-warmed admin's once expired."""
+        (base_uri, product_id), token, credentials = product
+        client = self._client(Products, base_uri)
+        response = client.delete_product(product_id, token)
+        if response.status_code == 401:
+            fresh = self._fresh_token(base_uri, credentials)
+            if fresh is None and base_uri == config.BASE_URI.rstrip("/"):
+                # Without a pre-warmed admin the 401 stands and is counted as a failure
+                with contextlib.suppress(ValueError):
+                    fresh = TokenManager.shared().admin_token()
+            if fresh is not None:
+                response = client.delete_product(product_id, fresh)
+        return response
+
+    def _delete_user(self, user):
+        """Delete a user."""
+        base_uri, user_id = user
+        return self._client(Users, base_uri).delete_user(user_id)
+
+    def _phase(self, phase, call, items):
+        """Run one deletion phase, counting answers other than 200 and transport errors as failures."""
+
+        def guarded(item):
+            try:
+                return call(item)
+            except requests.RequestException as exc:
+                return exc
+
+        stats = TeardownStats(phase)
+        started = time.perf_counter()
+        for item, result in self.seeder.stream(phase, guarded, items, window=max(len(items), 1)):
+            if getattr(result, "status_code", None) == 200:
+                stats.deleted += 1
+                continue
+            stats.failed += 1
+            detail = result.as_dict if hasattr(result, "as_dict") else repr(result)
+            logger.warning(f"Teardown phase '{phase}' could not delete {item}: {detail}")
+        stats.elapsed = time.perf_counter() - started
+        return stats
@@ -1,6 +1,7 @@
 """Shared pytest fixtures and helpers for ServeRest API tests."""
 
 import random
+from dataclasses import asdict
 
 import pytest
 
@@ -12,52 +13,135 @@ from config import (
     MAX_USERS_COUNT,
 )
 from services.serverest_api.api.carts import Carts
-from services.serverest_api.api.login import Login
 from services.serverest_api.api.products import Products
 from services.serverest_api.api.users import Users
+from utils import data_generator
+from utils.bulk_seeder import BulkSeeder, PhaseTiming
 from utils.calculator import Calculator
+from utils.context_store import CARTS, PRODUCT_IDS, PRODUCTS, USERS, ContextStore
 from utils.data_generator import DataGenerator
 from utils.file_manager import FileManager
+from utils.logger import Logger
+from utils.models import Cart, Product, User
+from utils.rate_limiter import RateLimiter
+from utils.response_cache import CacheStats, ResponseCache
+from utils.seed_dataset import SeedDataset
+from utils.session import SessionManager
+from utils.token_manager import TokenManager, TokenStats
+
+pytest_plugins = [
+    "plugins.data_seed",
+    "plugins.fake_server",
+    "plugins.latency_report",
+    "plugins.latency_budget",
+    "plugins.retry_report",
+    "plugins.teardown",
+]
 
 
 def pytest_configure(config):
     """Pytest configuration hook."""
-    pass
-
+    config.addinivalue_line(
+        "markers",
+        "mutating(*keys): test changes the server-side entities under keys (usuarios, produtos, carrinhos; "
+        "all when none are given) and creates its own instead of using the shared seed",
+    )
 
-@pytest.fixture
-def context():
-    """Return a mutable dict used to share data between fixtures."""
-    return {}
 
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report how long each bulk seeding phase took, how the HTTP and token caches did and what the rate limiter cost."""
+    phases = BulkSeeder.summary()
+    if phases:
+        terminalreporter.write_sep("-", "bulk seeding")
+        for timing in phases.values():
+            terminalreporter.write_line(
+                f"{timing.phase:<16} {timing.count:>7} call(s) {timing.elapsed:>9.3f}s {timing.rate:>9.1f}/s"
+            )
 
-@pytest.fixture
-def get_user_token(context):
-    """Return a helper that fetches user tokens from the shared context."""
-    users_list = context.get("usuarios")
+    cache = ResponseCache.shared()
+    if cache is not None:
+        stats = cache.stats
+        terminalreporter.write_sep("-", "http cache")
+        terminalreporter.write_line(
+            f"hits {stats.hits}  misses {stats.misses}  revalidated {stats.revalidated}  stores {stats.stores}  "
+            f"evictions {stats.evictions}  invalidations {stats.invalidations}  hit rate {stats.hit_rate:.1%}"
+        )
 
-    def get_token(user_id):
-        """Return the stored token for the given user id."""
-        if not users_list:
-            raise ValueError("No users found in context. Ensure create_user fixture runs first.")
-        user = next((user for user in users_list if user["_id"] == user_id), None)
-        if user:
-            authorization = user.get("authorization")
-            if not authorization:
-                raise ValueError(
-                    f"User with id {user_id} is missing authorization token. Ensure login_user fixture runs first."
-                )
-            return authorization
-        else:
-            raise ValueError(f"User with id {user_id} not found")
+    limiter = RateLimiter.shared()
+    if limiter is not None:
+        terminalreporter.write_sep("-", "rate limiter")
+        terminalreporter.write_line(f"{'endpoint':<12}{'calls':>8}{'delayed':>9}{'waited s':>10}{'max ms':>9}")
+        for stats in limiter.summary():
+            terminalreporter.write_line(
+                f"{stats.endpoint:<12}{stats.calls:>8}{stats.delayed:>9}{stats.waited:>10.3f}{stats.max_wait * 1000:>9.1f}"
+            )
 
-    return get_token
+    tokens = TokenManager.shared().stats
+    if tokens.hits or tokens.logins or tokens.failures:
+        terminalreporter.write_sep("-", "login tokens")
+        terminalreporter.write_line(
+            f"cached {tokens.hits}  logins {tokens.logins}  refreshed {tokens.refreshes}  failed {tokens.failures}  "
+            f"refresh time {tokens.refresh_time:.3f}s"
+        )
 
 
-@pytest.fixture
-def random_admin_token(context):
-    """Return a random admin token from users stored in context."""
-    users_list = context.get("usuarios")
+def pytest_sessionfinish(session, exitstatus):
+    """Flush buffered HTTP logs and data snapshots and release pooled connections once the run is over."""
+    Logger.flush()
+    FileManager.flush_snapshots()
+    TokenManager.close_shared()
+    SessionManager.close()
+
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["seed_timings"] = [asdict(timing) for timing in BulkSeeder.timings]
+        cache = ResponseCache.shared()
+        if cache is not None:
+            workeroutput["http_cache"] = asdict(cache.stats)
+        workeroutput["login_tokens"] = asdict(TokenManager.shared().stats)
+        limiter = RateLimiter.shared()
+        if limiter is not None:
+            workeroutput["rate_limiter"] = limiter.export()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Collect the seeding timings, cache and rate limiter counters of a finished pytest-xdist worker."""
+    workeroutput = getattr(node, "workeroutput", {})
+    for timing in workeroutput.get("seed_timings", []):
+        BulkSeeder.timings.append(PhaseTiming(**timing))
+
+    cache = ResponseCache.shared()
+    if cache is not None and "http_cache" in workeroutput:
+        cache.stats.merge(CacheStats(**workeroutput["http_cache"]))
+    if "login_tokens" in workeroutput:
+        TokenManager.shared().stats.merge(TokenStats(**workeroutput["login_tokens"]))
+    limiter = RateLimiter.shared()
+    if limiter is not None and "rate_limiter" in workeroutput:
+        limiter.merge(workeroutput["rate_limiter"])
+
+
+def fresh_keys(request):
+    """Return the context keys the requesting test creates itself, or None when it creates everything."""
+    marker = request.node.get_closest_marker("mutating")
+    if marker is None:
+        return set()
+    if not marker.args:
+        return None
+    keys = set(marker.args)
+    if PRODUCTS in keys:
+        keys.add(PRODUCT_IDS)
+    return keys
+
+
+def builds(request, key):
+    """Return True when the requesting test creates the entities under key instead of reusing the seed."""
+    keys = fresh_keys(request)
+    return keys is None or key in keys
+
+
+def pick_admin_token(users_list):
+    """Return the token of a random admin user."""
     if not users_list:
         raise ValueError("No users found in context. Ensure create_user fixture runs before create_product.")
 
@@ -75,6 +159,230 @@ def random_admin_token(context):
     return authorization
 
 
+def create_users(users):
+    """Create users concurrently and attach their ids."""
+    # Responses keep the order of users
+    responses = BulkSeeder().run("create_user", Users().create_user, users)
+
+    for user_data, response in zip(users, responses, strict=True):
+        # Verify response has _id before storing
+        if not response.as_dict or "_id" not in response.as_dict:
+            raise ValueError(f"Failed to create user: {response.as_dict}")
+
+        # Add the generated ID to user data for later use
+        user_data["_id"] = response.as_dict["_id"]
+
+    return responses
+
+
+def login_users(users):
+    """Log users in concurrently and attach their tokens.
+
+    Tokens come from the shared TokenManager, so credentials that already
+    hold a fresh token skip the login round trip.
+    """
+    login_payloads = []
+
+    for user_data in users:
+        login_data = {"email": user_data.get("email"), "password": user_data.get("password")}
+
+        if not login_data["email"] or not login_data["password"]:
+            raise ValueError(f"User data missing email or password: {user_data}")
+
+        login_payloads.append(login_data)
+
+    # Responses keep the order of users
+    responses = TokenManager.shared().login_many(login_payloads)
+
+    for user_data, login_data, response in zip(users, login_payloads, responses, strict=True):
+        # Verify response has authorization token before storing
+        if not response.as_dict or "authorization" not in response.as_dict:
+            raise ValueError(f"Failed to login user {login_data['email']}: {response.as_dict}")
+
+        # Store authorization token in user data
+        user_data["authorization"] = response.as_dict["authorization"]
+
+    return responses
+
+
+def create_products(products, token):
+    """Create products concurrently with an admin token and attach their ids."""
+    # Responses keep the order of products
+    client = Products()
+    responses = BulkSeeder().run(
+        "create_product", lambda product_data: client.create_product(product_data, token), products
+    )
+
+    for product_data, response in zip(products, responses, strict=True):
+        # Verify response has _id before storing
+        if not response.as_dict or "_id" not in response.as_dict:
+            raise ValueError(f"Failed to create product: {response.as_dict}")
+
+        # Add the generated ID to product data
+        product_data["_id"] = response.as_dict["_id"]
+
+    return responses
+
+
+def create_carts(users, carts, get_price):
+    """Create one cart per user concurrently and attach ids and totals."""
+    pairs = list(zip(users, carts, strict=False))
+
+    for user_data, _ in pairs:
+        if not user_data.get("authorization"):
+            raise ValueError(
+                f"User {user_data['_id']} is missing authorization token. "
+                "Ensure login_user fixture runs before create_cart."
+            )
+
+    # Responses keep the order of pairs
+    client = Carts()
+    responses = BulkSeeder().run(
+        "create_cart", lambda pair: client.create_cart(pair[1], pair[0]["authorization"]), pairs
+    )
+
+    for (user_data, cart_data), response in zip(pairs, responses, strict=True):
+        user_id = user_data["_id"]
+
+        # Verify response has _id before storing
+        if not response.as_dict or "_id" not in response.as_dict:
+            raise ValueError(f"Failed to create cart for user {user_id}: {response.as_dict}")
+
+        # Add generated cart ID to cart data
+        cart_data["_id"] = response.as_dict["_id"]
+
+        # Calculate total quantity and price for validation
+        products = cart_data["produtos"]
+        quantity_total = Calculator.calculate_quantity_total_in_cart(products)
+        price_total = 0
+
+        # Calculate total price for all products in cart
+        for product in products:
+            _id = product["idProduto"]
+            quantity = product["quantidade"]
+            price = get_price(_id)
+            price_total += Calculator.calculate_price_total_in_cart(price, quantity)
+
+        # Store calculated values and user ID in cart data
+        cart_data["quantidadeTotal"] = quantity_total
+        cart_data["precoTotal"] = price_total
+        cart_data["idUsuario"] = user_id
+
+    return responses
+
+
+class Clock:
+    """Manually advanced clock for code taking clock (and sleep) callables; sleep advances it and records the wait."""
+
+    def __init__(self, now=0.0):
+        """Start at now with no sleeps."""
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        """Return the current time."""
+        return self.now
+
+    def sleep(self, seconds):
+        """Advance the time by seconds."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    """Return a manual clock starting at zero."""
+    return Clock()
+
+
+@pytest.fixture(scope="session")
+def seed_dataset():
+    """Seed the user -> login -> product -> cart chain once and share it.
+
+    Under pytest-xdist every worker runs its own session, so each worker
+    seeds and owns a separate dataset.
+    """
+    seed = SeedDataset()
+
+    users = DataGenerator.generate_user_data_for_create(num_users=MAX_USERS_COUNT)["usuarios"]
+    seed.responses["create_user"] = create_users(users)
+    seed.responses["login_user"] = login_users(users)
+
+    products = DataGenerator.generate_product_data_for_create(num_products=MAX_PRODUCTS_COUNT)["produtos"]
+    tokens = TokenManager.shared()
+    tokens.prewarm_admins(users)
+    seed.responses["create_product"] = create_products(products, tokens.admin_token())
+    product_ids = [product["_id"] for product in products]
+
+    carts = DataGenerator.generate_cart_data_for_create(
+        product_ids,
+        {product["_id"]: product["quantidade"] for product in products},
+        num_carts=MAX_CARTS_COUNT,
+        max_products_per_cart=MAX_PRODUCTS_PER_CART_COUNT,
+        max_quantity_per_product=MAX_QUANTITY_PER_PRODUCT,
+    )["carrinhos"]
+    prices = {product["_id"]: product["preco"] for product in products}
+    seed.responses["create_cart"] = create_carts(users, carts, prices.__getitem__)
+
+    # Created carts reserve stock on the server; keep seeded quantities in sync
+    stock = {product["_id"]: product for product in products}
+    for cart_data in carts:
+        if "_id" in cart_data:
+            for product in cart_data["produtos"]:
+                stock[product["idProduto"]]["quantidade"] -= product["quantidade"]
+
+    seed.data.update(
+        {
+            "usuarios": User.many(users),
+            "produto_ids": product_ids,
+            "produtos": Product.many(products),
+            "carrinhos": Cart.many(carts),
+        }
+    )
+    return seed
+
+
+@pytest.fixture
+def context(request):
+    """Return the ContextStore used to share data between fixtures.
+
+    Tests get a copy-on-write view of the shared seed. Tests marked
+    ``mutating`` with entity keys see those keys empty and create their own
+    entities for them; a bare ``mutating`` mark starts from an empty store.
+    Both index users, products and carts for O(1) lookups.
+    """
+    keys = fresh_keys(request)
+    if keys is None:
+        return ContextStore()
+    return request.getfixturevalue("seed_dataset").view(keys)
+
+
+@pytest.fixture
+def get_user_token(context):
+    """Return a helper that fetches user tokens from the shared context."""
+
+    def get_token(user_id):
+        """Return the stored token for the given user id."""
+        if not context.get("usuarios"):
+            raise ValueError("No users found in context. Ensure create_user fixture runs first.")
+        authorization = context.user(user_id).get("authorization")
+        if not authorization:
+            raise ValueError(
+                f"User with id {user_id} is missing authorization token. Ensure login_user fixture runs first."
+            )
+        return authorization
+
+    return get_token
+
+
+@pytest.fixture
+def random_admin_token(context):
+    """Return a random admin token from users stored in context."""
+    if not context.get("usuarios"):
+        raise ValueError("No users found in context. Ensure create_user fixture runs before create_product.")
+    return pick_admin_token(context.admins())
+
+
 @pytest.fixture
 def get_product_ids(context):
     """Return product ids saved in context."""
@@ -87,17 +395,12 @@ def get_product_ids(context):
 @pytest.fixture
 def get_product_price(context):
     """Return a helper that exposes product prices from context."""
-    products_list = context.get("produtos")
 
     def get_price(product_id):
         """Return stored price for the given product id."""
-        if not products_list:
+        if not context.get("produtos"):
             raise ValueError("No products available. Ensure create_product fixture runs first.")
-        product = next((product for product in products_list if product["_id"] == product_id), None)
-        if product:
-            return product["preco"]
-        else:
-            raise ValueError(f"Product with id {product_id} not found")
+        return context.product(product_id)["preco"]
 
     return get_price
 
@@ -112,113 +415,85 @@ def get_products_quantity(context):
     return quantity_map
 
 
+@pytest.fixture
+def reseed_generator():
+    """Let a test reseed DataGenerator; the session's seed, namespace and claimed values are restored afterwards."""
+    state = (
+        data_generator.rng.getstate(),
+        data_generator.fake.random.getstate(),
+        DataGenerator.emails,
+        DataGenerator.product_names,
+        DataGenerator.seed_value,
+        DataGenerator.namespace,
+    )
+    yield DataGenerator.seed
+    rng_state, fake_state, DataGenerator.emails, DataGenerator.product_names, seed_value, namespace = state
+    data_generator.rng.setstate(rng_state)
+    data_generator.fake.random.setstate(fake_state)
+    DataGenerator.seed_value, DataGenerator.namespace = seed_value, namespace
+
+
 @pytest.fixture
 def user_data_for_create():
-    """Generate user payloads for create scenarios and load from disk."""
-    DataGenerator.generate_user_data_for_create(num_users=MAX_USERS_COUNT)
-    return FileManager.read_file("create_user_data.json")
+    """Generate user payloads for create scenarios."""
+    return DataGenerator.generate_user_data_for_create(num_users=MAX_USERS_COUNT)
 
 
 @pytest.fixture
 def user_data_for_update():
-    """Generate user payloads for update scenarios and load from disk."""
-    DataGenerator.generate_user_data_for_update(num_users=MAX_USERS_COUNT)
-    return FileManager.read_file("update_user_data.json")
+    """Generate user payloads for update scenarios."""
+    return DataGenerator.generate_user_data_for_update(num_users=MAX_USERS_COUNT)
 
 
 @pytest.fixture
-def create_user(user_data_for_create, context):
+def create_user(request, context):
     """Create users via API and persist them in the shared context."""
-    client = Users()
-    users = user_data_for_create["usuarios"]
-    responses = []
+    if not builds(request, USERS):
+        return request.getfixturevalue("seed_dataset").get_responses("create_user")
 
-    # Create each user and store response data
-    for user_data in users:
-        response = client.create_user(user_data)
-        responses.append(response)
-
-        # Verify response has _id before storing
-        if not response.as_dict or "_id" not in response.as_dict:
-            raise ValueError(f"Failed to create user: {response.as_dict}")
-
-        # Add the generated ID to user data for later use
-        user_data["_id"] = response.as_dict["_id"]
+    users = request.getfixturevalue("user_data_for_create")["usuarios"]
+    responses = create_users(users)
 
     # Store created users in shared context
-    context.update({"usuarios": users})
+    context.add_users(users)
 
     return responses
 
 
 @pytest.fixture
-def login_user(create_user, context):
+def login_user(request, create_user, context):
     """Log created users in and attach tokens to the shared context."""
-    client = Login()
-    users = context.get("usuarios")
-    responses = []
+    if not builds(request, USERS):
+        return request.getfixturevalue("seed_dataset").get_responses("login_user")
 
-    # Login each user and store authorization token
-    for user_data in users:
-        login_data = {"email": user_data.get("email"), "password": user_data.get("password")}
-
-        if not login_data["email"] or not login_data["password"]:
-            raise ValueError(f"User data missing email or password: {user_data}")
-
-        response = client.login(login_data)
-        responses.append(response)
-
-        # Verify response has authorization token before storing
-        if not response.as_dict or "authorization" not in response.as_dict:
-            raise ValueError(f"Failed to login user {login_data['email']}: {response.as_dict}")
-
-        # Store authorization token in user data
-        user_data["authorization"] = response.as_dict["authorization"]
-
-    # Update context with users containing authorization tokens
-    context["usuarios"] = users
-
-    return responses
+    # Tokens are attached to the user records the context already holds
+    return login_users(context.get("usuarios"))
 
 
 @pytest.fixture
 def product_data_for_create():
-    """Generate product creation data and load it from disk."""
-    DataGenerator.generate_product_data_for_create(num_products=MAX_PRODUCTS_COUNT)
-    return FileManager.read_file("create_product_data.json")
+    """Generate product creation data."""
+    return DataGenerator.generate_product_data_for_create(num_products=MAX_PRODUCTS_COUNT)
 
 
 @pytest.fixture
 def product_data_for_update():
-    """Generate product update data and load it from disk."""
-    DataGenerator.generate_product_data_for_update(num_products=MAX_PRODUCTS_COUNT)
-    return FileManager.read_file("update_product_data.json")
+    """Generate product update data."""
+    return DataGenerator.generate_product_data_for_update(num_products=MAX_PRODUCTS_COUNT)
 
 
 @pytest.fixture
-def create_product(login_user, random_admin_token, product_data_for_create, context):
+def create_product(request, login_user, context):
     """Create products with admin token and capture ids in context."""
-    client = Products()
-    token = random_admin_token
-    products = product_data_for_create["produtos"]
-    product_ids = []
-    responses = []
+    if not builds(request, PRODUCTS):
+        return request.getfixturevalue("seed_dataset").get_responses("create_product")
 
-    # Create each product and store response data
-    for product_data in products:
-        response = client.create_product(product_data, token)
-        responses.append(response)
-
-        # Verify response has _id before storing
-        if not response.as_dict or "_id" not in response.as_dict:
-            raise ValueError(f"Failed to create product: {response.as_dict}")
-
-        # Add the generated ID to product data and collect IDs
-        product_data["_id"] = response.as_dict["_id"]
-        product_ids.append(response.as_dict["_id"])
+    token = request.getfixturevalue("random_admin_token")
+    products = request.getfixturevalue("product_data_for_create")["produtos"]
+    responses = create_products(products, token)
 
     # Store created products and IDs in shared context
-    context.update({"produto_ids": product_ids, "produtos": products})
+    context.add_products(products)
 
     return responses
 
@@ -226,73 +501,30 @@ def create_product(login_user, random_admin_token, product_data_for_create, cont
 @pytest.fixture
 def generate_cart_data_for_create(get_product_ids, get_products_quantity):
     """Build cart payloads based on generated products and inventory."""
-    DataGenerator.generate_cart_data_for_create(
+    return DataGenerator.generate_cart_data_for_create(
         get_product_ids,
         get_products_quantity,
         num_carts=MAX_CARTS_COUNT,
         max_products_per_cart=MAX_PRODUCTS_PER_CART_COUNT,
         max_quantity_per_product=MAX_QUANTITY_PER_PRODUCT,
     )
-    return FileManager.read_file("create_cart_data.json")
 
 
 @pytest.fixture
-def create_cart(
-    login_user,
-    create_product,
-    generate_cart_data_for_create,
-    context,
-    get_product_price,
-):
+def create_cart(request, login_user, create_product, context):
     """Create carts for every user and enrich context with totals."""
-    client = Carts()
+    if not builds(request, CARTS):
+        return request.getfixturevalue("seed_dataset").get_responses("create_cart")
+
     users = context.get("usuarios")
 
     if not users:
         raise ValueError("No users found in context. Ensure login_user fixture runs before create_cart.")
 
-    carts = generate_cart_data_for_create["carrinhos"]
-    responses = []
-
-    # Create cart for each user
-    for user_data, cart_data in zip(users, carts, strict=False):
-        user_id = user_data["_id"]
-        token = user_data.get("authorization")
-
-        if not token:
-            raise ValueError(
-                f"User {user_id} is missing authorization token. Ensure login_user fixture runs before create_cart."
-            )
-
-        # Create the cart
-        response = client.create_cart(cart_data, token)
-        responses.append(response)
-
-        # Verify response has _id before storing
-        if not response.as_dict or "_id" not in response.as_dict:
-            raise ValueError(f"Failed to create cart for user {user_id}: {response.as_dict}")
-
-        # Add generated cart ID to cart data
-        cart_data["_id"] = response.as_dict["_id"]
-
-        # Calculate total quantity and price for validation
-        products = cart_data["produtos"]
-        quantity_total = Calculator.calculate_quantity_total_in_cart(products)
-        price_total = 0
-
-        # Calculate total price for all products in cart
-        for product in products:
-            _id = product["idProduto"]
-            quantity = product["quantidade"]
-            price = get_product_price(_id)
-            price_total += Calculator.calculate_price_total_in_cart(price, quantity)
-
-        # Store calculated values and user ID in cart data
-        cart_data["quantidadeTotal"] = quantity_total
-        cart_data["precoTotal"] = price_total
-        cart_data["idUsuario"] = user_id
+    carts = request.getfixturevalue("generate_cart_data_for_create")["carrinhos"]
+    responses = create_carts(users, carts, request.getfixturevalue("get_product_price"))
 
     # Store created carts in shared context
-    context.update({"carrinhos": carts})
+    context.add_carts(carts)
 
     return responses
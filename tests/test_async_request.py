@@ -0,0 +1,208 @@
+"""Tests for the non-blocking async client stack (utils.async_request and utils.async_transport)."""
+
+import asyncio
+import logging
+import socket
+import threading
+import time
+
+import pytest
+import requests
+from assertpy import assert_that, soft_assertions
+
+from fake_serverest.server import FakeServeRest
+from services.base_client import DEFAULT_HEADERS
+from services.serverest_api.async_api.users import AsyncUsers
+from utils.async_request import AsyncAPIRequest
+from utils.async_transport import AsyncConnectionPool
+from utils.retry import CircuitBreaker, CircuitBreakers, RetryPolicy, is_connect_error
+
+logger = logging.getLogger(__name__)
+
+# Thread pool size of the thread-offload wrapper the async clients used to run on
+THREAD_CAP = 32
+SLOW = 0.5
+
+
+@pytest.fixture(scope="module")
+def slow_server():
+    """Return a fake server answering every call after SLOW seconds."""
+    with FakeServeRest(latency=SLOW) as server:
+        yield server
+
+
+@pytest.fixture
+def in_flight(monkeypatch):
+    """Count exchanges in flight on the transport; return the peak and the threads they ran on."""
+    seen = {"now": 0, "peak": 0, "threads": set()}
+    exchange = AsyncConnectionPool._exchange
+
+    async def counted(self, *args):
+        seen["now"] += 1
+        seen["peak"] = max(seen["peak"], seen["now"])
+        seen["threads"].add(threading.get_ident())
+        try:
+            return await exchange(self, *args)
+        finally:
+            seen["now"] -= 1
+
+    monkeypatch.setattr(AsyncConnectionPool, "_exchange", counted)
+    return seen
+
+
+async def answer_raw(payload):
+    """Serve payload once on a local port; return the server and its base URI."""
+
+    async def handle(reader, writer):
+        while (await reader.readline()) not in (b"\r\n", b""):
+            pass
+        writer.write(payload)
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+
+class TestAsyncConcurrency:
+    """Calls in flight on one event loop without a thread per call."""
+
+    def test_if_calls_beyond_the_thread_cap_are_in_flight_at_once(self, slow_server, in_flight):
+        """Ensure 100 slow GETs overlap on the loop's own thread and finish in about one server delay."""
+        logger.info("Starting test: test_if_calls_beyond_the_thread_cap_are_in_flight_at_once")
+        calls = 100
+        users = AsyncUsers(AsyncAPIRequest(max_connections=calls), base_uri=slow_server.url)
+
+        async def run_all():
+            try:
+                started = time.perf_counter()
+                responses = await asyncio.gather(*(users.get_user() for _ in range(calls)))
+                return responses, time.perf_counter() - started
+            finally:
+                await users.aclose()
+
+        responses, elapsed = asyncio.run(run_all())
+        logger.info(f"{calls} call(s) of {SLOW}s each took {elapsed:.2f}s")
+
+        with soft_assertions():
+            assert_that({response.status_code for response in responses}).is_equal_to({200})
+            assert_that(in_flight["peak"]).is_equal_to(calls)
+            assert_that(in_flight["threads"]).is_length(1)
+            # Capped at THREAD_CAP calls at once, 100 calls take at least ceil(100 / 32) = 4 delays
+            assert_that(elapsed).is_less_than(SLOW * -(-calls // THREAD_CAP) / 2)
+        logger.info("Test completed: test_if_calls_beyond_the_thread_cap_are_in_flight_at_once")
+
+    def test_if_max_connections_caps_calls_in_flight(self, slow_server, in_flight):
+        """Ensure calls beyond max_connections wait for a free connection instead of opening more."""
+        logger.info("Starting test: test_if_max_connections_caps_calls_in_flight")
+        request = AsyncAPIRequest(max_connections=5)
+
+        async def run_all():
+            try:
+                return await asyncio.gather(
+                    *(request.get_request(f"{slow_server.url}/usuarios", dict(DEFAULT_HEADERS)) for _ in range(15))
+                )
+            finally:
+                await request.aclose()
+
+        responses = asyncio.run(run_all())
+
+        with soft_assertions():
+            assert_that(responses).is_length(15)
+            assert_that(in_flight["peak"]).is_equal_to(5)
+        logger.info("Test completed: test_if_max_connections_caps_calls_in_flight")
+
+
+class TestAsyncTransport:
+    """Keep-alive, framing and failures of the asyncio HTTP/1.1 client."""
+
+    def test_if_connections_are_kept_alive_and_closed(self, fake_serverest):
+        """Ensure a second call reuses the pooled connection and aclose releases it."""
+        logger.info("Starting test: test_if_connections_are_kept_alive_and_closed")
+        request = AsyncAPIRequest()
+
+        async def run():
+            first = await request.get_request(f"{fake_serverest.url}/usuarios", dict(DEFAULT_HEADERS))
+            second = await request.get_request(f"{fake_serverest.url}/produtos", dict(DEFAULT_HEADERS))
+            pooled = request.pool.idle_connections()
+            await request.aclose()
+            return first, second, pooled, request.pool.idle_connections()
+
+        first, second, pooled, closed = asyncio.run(run())
+
+        with soft_assertions():
+            assert_that(first.as_dict).contains_key("usuarios")
+            assert_that(first.connect_time).is_greater_than(0)
+            assert_that(second.as_dict).contains_key("produtos")
+            assert_that(second.connect_time).is_zero()
+            assert_that([pooled, closed]).is_equal_to([1, 0])
+        logger.info("Test completed: test_if_connections_are_kept_alive_and_closed")
+
+    @pytest.mark.parametrize(
+        "payload, reusable",
+        [
+            (
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nTransfer-Encoding: chunked\r\n\r\n"
+                b'6;ext=1\r\n{"a": \r\n2\r\n1}\r\n0\r\nX-Trailer: x\r\n\r\n',
+                1,
+            ),
+            (b'HTTP/1.0 200 OK\r\nContent-Type: application/json\r\n\r\n{"a": 1}', 0),
+        ],
+        ids=["chunked", "close-delimited"],
+    )
+    def test_if_unframed_and_chunked_bodies_are_read(self, payload, reusable):
+        """Ensure chunked bodies and bodies ended by the server closing the connection are read whole.
+
+        Only a connection whose answer was framed can carry the next call.
+        """
+        logger.info("Starting test: test_if_unframed_and_chunked_bodies_are_read")
+        pool = AsyncConnectionPool()
+
+        async def run():
+            server, url = await answer_raw(payload)
+            async with server:
+                prepared = requests.Request("GET", f"{url}/x").prepare()
+                response, _ = await pool.send(prepared)
+                pooled = pool.idle_connections()
+                await pool.aclose()
+                return response, pooled
+
+        response, pooled = asyncio.run(run())
+
+        with soft_assertions():
+            assert_that(response.json()).is_equal_to({"a": 1})
+            assert_that(response.encoding).is_equal_to("utf-8")
+            assert_that(pooled).is_equal_to(reusable)
+        logger.info("Test completed: test_if_unframed_and_chunked_bodies_are_read")
+
+    def test_if_refused_post_is_retried_once_per_policy_attempt(self, clock, monkeypatch):
+        """Ensure a refused connection raises a connect error the policy retries, even for POST."""
+        logger.info("Starting test: test_if_refused_post_is_retried_once_per_policy_attempt")
+        breaker = CircuitBreaker("/usuarios", threshold=10, reset_timeout=10, clock=clock)
+        monkeypatch.setattr(CircuitBreakers, "for_url", classmethod(lambda cls, url: breaker))
+        with socket.socket() as closed:
+            closed.bind(("127.0.0.1", 0))
+            port = closed.getsockname()[1]
+        request = AsyncAPIRequest(retry=RetryPolicy(attempts=2, backoff=0))
+
+        with pytest.raises(requests.ConnectionError) as raised:
+            asyncio.run(request.post_request(f"http://127.0.0.1:{port}/usuarios", "{}", dict(DEFAULT_HEADERS)))
+
+        with soft_assertions():
+            assert_that(is_connect_error(raised.value)).is_true()
+            assert_that(breaker.stats.retries).is_equal_to(2)
+            assert_that(breaker.stats.exhausted).is_equal_to(1)
+        logger.info("Test completed: test_if_refused_post_is_retried_once_per_policy_attempt")
+
+    def test_if_slow_answer_raises_read_timeout(self, slow_server):
+        """Ensure an answer slower than the read timeout raises ReadTimeout and drops the connection."""
+        logger.info("Starting test: test_if_slow_answer_raises_read_timeout")
+        request = AsyncAPIRequest(timeout=(1, SLOW / 5), retry=RetryPolicy(attempts=0))
+
+        async def run():
+            with pytest.raises(requests.ReadTimeout):
+                await request.get_request(f"{slow_server.url}/usuarios", dict(DEFAULT_HEADERS))
+            return request.pool.idle_connections()
+
+        assert_that(asyncio.run(run())).is_zero()
+        logger.info("Test completed: test_if_slow_answer_raises_read_timeout")
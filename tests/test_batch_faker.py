@@ -0,0 +1,121 @@
+"""Tests for batched fake data (utils.batch_faker) and the batches DataGenerator builds from it."""
+
+import logging
+import random
+import string
+
+import pytest
+from assertpy import assert_that, soft_assertions
+from faker import Faker
+
+from utils.batch_faker import PASSWORD_LENGTH, BatchFaker
+from utils.data_generator import DataGenerator
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture(scope="module")
+def faker():
+    """Return one Faker instance; its provider pools are read once per BatchFaker."""
+    return Faker()
+
+
+class TestBatchFaker:
+    """Values drawn in batches from Faker's provider pools."""
+
+    def test_if_people_get_emails_derived_from_their_names(self, faker):
+        """Ensure every email is the lower-cased name plus a number at a safe example domain."""
+        logger.info("Starting test: test_if_people_get_emails_derived_from_their_names")
+        batch = BatchFaker(faker, random.Random(1))
+        people = batch.people(200)
+
+        with soft_assertions():
+            assert_that(people).is_length(200)
+            for name, email in people:
+                local, _, domain = email.partition("@")
+                first = name.split(" ", 1)[0]
+                assert_that(local).starts_with(first.lower().replace("'", "").replace(" ", ""))
+                assert_that(local).matches(r"^[^\s']+\d{1,2}$")
+                assert_that(email).is_lower()
+                assert_that(batch.email_domains).contains(domain)
+        logger.info("Test completed: test_if_people_get_emails_derived_from_their_names")
+
+    def test_if_same_seed_draws_the_same_batch(self, faker):
+        """Ensure batches depend only on the rng, so a seeded run is reproducible."""
+        logger.info("Starting test: test_if_same_seed_draws_the_same_batch")
+
+        def draw(seed):
+            batch = BatchFaker(faker, random.Random(seed))
+            return batch.people(20), batch.passwords(20), batch.catch_phrases(20), batch.integers(1, 9, 20)
+
+        with soft_assertions():
+            assert_that(draw(3)).is_equal_to(draw(3))
+            assert_that(draw(3)).is_not_equal_to(draw(4))
+        logger.info("Test completed: test_if_same_seed_draws_the_same_batch")
+
+    def test_if_scalar_fields_stay_in_their_ranges(self, faker):
+        """Ensure passwords, catch phrases, integers and flags follow their definitions."""
+        logger.info("Starting test: test_if_scalar_fields_stay_in_their_ranges")
+        batch = BatchFaker(faker, random.Random(2))
+        passwords = batch.passwords(100)
+        phrases = batch.catch_phrases(100)
+        integers = batch.integers(10, 12, 1_000)
+        flags = batch.flags(0.2, 10_000)
+
+        with soft_assertions():
+            assert_that({len(password) for password in passwords}).is_equal_to({PASSWORD_LENGTH})
+            assert_that(set("".join(passwords)) - set(string.ascii_letters + string.digits)).is_empty()
+            first_words, *_, last_words = batch.catch_phrase_words
+            for phrase in phrases:
+                assert_that(first_words).contains(phrase.split(" ", 1)[0])
+                assert_that(any(phrase.endswith(f" {word}") for word in last_words)).is_true()
+            assert_that(set(integers)).is_equal_to({10, 11, 12})
+            assert_that(sum(flags) / len(flags)).is_between(0.18, 0.22)
+            assert_that(batch.people(0)).is_empty()
+        logger.info("Test completed: test_if_scalar_fields_stay_in_their_ranges")
+
+    def test_if_missing_provider_attribute_is_reported(self, faker):
+        """Ensure a pool no provider defines raises ValueError naming it."""
+        logger.info("Starting test: test_if_missing_provider_attribute_is_reported")
+        with pytest.raises(ValueError, match="no_such_pool"):
+            BatchFaker(faker)._provider_attr("no_such_pool")
+        logger.info("Test completed: test_if_missing_provider_attribute_is_reported")
+
+
+class TestBatchUniqueness:
+    """Emails and product names DataGenerator hands out from batches."""
+
+    def test_if_large_user_batch_has_unique_emails(self, reseed_generator):
+        """Ensure repeats drawn from the name pools become numbered variants instead of duplicates."""
+        logger.info("Starting test: test_if_large_user_batch_has_unique_emails")
+        reseed_generator(21)
+        users = DataGenerator.batch_user_data(5_000)
+        emails = [user["email"] for user in users]
+
+        with soft_assertions():
+            assert_that(set(emails)).is_length(len(emails))
+            assert_that(users[0]["administrador"]).is_equal_to("true")
+        logger.info("Test completed: test_if_large_user_batch_has_unique_emails")
+
+    def test_if_names_stay_unique_across_batches(self, reseed_generator):
+        """Ensure a later batch never repeats a product name or email of an earlier one."""
+        logger.info("Starting test: test_if_names_stay_unique_across_batches")
+        reseed_generator(22)
+        names = [product["nome"] for _ in range(20) for product in DataGenerator.batch_product_data(200)]
+        emails = [user["email"] for _ in range(5) for user in DataGenerator.batch_user_data(500)]
+
+        with soft_assertions():
+            assert_that(set(names)).is_length(4_000)
+            assert_that(set(emails)).is_length(2_500)
+        logger.info("Test completed: test_if_names_stay_unique_across_batches")
+
+    def test_if_reseeding_replays_the_same_records(self, reseed_generator):
+        """Ensure the same seed yields the same users and products again, claimed values included."""
+        logger.info("Starting test: test_if_reseeding_replays_the_same_records")
+
+        def generate(seed):
+            reseed_generator(seed)
+            return DataGenerator.batch_user_data(50), DataGenerator.batch_product_data(50)
+
+        assert_that(generate(23)).is_equal_to(generate(23))
+        logger.info("Test completed: test_if_reseeding_replays_the_same_records")
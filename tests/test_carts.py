@@ -2,6 +2,7 @@
 
 import logging
 
+import pytest
 from assertpy import assert_that, soft_assertions
 
 from services.serverest_api.api.carts import Carts
@@ -161,6 +162,8 @@ class TestCarts:
 
         logger.info("Test completed: test_if_cart_can_be_fetched_by_id")
 
+    # Carts take stock from their products and fill their owners' one cart slot
+    @pytest.mark.mutating("carrinhos", "produtos", "usuarios")
     def test_if_cart_can_be_checkout(self, login_user, create_cart, context, get_user_token):
         """Confirm checkout completes successfully for every cart."""
         logger.info("Starting test: test_if_cart_can_be_checkout")
@@ -189,6 +192,8 @@ class TestCarts:
 
         logger.info("Test completed: test_if_cart_can_be_checkout")
 
+    # Carts take stock from their products and fill their owners' one cart slot
+    @pytest.mark.mutating("carrinhos", "produtos", "usuarios")
     def test_if_cart_can_be_deleted(self, login_user, create_cart, context, get_user_token):
         """Ensure cart deletion works and stock adjustments succeed."""
         logger.info("Starting test: test_if_cart_can_be_deleted")
@@ -0,0 +1,125 @@
+"""Concurrency stress tests: one shared client must keep every call's token to itself."""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from assertpy import assert_that, soft_assertions
+
+from services.serverest_api.api.carts import Carts
+from services.serverest_api.api.products import Products
+from services.serverest_api.api.users import Users
+from services.serverest_api.async_api.carts import AsyncCarts
+from utils.bulk_seeder import BulkSeeder
+from utils.data_generator import DataGenerator
+from utils.token_manager import TokenManager
+
+logger = logging.getLogger(__name__)
+
+STRESS_USERS = 64
+STRESS_WORKERS = 16
+
+
+@pytest.fixture(scope="module")
+def stress_users(fake_serverest):
+    """Create STRESS_USERS logged-in users (every other one an admin) and a well-stocked product."""
+    base_uri = fake_serverest.url
+    users = DataGenerator.batch_user_data(STRESS_USERS)
+    for index, user in enumerate(users):
+        user["administrador"] = "true" if index % 2 == 0 else "false"
+
+    for user, response in zip(users, BulkSeeder().run("stress_user", Users(base_uri).create_user, users), strict=True):
+        assert_that(response.status_code).is_equal_to(201)
+        user["_id"] = response.as_dict["_id"]
+
+    for user, response in zip(users, TokenManager(base_uri, auto_refresh=False).login_many(users), strict=True):
+        user["authorization"] = response.as_dict["authorization"]
+
+    product = {**DataGenerator.batch_product_data(1)[0], "quantidade": STRESS_USERS * 10}
+    response = Products(base_uri).create_product(product, users[0]["authorization"])
+    assert_that(response.status_code).is_equal_to(201)
+    return base_uri, users, response.as_dict["_id"]
+
+
+class TestConcurrency:
+    """Hammer shared client instances from many threads and coroutines at once."""
+
+    def test_if_shared_client_keeps_tokens_apart_across_threads(self, stress_users):
+        """Ensure every cart a shared Carts client creates, reads and deletes belongs to the caller's token."""
+        logger.info("Starting test: test_if_shared_client_keeps_tokens_apart_across_threads")
+        base_uri, users, product_id = stress_users
+        client = Carts(base_uri)
+        payload = {"produtos": [{"idProduto": product_id, "quantidade": 1}]}
+
+        def cart_round_trip(user):
+            created = client.create_cart(payload, user["authorization"])
+            fetched = client.get_cart_by_id(created.as_dict.get("_id"))
+            deleted = client.delete_cart(user["authorization"])
+            return created, fetched, deleted
+
+        with ThreadPoolExecutor(max_workers=STRESS_WORKERS) as executor:
+            results = list(executor.map(cart_round_trip, users))
+        logger.info(f"Ran {len(results)} cart round trip(s) on {STRESS_WORKERS} thread(s)")
+
+        with soft_assertions():
+            for user, (created, fetched, deleted) in zip(users, results, strict=True):
+                # A leaked token would create the cart for another user or hit their one-cart limit
+                assert_that(created.status_code).is_equal_to(201)
+                assert_that(fetched.as_dict.get("idUsuario")).is_equal_to(user["_id"])
+                # A leaked token would delete another user's cart and leave nothing to delete here
+                assert_that(deleted.as_dict["message"]).contains("Estoque dos produtos reabastecido")
+
+        logger.info("Test completed: test_if_shared_client_keeps_tokens_apart_across_threads")
+
+    def test_if_shared_async_client_keeps_tokens_apart_across_coroutines(self, stress_users):
+        """Ensure concurrent coroutines on one AsyncCarts client never act with each other's token."""
+        logger.info("Starting test: test_if_shared_async_client_keeps_tokens_apart_across_coroutines")
+        base_uri, users, product_id = stress_users
+        client = AsyncCarts(base_uri=base_uri)
+        payload = {"produtos": [{"idProduto": product_id, "quantidade": 1}]}
+
+        async def cart_round_trip(user):
+            created = await client.create_cart(payload, user["authorization"])
+            fetched = await client.get_cart_by_id(created.as_dict.get("_id"))
+            deleted = await client.delete_cart(user["authorization"])
+            return created, fetched, deleted
+
+        async def run_all():
+            try:
+                return await asyncio.gather(*(cart_round_trip(user) for user in users))
+            finally:
+                await client.aclose()
+
+        results = asyncio.run(run_all())
+        logger.info(f"Ran {len(results)} cart round trip(s) concurrently on one event loop")
+
+        with soft_assertions():
+            for user, (created, fetched, deleted) in zip(users, results, strict=True):
+                assert_that(created.status_code).is_equal_to(201)
+                assert_that(fetched.as_dict.get("idUsuario")).is_equal_to(user["_id"])
+                assert_that(deleted.as_dict["message"]).contains("Estoque dos produtos reabastecido")
+
+        logger.info("Test completed: test_if_shared_async_client_keeps_tokens_apart_across_coroutines")
+
+    def test_if_shared_client_keeps_admin_rights_apart(self, stress_users):
+        """Ensure admins and regular users interleaved on one Products client get 201 and 403 respectively."""
+        logger.info("Starting test: test_if_shared_client_keeps_admin_rights_apart")
+        base_uri, users, _ = stress_users
+        client = Products(base_uri)
+        products = DataGenerator.batch_product_data(len(users))
+
+        def create(pair):
+            user, product = pair
+            return client.create_product(product, user["authorization"])
+
+        with ThreadPoolExecutor(max_workers=STRESS_WORKERS) as executor:
+            responses = list(executor.map(create, zip(users, products, strict=True)))
+        logger.info(f"Sent {len(responses)} product creation(s) on {STRESS_WORKERS} thread(s)")
+
+        with soft_assertions():
+            for user, response in zip(users, responses, strict=True):
+                expected = 201 if user["administrador"] == "true" else 403
+                assert_that(response.status_code).is_equal_to(expected)
+
+        logger.info("Test completed: test_if_shared_client_keeps_admin_rights_apart")
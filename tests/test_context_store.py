@@ -0,0 +1,153 @@
+"""Tests for the fixture context and its lookup indexes (utils.context_store)."""
+
+import logging
+
+import pytest
+from assertpy import assert_that, soft_assertions
+
+from utils.context_store import CARTS, PRODUCT_IDS, PRODUCTS, USERS, ContextStore, EntityIndex
+from utils.models import Cart, Product, User
+
+logger = logging.getLogger(__name__)
+
+
+def users(*ids, admins=()):
+    """Return user payloads with the given ids; ids in admins are administrators."""
+    return [
+        {
+            "nome": f"User {user_id}",
+            "email": f"{user_id}@example.com",
+            "password": "secret",
+            "administrador": "true" if user_id in admins else "false",
+            "_id": user_id,
+        }
+        for user_id in ids
+    ]
+
+
+class TestEntityIndex:
+    """Lookup tables over one entity list."""
+
+    def test_if_records_are_indexed_by_id_email_and_role(self):
+        """Ensure every record is found by _id and email and admins are collected."""
+        logger.info("Starting test: test_if_records_are_indexed_by_id_email_and_role")
+        records = users("u1", "u2", "u3", admins=("u2",))
+        index = EntityIndex(records)
+
+        with soft_assertions():
+            assert_that(index.by_id["u3"]).is_same_as(records[2])
+            assert_that(index.by_email["u1@example.com"]).is_same_as(records[0])
+            assert_that(index.admins).is_equal_to([records[1]])
+        logger.info("Test completed: test_if_records_are_indexed_by_id_email_and_role")
+
+    def test_if_index_notices_a_changed_or_replaced_list(self):
+        """Ensure the index is current only for the same list at the size it indexed."""
+        logger.info("Starting test: test_if_index_notices_a_changed_or_replaced_list")
+        records = users("u1")
+        index = EntityIndex(records)
+        current = index.is_current(records)
+        records.extend(users("u2"))
+
+        with soft_assertions():
+            assert_that(current).is_true()
+            assert_that(index.is_current(records)).is_false()
+            assert_that(index.is_current(list(records[:1]))).is_false()
+            index.extend(records[1:])
+            assert_that(index.is_current(records)).is_true()
+            assert_that(index.by_id).contains_key("u2")
+        logger.info("Test completed: test_if_index_notices_a_changed_or_replaced_list")
+
+
+class TestContextStore:
+    """The dict of entity lists fixtures share, with O(1) lookups."""
+
+    def test_if_added_entities_are_stored_as_models_and_found(self):
+        """Ensure add_* stores slotted models and the lookups find them by id, email and role."""
+        logger.info("Starting test: test_if_added_entities_are_stored_as_models_and_found")
+        context = ContextStore()
+        context.add_users(users("u1", "u2", admins=("u1",)))
+        context.add_products([{"nome": "Hub", "preco": 10, "descricao": "d", "quantidade": 2, "_id": "p1"}])
+        context.add_carts([{"produtos": [{"idProduto": "p1", "quantidade": 1}], "_id": "c1"}])
+
+        with soft_assertions():
+            assert_that([type(user) for user in context[USERS]]).is_equal_to([User, User])
+            assert_that(context.user("u2")["email"]).is_equal_to("u2@example.com")
+            assert_that(context.user_by_email("u1@example.com")["_id"]).is_equal_to("u1")
+            assert_that([admin["_id"] for admin in context.admins()]).is_equal_to(["u1"])
+            assert_that(context.product("p1")).is_instance_of(Product)
+            assert_that(context[PRODUCT_IDS]).is_equal_to(["p1"])
+            assert_that(context.cart("c1")).is_instance_of(Cart)
+        logger.info("Test completed: test_if_added_entities_are_stored_as_models_and_found")
+
+    def test_if_later_additions_extend_the_index(self):
+        """Ensure entities added after a lookup are found without rebuilding from scratch."""
+        logger.info("Starting test: test_if_later_additions_extend_the_index")
+        context = ContextStore()
+        context.add_users(users("u1"))
+        index = context._index(USERS)
+        context.add_users(users("u2", admins=("u2",)))
+
+        with soft_assertions():
+            assert_that(context._index(USERS)).is_same_as(index)
+            assert_that(context.user("u2")["_id"]).is_equal_to("u2")
+            assert_that(context.admins()).is_length(1)
+        logger.info("Test completed: test_if_later_additions_extend_the_index")
+
+    def test_if_assigned_or_appended_lists_are_reindexed(self):
+        """Ensure lists assigned with [] or update, or appended to directly, are looked up fresh."""
+        logger.info("Starting test: test_if_assigned_or_appended_lists_are_reindexed")
+        context = ContextStore()
+        context.add_users(users("u1"))
+        context.user("u1")
+        context[USERS] = users("u2")
+        replaced = context.user("u2")["_id"]
+        context[USERS].extend(users("u3"))
+        appended = context.user("u3")["_id"]
+        context.update({USERS: users("u4")})
+
+        with soft_assertions():
+            assert_that([replaced, appended, context.user("u4")["_id"]]).is_equal_to(["u2", "u3", "u4"])
+            with pytest.raises(ValueError, match="u1 not found"):
+                context.user("u1")
+        logger.info("Test completed: test_if_assigned_or_appended_lists_are_reindexed")
+
+    def test_if_removed_keys_drop_their_index(self):
+        """Ensure del, pop and clear leave nothing to look up."""
+        logger.info("Starting test: test_if_removed_keys_drop_their_index")
+        context = ContextStore()
+        for remove in (lambda: context.pop(USERS), lambda: context.__delitem__(USERS), context.clear):
+            context.add_users(users("u1"))
+            context.user("u1")
+            remove()
+            with pytest.raises(ValueError, match="not found"):
+                context.user("u1")
+        logger.info("Test completed: test_if_removed_keys_drop_their_index")
+
+    @pytest.mark.parametrize(
+        "lookup, message",
+        [
+            (lambda context: context.user("nope"), "User with id nope not found"),
+            (lambda context: context.user_by_email("nope@example.com"), "User with email nope@example.com not found"),
+            (lambda context: context.product("nope"), "Product with id nope not found"),
+            (lambda context: context.cart("nope"), "Cart with id nope not found"),
+        ],
+    )
+    def test_if_unknown_entities_raise_value_error(self, lookup, message):
+        """Ensure a lookup that finds nothing names what was missing, even on an empty context."""
+        logger.info("Starting test: test_if_unknown_entities_raise_value_error")
+        with pytest.raises(ValueError, match=message):
+            lookup(ContextStore())
+        logger.info("Test completed: test_if_unknown_entities_raise_value_error")
+
+    def test_if_context_stays_a_plain_dict_of_lists(self):
+        """Ensure code using the context as a dict keeps working."""
+        logger.info("Starting test: test_if_context_stays_a_plain_dict_of_lists")
+        context = ContextStore({CARTS: []})
+        context.add_products([{"nome": "Hub", "preco": 10, "descricao": "d", "quantidade": 2, "_id": "p1"}])
+
+        with soft_assertions():
+            assert_that(context).is_instance_of(dict)
+            assert_that(sorted(context)).is_equal_to(sorted([CARTS, PRODUCTS, PRODUCT_IDS]))
+            assert_that(context.get(USERS)).is_none()
+            assert_that(context.admins()).is_empty()
+        logger.info("Test completed: test_if_context_stays_a_plain_dict_of_lists")
@@ -0,0 +1,110 @@
+"""Tests for cart composition from available stock (utils.inventory_sampler and DataGenerator.iter_cart_data)."""
+
+import logging
+import random
+from collections import Counter
+
+import pytest
+from assertpy import assert_that, soft_assertions
+
+from utils.data_generator import DataGenerator
+from utils.inventory_sampler import InventorySampler
+
+logger = logging.getLogger(__name__)
+
+
+class TestInventorySampler:
+    """Sampling distinct in-stock products and reserving their stock."""
+
+    def test_if_only_distinct_in_stock_ids_are_tracked(self):
+        """Ensure sold-out, unknown and repeated ids are never sampled."""
+        logger.info("Starting test: test_if_only_distinct_in_stock_ids_are_tracked")
+        sampler = InventorySampler(["a", "b", "a", "c", "d"], {"a": 2, "b": 0, "c": 1}, random.Random(0))
+
+        with soft_assertions():
+            assert_that(sampler).is_length(2)
+            assert_that(sorted(sampler.sample(10))).is_equal_to(["a", "c"])
+        logger.info("Test completed: test_if_only_distinct_in_stock_ids_are_tracked")
+
+    def test_if_sample_returns_k_distinct_ids(self):
+        """Ensure every sample holds k different ids, or all of them when fewer are in stock."""
+        logger.info("Starting test: test_if_sample_returns_k_distinct_ids")
+        ids = [f"p{number}" for number in range(50)]
+        sampler = InventorySampler(ids, dict.fromkeys(ids, 5), random.Random(1))
+
+        samples = [sampler.sample(7) for _ in range(200)]
+
+        with soft_assertions():
+            for sample in samples:
+                assert_that(sample).is_length(7).does_not_contain_duplicates()
+                assert_that(ids).contains(*sample)
+            assert_that(sampler.sample(0)).is_empty()
+        logger.info("Test completed: test_if_sample_returns_k_distinct_ids")
+
+    def test_if_every_in_stock_id_is_equally_likely(self):
+        """Ensure the partial shuffle favours no position of the catalogue."""
+        logger.info("Starting test: test_if_every_in_stock_id_is_equally_likely")
+        ids = [f"p{number}" for number in range(10)]
+        sampler = InventorySampler(ids, dict.fromkeys(ids, 1), random.Random(2))
+
+        drawn = Counter(product_id for _ in range(10_000) for product_id in sampler.sample(2))
+
+        assert_that(min(drawn.values()) / max(drawn.values())).is_greater_than(0.85)
+        logger.info("Test completed: test_if_every_in_stock_id_is_equally_likely")
+
+    def test_if_sold_out_ids_leave_the_sample(self):
+        """Ensure reserve updates the shared stock and drops an id once nothing is left of it."""
+        logger.info("Starting test: test_if_sold_out_ids_leave_the_sample")
+        stock = {"a": 3, "b": 1, "c": 2}
+        sampler = InventorySampler(["a", "b", "c"], stock, random.Random(3))
+
+        sampler.reserve("a", 1)
+        sampler.reserve("b", 1)
+        sampler.reserve("c", 2)
+        samples = {product_id for _ in range(50) for product_id in sampler.sample(3)}
+
+        with soft_assertions():
+            assert_that(stock).is_equal_to({"a": 2, "b": 0, "c": 0})
+            assert_that(sampler).is_length(1)
+            assert_that(samples).is_equal_to({"a"})
+        logger.info("Test completed: test_if_sold_out_ids_leave_the_sample")
+
+
+class TestCartData:
+    """Cart payloads composed within stock and per-cart limits."""
+
+    def test_if_carts_respect_stock_and_per_cart_limits(self, reseed_generator):
+        """Ensure carts never repeat a product, stay within both limits and never exceed the stock, even sold out."""
+        logger.info("Starting test: test_if_carts_respect_stock_and_per_cart_limits")
+        reseed_generator(41)
+        ids = [f"p{number}" for number in range(30)]
+        initial = {product_id: 1 + number % 4 for number, product_id in enumerate(ids)}
+        stock = dict(initial)
+
+        carts = list(DataGenerator.iter_cart_data(ids, stock, 40, max_products_per_cart=5, max_quantity_per_product=3))
+
+        taken = Counter()
+        with soft_assertions():
+            assert_that(carts).is_length(40)
+            for cart in carts:
+                products = cart["produtos"]
+                if not products:
+                    # Only once the whole catalogue is sold out
+                    assert_that(sum(stock.values())).is_zero()
+                assert_that(len(products)).is_less_than_or_equal_to(5)
+                assert_that([product["idProduto"] for product in products]).does_not_contain_duplicates()
+                for product in products:
+                    assert_that(product["quantidade"]).is_between(1, 3)
+                    taken[product["idProduto"]] += product["quantidade"]
+            for product_id in ids:
+                assert_that(taken[product_id]).is_less_than_or_equal_to(initial[product_id])
+                assert_that(stock[product_id]).is_equal_to(initial[product_id] - taken[product_id])
+        logger.info("Test completed: test_if_carts_respect_stock_and_per_cart_limits")
+
+    @pytest.mark.parametrize("product_ids, stock", [([], {"p": 1}), (["p"], {})])
+    def test_if_missing_catalogue_is_rejected(self, product_ids, stock):
+        """Ensure carts cannot be composed without product ids or stock."""
+        logger.info("Starting test: test_if_missing_catalogue_is_rejected")
+        with pytest.raises(ValueError, match="cannot be empty"):
+            next(DataGenerator.iter_cart_data(product_ids, stock, 1, 1, 1))
+        logger.info("Test completed: test_if_missing_catalogue_is_rejected")
@@ -0,0 +1,101 @@
+"""Tests for latency budgets (plugins.latency_budget) and the reservoirs they check."""
+
+import logging
+import random
+import time
+
+from assertpy import assert_that, soft_assertions
+
+from plugins.latency_budget import LatencyBudget
+from services.serverest_api.api.users import Users
+from utils.data_generator import DataGenerator
+from utils.metrics import LatencyRecorder, LatencyReservoir
+from utils.token_manager import TokenManager
+
+logger = logging.getLogger(__name__)
+
+
+def reservoir(durations, size=1000):
+    """Return a reservoir of the given size over durations, in seconds."""
+    result = LatencyReservoir(size, random.Random(0))
+    for started, elapsed in enumerate(durations):
+        result.add(started, elapsed)
+    return result
+
+
+class TestLatencyBudget:
+    """Checking one budget against the reservoir of its operation."""
+
+    def test_if_max_budget_uses_exact_maximum_of_sampled_reservoir(self):
+        """Ensure a slow call evicted from the sample still breaks a max budget."""
+        logger.info("Starting test: test_if_max_budget_uses_exact_maximum_of_sampled_reservoir")
+        sampled = reservoir([0.5] + [0.01] * 999, size=10)
+        budget = LatencyBudget("Products.get_product", "max", 100)
+
+        message = budget.check({"Products.get_product": sampled})
+
+        with soft_assertions():
+            assert_that(sampled.durations).does_not_contain(0.5)
+            assert_that(message).contains("max = 500.0 ms", "(1000 call(s))")
+        logger.info("Test completed: test_if_max_budget_uses_exact_maximum_of_sampled_reservoir")
+
+    def test_if_percentile_budget_holds_or_fails_on_its_percentile(self):
+        """Ensure a p95 budget passes under the limit and reports the value above it."""
+        logger.info("Starting test: test_if_percentile_budget_holds_or_fails_on_its_percentile")
+        durations = {"Login.login": reservoir([step / 1000 for step in range(1, 101)])}
+
+        with soft_assertions():
+            assert_that(LatencyBudget("Login.login", "p95", 100).check(durations)).is_none()
+            assert_that(LatencyBudget("Login.login", "p95", 50).check(durations)).contains("p95 = 95.0 ms")
+        logger.info("Test completed: test_if_percentile_budget_holds_or_fails_on_its_percentile")
+
+    def test_if_budget_without_calls_holds(self):
+        """Ensure an operation that was never called does not break its budget."""
+        logger.info("Starting test: test_if_budget_without_calls_holds")
+        assert_that(LatencyBudget("Carts.get_cart", "max", 1).check({})).is_none()
+        logger.info("Test completed: test_if_budget_without_calls_holds")
+
+
+class TestOperationAttribution:
+    """Which operation recorded calls are checked under."""
+
+    def test_if_samples_give_exact_reservoirs_per_operation(self):
+        """Ensure reservoirs built from samples keep every duration, grouped by operation."""
+        logger.info("Starting test: test_if_samples_give_exact_reservoirs_per_operation")
+        samples = [
+            ("/produtos", "Products.get_product", 0.0, 0.3),
+            ("/produtos", "Products.get_product", 1.0, 0.1),
+            ("/produtos", "Products.get_product", 2.0, 0.2),
+            ("/usuarios", None, 3.0, 0.4),
+        ]
+
+        reservoirs = LatencyRecorder.operation_reservoirs(samples)
+
+        with soft_assertions():
+            assert_that(reservoirs).contains_only("Products.get_product")
+            assert_that(sorted(reservoirs["Products.get_product"].durations)).is_equal_to([0.1, 0.2, 0.3])
+            assert_that(reservoirs["Products.get_product"].max).is_equal_to(0.3)
+        logger.info("Test completed: test_if_samples_give_exact_reservoirs_per_operation")
+
+    def test_if_background_token_refreshes_are_not_counted_as_logins(self, fake_serverest):
+        """Ensure refresher logins are recorded as token_refresh, out of reach of Login.login budgets."""
+        logger.info("Starting test: test_if_background_token_refreshes_are_not_counted_as_logins")
+        (user,) = DataGenerator.batch_user_data(1)
+        assert_that(Users(fake_serverest.url).create_user(user).status_code).is_equal_to(201)
+        credentials = {"email": user["email"], "password": user["password"]}
+        manager = TokenManager(fake_serverest.url, refresh_margin=0.2, default_ttl=0.4, auto_refresh=True)
+        start = LatencyRecorder.count()
+        try:
+            manager.token(credentials)
+            deadline = time.monotonic() + 5
+            while manager.stats.refreshes == 0 and time.monotonic() < deadline:
+                time.sleep(0.05)
+        finally:
+            manager.close()
+
+        reservoirs = LatencyRecorder.operation_reservoirs(LatencyRecorder.samples(start))
+
+        with soft_assertions():
+            assert_that(reservoirs["Login.login"].count).is_equal_to(1)
+            assert_that(reservoirs["token_refresh"].count).is_greater_than_or_equal_to(1)
+        logger.info("Test completed: test_if_background_token_refreshes_are_not_counted_as_logins")
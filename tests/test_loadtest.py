@@ -0,0 +1,66 @@
+"""Tests for the multi-process load generator (loadtest.runner)."""
+
+import logging
+
+import pytest
+from assertpy import assert_that, soft_assertions
+
+from loadtest.runner import LoadSettings, run
+from loadtest.scenarios import DEFAULT_MIX
+from utils.log_reader import iter_records
+from utils.logger import Logger
+
+logger = logging.getLogger(__name__)
+
+PROCESSES = 2
+
+
+@pytest.fixture
+def logs_dir(tmp_path, monkeypatch):
+    """Point the log files of this process, and of the workers it forks, at a temporary directory."""
+    monkeypatch.setattr(Logger, "logs_dir", tmp_path)
+    monkeypatch.setattr(Logger, "file_path", tmp_path / Logger.file_name)
+    return tmp_path
+
+
+class TestLoadRunner:
+    """Load runs spread over worker processes."""
+
+    def test_if_default_settings_are_valid(self):
+        """Ensure a bare LoadSettings runs the default scenario mix."""
+        settings = LoadSettings()
+        settings.validate()
+        assert_that(settings.mix).is_equal_to(DEFAULT_MIX)
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [{"model": "ramp"}, {"duration": 0}, {"processes": 3, "users": 2}, {"model": "open", "rate": 0}, {"mix": ""}],
+        ids=["model", "duration", "users", "rate", "mix"],
+    )
+    def test_if_invalid_settings_raise(self, overrides):
+        """Ensure settings that cannot run are rejected before any process starts."""
+        assert_that(LoadSettings(**overrides).validate).raises(ValueError).when_called_with()
+
+    def test_if_worker_processes_write_separate_readable_logs(self, fake_serverest, logs_dir):
+        """Ensure every worker writes its own text and structured log and each structured file reads back whole."""
+        logger.info("Starting test: test_if_worker_processes_write_separate_readable_logs")
+        settings = LoadSettings(duration=1, processes=PROCESSES, users=4, seed=1, base_uri=fake_serverest.url)
+
+        results = run(settings)
+
+        structured = sorted(logs_dir.glob(f"{Logger.structured_prefix}_lt*.jsonl*"))
+        text_logs = sorted(logs_dir.glob(f"log_{Logger.run_stamp}{Logger.worker_suffix}_lt*.log"))
+        records = list(iter_records(structured))
+        samples = sum(len(result.samples) for result in results)
+        with soft_assertions():
+            assert_that(structured).is_length(PROCESSES)
+            assert_that(text_logs).is_length(PROCESSES)
+            assert_that(samples).is_greater_than(0)
+            # Setup and teardown calls are logged too
+            assert_that(len(records)).is_greater_than_or_equal_to(samples)
+            assert_that({record["url"].split("/")[2] for record in records}).is_equal_to(
+                {fake_serverest.url.split("/")[2]}
+            )
+            for path in text_logs:
+                assert_that(path.read_text(encoding="utf-8")).contains("Request URL:")
+        logger.info("Test completed: test_if_worker_processes_write_separate_readable_logs")
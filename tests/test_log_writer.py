@@ -0,0 +1,206 @@
+"""Tests for the background log writer (utils.log_writer) and what Logger hands it."""
+
+import io
+import logging
+import os
+import threading
+
+import pytest
+import requests
+from assertpy import assert_that, soft_assertions
+
+from utils.log_writer import BackgroundLogWriter
+from utils.logger import Logger
+
+logger = logging.getLogger(__name__)
+
+
+class Gate:
+    """Record callable that holds the writer thread until released."""
+
+    def __init__(self):
+        """Start closed."""
+        self.entered = threading.Event()
+        self.released = threading.Event()
+
+    def __call__(self):
+        """Block the writer thread until release is called."""
+        self.entered.set()
+        self.released.wait(5)
+        return "gate\n"
+
+    def release(self):
+        """Let the writer thread go on."""
+        self.released.set()
+
+
+class FailingStream(io.StringIO):
+    """Text stream whose first failures writes raise OSError."""
+
+    def __init__(self, failures):
+        """Fail the first failures writes."""
+        super().__init__()
+        self.failures = failures
+
+    def write(self, text):
+        """Raise while failures remain, then write."""
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        return super().write(text)
+
+    def close(self):
+        """Keep the contents readable after the writer closes the stream."""
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    """Return the path of a log file in a temporary directory."""
+    return tmp_path / "test.log"
+
+
+class TestBackgroundLogWriter:
+    """Buffering, overflow and failure handling of BackgroundLogWriter."""
+
+    def test_if_flush_writes_strings_and_formatted_callables_in_order(self, log_file):
+        """Ensure flush returns once every record, including formatted callables, is on disk."""
+        logger.info("Starting test: test_if_flush_writes_strings_and_formatted_callables_in_order")
+        writer = BackgroundLogWriter(log_file, batch_size=2)
+        try:
+            for number in range(5):
+                writer.submit(f"record {number}\n" if number % 2 else lambda number=number: f"record {number}\n")
+            writer.flush()
+            content = log_file.read_text(encoding="utf-8")
+        finally:
+            writer.close()
+
+        assert_that(content).is_equal_to("".join(f"record {number}\n" for number in range(5)))
+        logger.info("Test completed: test_if_flush_writes_strings_and_formatted_callables_in_order")
+
+    def test_if_close_writes_pending_records(self, log_file):
+        """Ensure records still queued when close is called are written before the thread stops."""
+        logger.info("Starting test: test_if_close_writes_pending_records")
+        writer = BackgroundLogWriter(log_file)
+        gate = Gate()
+        writer.submit(gate)
+        gate.entered.wait(5)
+        for number in range(3):
+            writer.submit(f"pending {number}\n")
+
+        closer = threading.Timer(0.05, gate.release)
+        closer.start()
+        writer.close()
+
+        assert_that(log_file.read_text(encoding="utf-8")).is_equal_to("gate\npending 0\npending 1\npending 2\n")
+        logger.info("Test completed: test_if_close_writes_pending_records")
+
+    def test_if_drop_policy_counts_records_over_the_buffer(self, log_file):
+        """Ensure a full buffer under the drop policy discards and counts new records instead of waiting."""
+        logger.info("Starting test: test_if_drop_policy_counts_records_over_the_buffer")
+        writer = BackgroundLogWriter(log_file, max_buffer=2, overflow_policy="drop")
+        gate = Gate()
+        writer.submit(gate)
+        gate.entered.wait(5)
+        for number in range(5):
+            writer.submit(f"record {number}\n")
+        gate.release()
+        writer.close()
+
+        with soft_assertions():
+            assert_that(writer.dropped).is_equal_to(3)
+            assert_that(log_file.read_text(encoding="utf-8")).is_equal_to("gate\nrecord 0\nrecord 1\n")
+        logger.info("Test completed: test_if_drop_policy_counts_records_over_the_buffer")
+
+    def test_if_block_policy_waits_for_room_in_the_buffer(self, log_file):
+        """Ensure a full buffer under the block policy holds the producer until the writer drains it."""
+        logger.info("Starting test: test_if_block_policy_waits_for_room_in_the_buffer")
+        writer = BackgroundLogWriter(log_file, max_buffer=1, overflow_policy="block")
+        gate = Gate()
+        writer.submit(gate)
+        gate.entered.wait(5)
+        writer.submit("queued\n")
+        producer = threading.Thread(target=writer.submit, args=("blocked\n",))
+        producer.start()
+        producer.join(0.2)
+        blocked = producer.is_alive()
+        gate.release()
+        producer.join(5)
+        writer.close()
+
+        with soft_assertions():
+            assert_that(blocked).is_true()
+            assert_that(writer.dropped).is_equal_to(0)
+            assert_that(log_file.read_text(encoding="utf-8")).is_equal_to("gate\nqueued\nblocked\n")
+        logger.info("Test completed: test_if_block_policy_waits_for_room_in_the_buffer")
+
+    def test_if_write_errors_are_counted_and_writer_keeps_draining(self, log_file, capsys):
+        """Ensure a failed batch is counted in lost, reported once, and later records still get written."""
+        logger.info("Starting test: test_if_write_errors_are_counted_and_writer_keeps_draining")
+        stream = FailingStream(failures=2)
+        writer = BackgroundLogWriter(log_file, batch_size=1, stream_factory=lambda: stream)
+        for number in range(4):
+            writer.submit(f"record {number}\n")
+        writer.close()
+
+        with soft_assertions():
+            assert_that(writer.lost).is_equal_to(2)
+            assert_that(stream.getvalue()).is_equal_to("record 2\nrecord 3\n")
+            assert_that(capsys.readouterr().err.count("could not write")).is_equal_to(1)
+        logger.info("Test completed: test_if_write_errors_are_counted_and_writer_keeps_draining")
+
+    def test_if_record_failing_to_format_does_not_stop_the_writer(self, log_file):
+        """Ensure a callable that raises leaves a placeholder and the records after it are written."""
+        logger.info("Starting test: test_if_record_failing_to_format_does_not_stop_the_writer")
+        writer = BackgroundLogWriter(log_file)
+        writer.submit(lambda: 1 / 0)
+        writer.submit("after\n")
+        writer.close()
+
+        content = log_file.read_text(encoding="utf-8")
+        with soft_assertions():
+            assert_that(content).contains("log record failed to format: ZeroDivisionError")
+            assert_that(content).ends_with("after\n")
+        logger.info("Test completed: test_if_record_failing_to_format_does_not_stop_the_writer")
+
+    def test_if_unknown_overflow_policy_is_rejected(self, log_file):
+        """Ensure an overflow policy other than block or drop raises ValueError."""
+        logger.info("Starting test: test_if_unknown_overflow_policy_is_rejected")
+        with pytest.raises(ValueError, match="overflow_policy"):
+            BackgroundLogWriter(log_file, overflow_policy="spill")
+        logger.info("Test completed: test_if_unknown_overflow_policy_is_rejected")
+
+
+class TestLoggerRequestPath:
+    """Work Logger leaves to the writer threads."""
+
+    def test_if_response_body_is_decoded_on_the_writer_thread(self, monkeypatch, tmp_path):
+        """Ensure add_response never reads the response text on the calling thread."""
+        logger.info("Starting test: test_if_response_body_is_decoded_on_the_writer_thread")
+        readers = []
+
+        class TrackedResponse(requests.Response):
+            @property
+            def text(self):
+                readers.append(threading.current_thread().name)
+                return super().text
+
+        response = TrackedResponse()
+        response.status_code = 200
+        response.url = "http://localhost/usuarios"
+        response._content = b'{"quantidade": 0, "usuarios": []}'
+        response.request = requests.Request("GET", response.url).prepare()
+        monkeypatch.setattr(Logger, "logs_dir", tmp_path)
+        monkeypatch.setattr(Logger, "file_path", tmp_path / "test.log")
+        # Fresh writers for the temporary files; the session's own stay open
+        monkeypatch.setattr(Logger, "_writers", {})
+        monkeypatch.setattr(Logger, "_writers_pid", os.getpid())
+        try:
+            Logger.add_response(response, elapsed=0.01)
+            Logger.flush()
+        finally:
+            Logger.close()
+
+        with soft_assertions():
+            assert_that(readers).is_not_empty()
+            assert_that(readers).does_not_contain(threading.current_thread().name)
+        logger.info("Test completed: test_if_response_body_is_decoded_on_the_writer_thread")
@@ -0,0 +1,196 @@
+"""Tests for latency sampling and summaries (utils.metrics)."""
+
+import collections
+import logging
+import random
+
+import pytest
+from assertpy import assert_that, soft_assertions
+
+from utils.metrics import LatencyRecorder, LatencyReservoir, endpoint_of, percentile
+
+logger = logging.getLogger(__name__)
+
+
+def reservoir(durations, size=100, seed=0, started=0.0):
+    """Return a reservoir of the given size over durations, one call per second from started."""
+    result = LatencyReservoir(size, random.Random(seed))
+    for offset, elapsed in enumerate(durations):
+        result.add(started + offset, elapsed)
+    return result
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    """Give LatencyRecorder empty state for the test, restoring the session's afterwards."""
+    monkeypatch.setattr(LatencyRecorder, "_recent", collections.deque(maxlen=5))
+    monkeypatch.setattr(LatencyRecorder, "_recorded", 0)
+    monkeypatch.setattr(LatencyRecorder, "_endpoints", {})
+    monkeypatch.setattr(LatencyRecorder, "_operations", {})
+    monkeypatch.setattr(LatencyRecorder, "_all", LatencyReservoir())
+    return LatencyRecorder
+
+
+class TestHelpers:
+    """Endpoint names and nearest-rank percentiles."""
+
+    @pytest.mark.parametrize(
+        "url, endpoint",
+        [
+            ("http://localhost:3000/produtos", "/produtos"),
+            ("http://localhost:3000/produtos/abc?x=1", "/produtos"),
+            ("http://localhost:3000/", "/"),
+            ("/login", "/login"),
+        ],
+    )
+    def test_if_urls_map_to_their_resource(self, url, endpoint):
+        """Ensure ids and query strings are dropped from the endpoint name."""
+        logger.info("Starting test: test_if_urls_map_to_their_resource")
+        assert_that(endpoint_of(url)).is_equal_to(endpoint)
+        logger.info("Test completed: test_if_urls_map_to_their_resource")
+
+    def test_if_percentile_uses_nearest_rank(self):
+        """Ensure percentiles pick an observed value by nearest rank, and 0 for no values."""
+        logger.info("Starting test: test_if_percentile_uses_nearest_rank")
+        values = list(range(1, 11))
+        with soft_assertions():
+            assert_that(percentile(values, 50)).is_equal_to(5)
+            assert_that(percentile(values, 90)).is_equal_to(9)
+            assert_that(percentile(values, 99)).is_equal_to(10)
+            assert_that(percentile(values, 0.1)).is_equal_to(1)
+            assert_that(percentile([], 50)).is_equal_to(0.0)
+        logger.info("Test completed: test_if_percentile_uses_nearest_rank")
+
+
+class TestLatencyReservoir:
+    """Bounded sampling of call durations."""
+
+    def test_if_reservoir_keeps_every_duration_up_to_its_size(self):
+        """Ensure a reservoir that never filled up is exact."""
+        logger.info("Starting test: test_if_reservoir_keeps_every_duration_up_to_its_size")
+        sampled = reservoir([0.3, 0.1, 0.2], size=3, started=10.0)
+        with soft_assertions():
+            assert_that(sampled.durations).is_equal_to([0.3, 0.1, 0.2])
+            assert_that(sampled.count).is_equal_to(3)
+            assert_that(sampled.max).is_equal_to(0.3)
+            assert_that(sampled.first).is_equal_to(10.0)
+            assert_that(sampled.last).is_equal_to(12.2)
+        logger.info("Test completed: test_if_reservoir_keeps_every_duration_up_to_its_size")
+
+    def test_if_full_reservoir_stays_bounded_with_exact_count_and_max(self):
+        """Ensure a reservoir past its size keeps size durations but counts every call."""
+        logger.info("Starting test: test_if_full_reservoir_stays_bounded_with_exact_count_and_max")
+        sampled = reservoir([5.0] + [0.0001 * step for step in range(9_999)], size=50)
+        with soft_assertions():
+            assert_that(sampled.durations).is_length(50)
+            assert_that(sampled.count).is_equal_to(10_000)
+            assert_that(sampled.max).is_equal_to(5.0)
+        logger.info("Test completed: test_if_full_reservoir_stays_bounded_with_exact_count_and_max")
+
+    def test_if_sample_is_uniform_over_all_calls(self):
+        """Ensure late calls are as likely to be kept as early ones, so percentiles stay unbiased."""
+        logger.info("Starting test: test_if_sample_is_uniform_over_all_calls")
+        kept_late = [
+            sum(duration >= 5_000 for duration in reservoir(range(10_000), size=100, seed=seed).durations)
+            for seed in range(20)
+        ]
+        sampled = sorted(reservoir([step / 10_000 for step in range(10_000)], size=1_000, seed=1).durations)
+        with soft_assertions():
+            assert_that(sum(kept_late) / len(kept_late)).is_between(45, 55)
+            assert_that(percentile(sampled, 50)).is_close_to(0.5, 0.05)
+            assert_that(percentile(sampled, 90)).is_close_to(0.9, 0.05)
+        logger.info("Test completed: test_if_sample_is_uniform_over_all_calls")
+
+    def test_if_merge_combines_counts_and_draws_in_proportion(self):
+        """Ensure merging keeps exact totals and samples each side by the calls it stands for."""
+        logger.info("Starting test: test_if_merge_combines_counts_and_draws_in_proportion")
+        merged = reservoir([0.1] * 3_000, size=100, started=100.0)
+        merged.merge(reservoir([0.2] * 1_000 + [0.9], size=100, started=50.0))
+        with soft_assertions():
+            assert_that(merged.count).is_equal_to(4_001)
+            assert_that(merged.max).is_equal_to(0.9)
+            assert_that(merged.first).is_equal_to(50.0)
+            assert_that(merged.last).is_equal_to(3_099.1)
+            assert_that(merged.durations).is_length(100)
+            assert_that(merged.durations.count(0.1)).is_equal_to(75)
+        logger.info("Test completed: test_if_merge_combines_counts_and_draws_in_proportion")
+
+    def test_if_small_reservoirs_merge_exactly(self):
+        """Ensure merging reservoirs that fit together keeps every duration."""
+        logger.info("Starting test: test_if_small_reservoirs_merge_exactly")
+        merged = reservoir([0.1, 0.2], size=5)
+        merged.merge(reservoir([0.3], size=5))
+        assert_that(merged.durations).is_equal_to([0.1, 0.2, 0.3])
+        logger.info("Test completed: test_if_small_reservoirs_merge_exactly")
+
+    def test_if_export_round_trips(self):
+        """Ensure an exported reservoir rebuilds with the same counters and durations."""
+        logger.info("Starting test: test_if_export_round_trips")
+        original = reservoir([0.4, 0.2, 0.7])
+        rebuilt = LatencyReservoir.from_export(original.export(), size=10)
+        with soft_assertions():
+            assert_that(rebuilt.export()).is_equal_to(original.export())
+            assert_that(rebuilt.size).is_equal_to(10)
+        logger.info("Test completed: test_if_export_round_trips")
+
+    def test_if_zero_size_is_rejected(self):
+        """Ensure a reservoir must hold at least one duration."""
+        logger.info("Starting test: test_if_zero_size_is_rejected")
+        with pytest.raises(ValueError, match="size"):
+            LatencyReservoir(0)
+        logger.info("Test completed: test_if_zero_size_is_rejected")
+
+
+class TestLatencyRecorder:
+    """Per-endpoint summaries and recent samples of recorded calls."""
+
+    def test_if_summary_reports_each_endpoint_and_all(self, recorder):
+        """Ensure calls are summarised per resource with percentiles, max and throughput."""
+        logger.info("Starting test: test_if_summary_reports_each_endpoint_and_all")
+        for second in range(10):
+            recorder.record(f"http://localhost/produtos/{second}", 0.01 * (second + 1), finished=100.0 + second)
+        recorder.record("http://localhost/login", 0.5, finished=105.0)
+
+        rows = {row.endpoint: row for row in recorder.summary()}
+        with soft_assertions():
+            assert_that(list(rows)).is_equal_to(["/login", "/produtos", "all"])
+            assert_that(rows["/produtos"].count).is_equal_to(10)
+            assert_that(rows["/produtos"].p50).is_close_to(0.05, 1e-9)
+            assert_that(rows["/produtos"].p90).is_close_to(0.09, 1e-9)
+            assert_that(rows["/produtos"].max).is_close_to(0.1, 1e-9)
+            assert_that(rows["/produtos"].throughput).is_close_to(10 / (109.0 - 99.99), 1e-6)
+            assert_that(rows["/login"].throughput).is_equal_to(2.0)
+            assert_that(rows["all"].count).is_equal_to(11)
+            assert_that(rows["all"].max).is_equal_to(0.5)
+        logger.info("Test completed: test_if_summary_reports_each_endpoint_and_all")
+
+    def test_if_samples_slice_from_a_count_within_the_recent_window(self, recorder):
+        """Ensure samples(start) returns calls since start, limited to the ones still kept."""
+        logger.info("Starting test: test_if_samples_slice_from_a_count_within_the_recent_window")
+        for call in range(8):
+            recorder.record("http://localhost/usuarios", call / 100, finished=10.0)
+
+        with soft_assertions():
+            assert_that([sample[3] for sample in recorder.samples(6)]).is_equal_to([0.06, 0.07])
+            assert_that([sample[3] for sample in recorder.samples(0)]).is_equal_to([0.03, 0.04, 0.05, 0.06, 0.07])
+            assert_that(recorder.count()).is_equal_to(8)
+        logger.info("Test completed: test_if_samples_slice_from_a_count_within_the_recent_window")
+
+    def test_if_exported_workers_merge_into_one_summary(self, recorder):
+        """Ensure reservoirs exported by a pytest-xdist worker add up with the local ones."""
+        logger.info("Starting test: test_if_exported_workers_merge_into_one_summary")
+        recorder.record("http://localhost/carrinhos", 0.2, finished=10.0)
+        worker = {
+            "endpoints": {"/carrinhos": reservoir([0.1, 0.4]).export()},
+            "operations": {"Carts.get_cart": reservoir([0.1, 0.4]).export()},
+            "all": reservoir([0.1, 0.4]).export(),
+        }
+
+        recorder.merge(worker)
+
+        (row,) = recorder.summary()
+        with soft_assertions():
+            assert_that(row.count).is_equal_to(3)
+            assert_that(row.max).is_equal_to(0.4)
+            assert_that(recorder.operation_reservoirs()["Carts.get_cart"].count).is_equal_to(2)
+        logger.info("Test completed: test_if_exported_workers_merge_into_one_summary")
@@ -0,0 +1,155 @@
+"""Tests for the slotted entity models (utils.models) and lazily decoded responses (utils.request.APIResponse)."""
+
+import copy
+import logging
+import sys
+
+import pytest
+from assertpy import assert_that, soft_assertions
+
+from tests.test_serializer import backends
+from utils.models import Cart, CartItem, Product, User
+from utils.request import APIResponse
+
+logger = logging.getLogger(__name__)
+
+USER = {"nome": "Ana", "email": "ana@example.com", "password": "x", "administrador": "true", "_id": "u1"}
+CART = {
+    "produtos": [{"idProduto": "p1", "quantidade": 2}, {"idProduto": "p2", "quantidade": 1}],
+    "_id": "c1",
+    "quantidadeTotal": 3,
+    "precoTotal": 250,
+    "idUsuario": "u1",
+}
+
+
+class TestRecord:
+    """Slotted models reading and writing like dicts."""
+
+    def test_if_record_behaves_like_its_dict(self):
+        """Ensure lookups, get, iteration order, len and equality match the payload dict."""
+        logger.info("Starting test: test_if_record_behaves_like_its_dict")
+        user = User.from_dict(USER)
+
+        with soft_assertions():
+            assert_that(user["email"]).is_equal_to("ana@example.com")
+            assert_that(user.get("authorization")).is_none()
+            assert_that(list(user)).is_equal_to(list(USER))
+            assert_that(user).is_length(5)
+            assert_that(user == USER).is_true()
+            assert_that(dict(user)).is_equal_to(USER)
+            assert_that("authorization" in user).is_false()
+        logger.info("Test completed: test_if_record_behaves_like_its_dict")
+
+    def test_if_fields_can_be_set_and_unset(self):
+        """Ensure setting a model field adds the key and deleting it removes the key again."""
+        logger.info("Starting test: test_if_fields_can_be_set_and_unset")
+        user = User.from_dict(USER)
+        user["authorization"] = "Bearer token"
+        with_token = dict(user)
+        del user["authorization"]
+
+        with soft_assertions():
+            assert_that(with_token).contains_entry({"authorization": "Bearer token"})
+            assert_that(user).does_not_contain_key("authorization")
+            with pytest.raises(KeyError):
+                del user["authorization"]
+        logger.info("Test completed: test_if_fields_can_be_set_and_unset")
+
+    def test_if_unknown_keys_are_rejected(self):
+        """Ensure keys outside the model raise KeyError on write and read, and payloads with them fail."""
+        logger.info("Starting test: test_if_unknown_keys_are_rejected")
+        product = Product()
+
+        with soft_assertions():
+            with pytest.raises(KeyError, match="Product has no field 'cor'"):
+                product["cor"] = "azul"
+            with pytest.raises(KeyError):
+                product["cor"]
+            with pytest.raises(KeyError):
+                Product.from_dict({"nome": "Hub", "cor": "azul"})
+        logger.info("Test completed: test_if_unknown_keys_are_rejected")
+
+    def test_if_records_carry_no_instance_dict(self):
+        """Ensure models stay slotted, which keeps them smaller than the dicts they replace."""
+        logger.info("Starting test: test_if_records_carry_no_instance_dict")
+        user = User.from_dict(USER)
+
+        with soft_assertions():
+            assert_that(hasattr(user, "__dict__")).is_false()
+            assert_that(sys.getsizeof(user)).is_less_than(sys.getsizeof(dict(USER)))
+        logger.info("Test completed: test_if_records_carry_no_instance_dict")
+
+    def test_if_cart_lines_become_records_and_convert_back(self):
+        """Ensure cart product lines are CartItem records and to_dict returns plain nested dicts."""
+        logger.info("Starting test: test_if_cart_lines_become_records_and_convert_back")
+        cart = Cart.from_dict(CART)
+        plain = cart.to_dict()
+
+        with soft_assertions():
+            assert_that([type(line) for line in cart["produtos"]]).is_equal_to([CartItem, CartItem])
+            assert_that(plain).is_equal_to(CART)
+            assert_that([type(line) for line in plain["produtos"]]).is_equal_to([dict, dict])
+            assert_that(repr(cart)).starts_with("Cart({'produtos': [{'idProduto': 'p1'")
+        logger.info("Test completed: test_if_cart_lines_become_records_and_convert_back")
+
+    def test_if_deep_copies_are_independent(self):
+        """Ensure a deep copy, as the seed views make, shares no nested line with the original."""
+        logger.info("Starting test: test_if_deep_copies_are_independent")
+        cart = Cart.from_dict(CART)
+        copied = copy.deepcopy(cart)
+        copied["produtos"][0]["quantidade"] = 9
+
+        with soft_assertions():
+            assert_that(cart["produtos"][0]["quantidade"]).is_equal_to(2)
+            assert_that(copied).is_instance_of(Cart)
+        logger.info("Test completed: test_if_deep_copies_are_independent")
+
+    @pytest.mark.parametrize("serializer", backends(), ids=lambda serializer: serializer.name)
+    def test_if_records_round_trip_through_the_serializer(self, serializer):
+        """Ensure models encode as their payload and rebuild equal from the decoded JSON."""
+        logger.info("Starting test: test_if_records_round_trip_through_the_serializer")
+        records = {"user": User.from_dict(USER), "cart": Cart.from_dict(CART)}
+
+        decoded = serializer.loads(serializer.dumps(records))
+
+        with soft_assertions():
+            assert_that(decoded).is_equal_to({"user": USER, "cart": CART})
+            assert_that(User.from_dict(decoded["user"])).is_equal_to(records["user"])
+            assert_that(Cart.from_dict(decoded["cart"]).to_dict()).is_equal_to(records["cart"].to_dict())
+        logger.info("Test completed: test_if_records_round_trip_through_the_serializer")
+
+
+class TestAPIResponse:
+    """Response bodies kept as bytes and decoded on demand."""
+
+    def test_if_json_body_is_parsed_once(self):
+        """Ensure as_dict parses the body on first access and returns the cached result after."""
+        logger.info("Starting test: test_if_json_body_is_parsed_once")
+        response = APIResponse(200, b'{"message": "Cadastro realizado com sucesso", "_id": "u1"}', {})
+
+        first = response.as_dict
+
+        with soft_assertions():
+            assert_that(first).is_equal_to({"message": "Cadastro realizado com sucesso", "_id": "u1"})
+            assert_that(response.as_dict).is_same_as(first)
+        logger.info("Test completed: test_if_json_body_is_parsed_once")
+
+    @pytest.mark.parametrize("content", [b"", b"<html>Bad Gateway</html>"])
+    def test_if_empty_or_non_json_body_gives_empty_dict(self, content):
+        """Ensure bodies that are not JSON read as {} instead of raising."""
+        logger.info("Starting test: test_if_empty_or_non_json_body_gives_empty_dict")
+        assert_that(APIResponse(502, content, {}).as_dict).is_equal_to({})
+        logger.info("Test completed: test_if_empty_or_non_json_body_gives_empty_dict")
+
+    def test_if_text_is_decoded_with_the_response_encoding(self):
+        """Ensure text decodes the raw bytes with the response encoding, replacing invalid bytes."""
+        logger.info("Starting test: test_if_text_is_decoded_with_the_response_encoding")
+        latin = APIResponse(200, "Ação".encode("latin-1"), {}, encoding="latin-1")
+        broken = APIResponse(200, b"ok \xff", {})
+
+        with soft_assertions():
+            assert_that(latin.text).is_equal_to("Ação")
+            assert_that(broken.text).is_equal_to("ok �")
+            assert_that(hasattr(broken, "__dict__")).is_false()
+        logger.info("Test completed: test_if_text_is_decoded_with_the_response_encoding")
@@ -2,6 +2,7 @@
 
 import logging
 
+import pytest
 from assertpy import assert_that, soft_assertions
 
 from services.serverest_api.api.products import Products
@@ -132,6 +133,7 @@ class TestProducts:
 
         logger.info("Test completed: test_if_product_can_be_fetched_by_id")
 
+    @pytest.mark.mutating("produtos")
     def test_if_product_can_be_updated(
         self,
         login_user,
@@ -183,6 +185,7 @@ class TestProducts:
         context.update({"produtos": products})
         logger.info("Test completed: test_if_product_can_be_updated")
 
+    @pytest.mark.mutating("produtos")
     def test_if_product_can_be_deleted(
         self,
         login_user,
@@ -0,0 +1,136 @@
+"""Tests for request pacing (utils.rate_limiter)."""
+
+import logging
+
+import pytest
+from assertpy import assert_that, soft_assertions
+
+from services.base_client import DEFAULT_HEADERS
+from utils.rate_limiter import RateLimiter, TokenBucket, parse_endpoint_limits
+from utils.request import APIRequest
+
+logger = logging.getLogger(__name__)
+
+BASE = "http://serverest.test"
+
+
+class TestTokenBucket:
+    """Burst then steady pacing of a single bucket."""
+
+    def test_if_burst_passes_then_calls_are_spaced_by_rate(self, clock):
+        """Ensure burst calls go through at once and each following call waits 1/rate seconds."""
+        bucket = TokenBucket(rate=4, burst=3, clock=clock, sleep=clock.sleep)
+
+        waits = [bucket.acquire() for _ in range(6)]
+
+        with soft_assertions():
+            assert_that(waits[:3]).is_equal_to([0.0, 0.0, 0.0])
+            assert_that(waits[3:]).is_equal_to([0.25, 0.25, 0.25])
+            assert_that(clock.now).is_equal_to(0.75)
+
+    def test_if_idle_bucket_refills_up_to_burst(self, clock):
+        """Ensure tokens accumulate while idle but never beyond burst."""
+        bucket = TokenBucket(rate=2, burst=2, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+        bucket.acquire()
+
+        clock.now += 60
+        waits = [bucket.acquire() for _ in range(3)]
+
+        assert_that(waits).is_equal_to([0.0, 0.0, 0.5])
+
+    def test_if_reservations_queue_up_in_arrival_order(self, clock):
+        """Ensure callers arriving at an empty bucket get increasing waits without sleeping on each other."""
+        bucket = TokenBucket(rate=10, burst=1, clock=clock, sleep=clock.sleep)
+
+        waits = [bucket.reserve() for _ in range(4)]
+
+        assert_that(waits).is_equal_to(pytest.approx([0.0, 0.1, 0.2, 0.3]))
+
+    @pytest.mark.parametrize("rate, burst", [(0, 1), (-1, 1), (1, 0)])
+    def test_if_invalid_bucket_raises(self, rate, burst):
+        """Ensure a non-positive rate or a burst below 1 is rejected."""
+        assert_that(TokenBucket).raises(ValueError).when_called_with(rate, burst)
+
+
+class TestParseEndpointLimits:
+    """Parsing of HTTP_ENDPOINT_RATE_LIMITS."""
+
+    def test_if_limits_are_parsed_with_default_burst(self):
+        """Ensure endpoints are normalised and a missing burst takes the default."""
+        limits = parse_endpoint_limits(" produtos/=5, /carrinhos=2.5:10 ,", default_burst=3)
+        assert_that(limits).is_equal_to({"/produtos": (5.0, 3), "/carrinhos": (2.5, 10)})
+
+    def test_if_empty_spec_means_no_limits(self):
+        """Ensure an unset variable configures nothing."""
+        assert_that(parse_endpoint_limits("")).is_empty()
+
+    @pytest.mark.parametrize("spec", ["/produtos", "/produtos=fast", "/produtos=5:many"])
+    def test_if_invalid_limit_raises(self, spec):
+        """Ensure a malformed entry names the entry and the expected format."""
+        assert_that(parse_endpoint_limits).raises(ValueError).when_called_with(spec).contains(
+            "Invalid endpoint rate limit"
+        )
+
+
+class TestRateLimiter:
+    """Global and per-endpoint buckets and their statistics."""
+
+    def test_if_endpoint_bucket_paces_only_its_endpoint(self, clock):
+        """Ensure a configured endpoint is slowed down while other endpoints only obey the global limit."""
+        limiter = RateLimiter(
+            rate=100, burst=100, endpoint_limits={"/produtos": (2, 1)}, clock=clock, sleep=clock.sleep
+        )
+
+        product_waits = [limiter.acquire(f"{BASE}/produtos/{n}") for n in range(3)]
+        user_waits = [limiter.acquire(f"{BASE}/usuarios") for _ in range(3)]
+
+        with soft_assertions():
+            assert_that(product_waits).is_equal_to([0.0, 0.5, 0.5])
+            assert_that(user_waits).is_equal_to([0.0, 0.0, 0.0])
+
+    def test_if_call_waits_for_the_later_of_both_buckets(self, clock):
+        """Ensure a call reserves from the global and its endpoint bucket and sleeps once for the longer wait."""
+        limiter = RateLimiter(rate=1, burst=1, endpoint_limits={"/produtos": (4, 1)}, clock=clock, sleep=clock.sleep)
+
+        limiter.acquire(f"{BASE}/produtos")
+        wait = limiter.acquire(f"{BASE}/produtos")
+
+        with soft_assertions():
+            assert_that(wait).is_equal_to(1.0)
+            assert_that(clock.sleeps).is_equal_to([1.0])
+
+    def test_if_waits_are_counted_per_endpoint(self, clock):
+        """Ensure summary reports calls, delayed calls and wait times per endpoint and merges other workers."""
+        limiter = RateLimiter(rate=2, burst=1, endpoint_limits={}, clock=clock, sleep=clock.sleep)
+        for _ in range(3):
+            limiter.acquire(f"{BASE}/usuarios")
+        limiter.acquire(f"{BASE}/login")
+
+        worker = RateLimiter(rate=2, burst=1, endpoint_limits={}, clock=lambda: 0.0, sleep=lambda seconds: None)
+        worker.acquire(f"{BASE}/login")
+        worker.acquire(f"{BASE}/login")
+        limiter.merge(worker.export())
+        login, users = limiter.summary()
+
+        with soft_assertions():
+            assert_that(users.endpoint).is_equal_to("/usuarios")
+            assert_that((users.calls, users.delayed, users.waited, users.max_wait)).is_equal_to((3, 2, 1.0, 0.5))
+            assert_that(login.endpoint).is_equal_to("/login")
+            assert_that((login.calls, login.delayed, login.waited)).is_equal_to((3, 2, 1.0))
+
+    def test_if_client_reports_time_spent_waiting(self, clock, fake_serverest):
+        """Ensure APIRequest takes a token per call and exposes the wait on the response."""
+        logger.info("Starting test: test_if_client_reports_time_spent_waiting")
+        limiter = RateLimiter(rate=5, burst=1, endpoint_limits={}, clock=clock, sleep=clock.sleep)
+        api = APIRequest(limiter=limiter)
+
+        first = api.get_request(f"{fake_serverest.url}/usuarios", dict(DEFAULT_HEADERS))
+        second = api.get_request(f"{fake_serverest.url}/usuarios", dict(DEFAULT_HEADERS))
+
+        with soft_assertions():
+            assert_that(first.status_code).is_equal_to(200)
+            assert_that(first.rate_limit_wait).is_equal_to(0.0)
+            assert_that(second.rate_limit_wait).is_equal_to(0.2)
+            assert_that(limiter.summary()[0].calls).is_equal_to(2)
+        logger.info("Test completed: test_if_client_reports_time_spent_waiting")
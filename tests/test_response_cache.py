@@ -0,0 +1,116 @@
+"""Tests for the GET response cache (utils.response_cache)."""
+
+import logging
+
+from assertpy import assert_that, soft_assertions
+
+from services.serverest_api.api.users import Users
+from utils.data_generator import DataGenerator
+from utils.request import APIRequest
+from utils.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+BASE = "http://serverest.test"
+HEADERS = {"ETag": 'W/"1"'}
+
+
+def put(cache, url, body=b"{}", headers=None, generation=None):
+    """Store a 200 answer for url without authorization and return its key."""
+    key = cache.key(url, None)
+    cache.store(key, 200, body, headers or {}, "utf-8", generation)
+    return key
+
+
+class TestResponseCache:
+    """TTL, LRU, revalidation and invalidation rules."""
+
+    def test_if_entries_expire_after_ttl(self, clock):
+        """Ensure an entry is a hit until ttl has passed and is dropped when it has no ETag."""
+        cache = ResponseCache(ttl=30, clock=clock)
+        key = put(cache, f"{BASE}/usuarios/1")
+
+        clock.now = 29.9
+        assert_that(cache.lookup(key)[0]).is_not_none()
+        clock.now = 30
+        assert_that(cache.lookup(key)).is_equal_to((None, None))
+        assert_that(len(cache)).is_equal_to(0)
+
+    def test_if_stale_entry_with_etag_is_kept_for_revalidation(self, clock):
+        """Ensure an expired entry with an ETag is offered for If-None-Match and a 304 makes it fresh again."""
+        cache = ResponseCache(ttl=30, clock=clock)
+        key = put(cache, f"{BASE}/usuarios/1", headers=HEADERS)
+
+        clock.now = 31
+        assert_that(cache.lookup(key)).is_equal_to((None, HEADERS["ETag"]))
+        assert_that(cache.revalidate(key)).is_not_none()
+        assert_that(cache.lookup(key)[0]).is_not_none()
+        assert_that(cache.stats.revalidated).is_equal_to(1)
+
+    def test_if_least_recently_used_entry_is_evicted(self, clock):
+        """Ensure the entry read longest ago goes first once max_entries is exceeded."""
+        cache = ResponseCache(ttl=30, max_entries=2, clock=clock)
+        first = put(cache, f"{BASE}/usuarios/1")
+        second = put(cache, f"{BASE}/usuarios/2")
+        cache.lookup(first)
+        third = put(cache, f"{BASE}/usuarios/3")
+
+        with soft_assertions():
+            assert_that(cache.lookup(second)[0]).is_none()
+            assert_that(cache.lookup(first)[0]).is_not_none()
+            assert_that(cache.lookup(third)[0]).is_not_none()
+            assert_that(cache.stats.evictions).is_equal_to(1)
+
+    def test_if_writes_invalidate_their_resource_and_related_ones(self, clock):
+        """Ensure a cart write drops cached carts and products but keeps users."""
+        cache = ResponseCache(ttl=30, clock=clock)
+        product = put(cache, f"{BASE}/produtos?nome=Hub")
+        cart = put(cache, f"{BASE}/carrinhos/abc")
+        user = put(cache, f"{BASE}/usuarios/1")
+
+        cache.invalidate(f"{BASE}/carrinhos/concluir-compra")
+
+        with soft_assertions():
+            assert_that(cache.lookup(product)[0]).is_none()
+            assert_that(cache.lookup(cart)[0]).is_none()
+            assert_that(cache.lookup(user)[0]).is_not_none()
+            assert_that(cache.stats.invalidations).is_equal_to(2)
+
+    def test_if_answer_read_before_a_write_is_not_stored(self, clock):
+        """Ensure a GET in flight while its resource was invalidated does not cache the older answer."""
+        cache = ResponseCache(ttl=30, clock=clock)
+        url = f"{BASE}/produtos/1"
+        generation = cache.generation(url)
+
+        cache.invalidate(f"{BASE}/carrinhos")
+        put(cache, url, generation=generation)
+
+        assert_that(len(cache)).is_equal_to(0)
+        put(cache, url, generation=cache.generation(url))
+        assert_that(len(cache)).is_equal_to(1)
+
+    def test_if_cached_client_revalidates_and_invalidates_against_the_server(self, clock, fake_serverest):
+        """Ensure a cached client serves repeats from memory, revalidates with a 304 and refetches after a write."""
+        logger.info("Starting test: test_if_cached_client_revalidates_and_invalidates_against_the_server")
+        cache = ResponseCache(ttl=30, clock=clock)
+        users = Users(fake_serverest.url)
+        users.request = APIRequest(cache=cache)
+        payload = DataGenerator.batch_user_data(1)[0]
+        user_id = users.create_user(payload).as_dict["_id"]
+
+        first = users.get_user_by_id(user_id)
+        second = users.get_user_by_id(user_id)
+        clock.now = 31
+        revalidated = users.get_user_by_id(user_id)
+        users.update_user(user_id, {**payload, "nome": "Renamed"})
+        refetched = users.get_user_by_id(user_id)
+
+        with soft_assertions():
+            assert_that(first.as_dict["nome"]).is_equal_to(payload["nome"])
+            assert_that(second.content).is_equal_to(first.content)
+            assert_that(revalidated.content).is_equal_to(first.content)
+            assert_that(refetched.as_dict["nome"]).is_equal_to("Renamed")
+            assert_that(cache.stats.hits).is_equal_to(1)
+            assert_that(cache.stats.revalidated).is_equal_to(1)
+            assert_that(cache.stats.invalidations).is_equal_to(1)
+        logger.info("Test completed: test_if_cached_client_revalidates_and_invalidates_against_the_server")
@@ -0,0 +1,237 @@
+"""Tests for retries and circuit breakers (utils.retry)."""
+
+import logging
+import random
+import socket
+from email.utils import formatdate
+
+import pytest
+import requests
+from assertpy import assert_that, soft_assertions
+
+from services.base_client import DEFAULT_HEADERS
+from utils.request import APIRequest
+from utils.retry import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakers,
+    CircuitOpenError,
+    RetryPolicy,
+    is_connect_error,
+    parse_retry_after,
+)
+from utils.session import SessionManager, TimedHTTPConnection
+
+logger = logging.getLogger(__name__)
+
+
+class ExplodingSession:
+    """Session whose calls fail with an error that is not a transport error."""
+
+    def request(self, *args, **kwargs):
+        """Raise ValueError."""
+        raise ValueError("malformed request")
+
+
+class FlakySession:
+    """Session failing its first failures calls with a connection error, then sending them for real."""
+
+    def __init__(self, failures):
+        """Fail the first failures calls."""
+        self.failures = failures
+        self.calls = 0
+        self._session = requests.Session()
+
+    def request(self, *args, **kwargs):
+        """Raise ConnectionError while failures remain, else send the call."""
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise requests.ConnectionError("connection reset")
+        return self._session.request(*args, **kwargs)
+
+
+@pytest.fixture
+def breaker(clock, monkeypatch):
+    """Return a breaker opening after 2 failures for 10 s, used by APIRequest for every URL."""
+    breaker = CircuitBreaker("/usuarios", threshold=2, reset_timeout=10, clock=clock)
+    monkeypatch.setattr(CircuitBreakers, "for_url", classmethod(lambda cls, url: breaker))
+    return breaker
+
+
+class TestCircuitBreaker:
+    """Breaker state transitions and their interplay with APIRequest."""
+
+    def test_if_breaker_opens_after_threshold_and_closes_after_successful_trial(self, breaker, clock):
+        """Ensure closed -> open after threshold failures -> half-open after reset_timeout -> closed on success."""
+        breaker.record_failure()
+        assert_that(breaker.state).is_equal_to(CLOSED)
+        breaker.record_failure()
+        assert_that(breaker.state).is_equal_to(OPEN)
+        assert_that(breaker.before_call).raises(CircuitOpenError).when_called_with()
+
+        clock.now = 9.9
+        assert_that(breaker.state).is_equal_to(OPEN)
+        clock.now = 10
+        assert_that(breaker.state).is_equal_to(HALF_OPEN)
+        breaker.before_call()
+        breaker.record_success()
+
+        with soft_assertions():
+            assert_that(breaker.state).is_equal_to(CLOSED)
+            assert_that(breaker.stats.trips).is_equal_to(1)
+            assert_that(breaker.stats.rejected).is_equal_to(1)
+
+    def test_if_failed_trial_reopens_circuit(self, breaker, clock):
+        """Ensure one failed half-open trial opens the circuit again for a full reset_timeout."""
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now = 10
+        breaker.before_call()
+        # Only one trial at a time
+        assert_that(breaker.before_call).raises(CircuitOpenError).when_called_with()
+        breaker.record_failure()
+
+        clock.now = 19.9
+        with soft_assertions():
+            assert_that(breaker.state).is_equal_to(OPEN)
+            assert_that(breaker.stats.trips).is_equal_to(2)
+        clock.now = 20
+        assert_that(breaker.state).is_equal_to(HALF_OPEN)
+
+    def test_if_zero_threshold_never_opens(self, clock):
+        """Ensure a threshold of 0 disables the breaker."""
+        breaker = CircuitBreaker("/usuarios", threshold=0, clock=clock)
+        for _ in range(100):
+            breaker.record_failure()
+        assert_that(breaker.state).is_equal_to(CLOSED)
+
+    def test_if_open_circuit_rejects_calls_without_sending(self, breaker, fake_serverest):
+        """Ensure APIRequest opens the circuit after exhausted transport errors and then fails fast."""
+        logger.info("Starting test: test_if_open_circuit_rejects_calls_without_sending")
+        session = FlakySession(failures=2)
+        api = APIRequest(session=session, retry=RetryPolicy(attempts=1, backoff=0))
+        url = f"{fake_serverest.url}/usuarios"
+
+        with pytest.raises(requests.ConnectionError) as raised:
+            api.get_request(url, dict(DEFAULT_HEADERS))
+        assert_that(isinstance(raised.value, CircuitOpenError)).is_false()
+        with pytest.raises(CircuitOpenError):
+            api.get_request(url, dict(DEFAULT_HEADERS))
+
+        with soft_assertions():
+            assert_that(session.calls).is_equal_to(2)
+            assert_that(breaker.stats.retries).is_equal_to(1)
+            assert_that(breaker.stats.exhausted).is_equal_to(1)
+            assert_that(breaker.stats.rejected).is_equal_to(1)
+            assert_that(breaker.state).is_equal_to(OPEN)
+        logger.info("Test completed: test_if_open_circuit_rejects_calls_without_sending")
+
+    def test_if_unexpected_error_frees_half_open_trial(self, breaker, clock, fake_serverest):
+        """Ensure a trial call failing with a non-transport error does not leave the breaker rejecting forever."""
+        logger.info("Starting test: test_if_unexpected_error_frees_half_open_trial")
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now = 10
+        assert_that(breaker.state).is_equal_to(HALF_OPEN)
+
+        with pytest.raises(ValueError):
+            APIRequest(session=ExplodingSession(), retry=RetryPolicy(attempts=0)).post_request(
+                f"{fake_serverest.url}/usuarios", b"{}", dict(DEFAULT_HEADERS)
+            )
+
+        # The next call is let through as the trial and closes the circuit
+        response = APIRequest(retry=RetryPolicy(attempts=0)).get_request(
+            f"{fake_serverest.url}/usuarios", dict(DEFAULT_HEADERS)
+        )
+        assert_that(response.status_code).is_equal_to(200)
+        assert_that(breaker.state).is_equal_to(CLOSED)
+        logger.info("Test completed: test_if_unexpected_error_frees_half_open_trial")
+
+
+class TestRetryPolicy:
+    """Which calls are repeated and how long to wait in between."""
+
+    def test_if_only_idempotent_methods_and_retryable_statuses_are_retried(self):
+        """Ensure retries stop at attempts and skip POST and non-retryable statuses."""
+        policy = RetryPolicy(attempts=2, methods=("GET", "PUT", "DELETE"), statuses=(429, 503))
+        with soft_assertions():
+            assert_that(policy.retries("get", 0)).is_true()
+            assert_that(policy.retries("GET", 1, 503)).is_true()
+            assert_that(policy.retries("GET", 2, 503)).is_false()
+            assert_that(policy.retries("GET", 0, 500)).is_false()
+            assert_that(policy.retries("GET", 0, 200)).is_false()
+            assert_that(policy.retries("POST", 0)).is_false()
+            assert_that(policy.retries("POST", 0, error=requests.ConnectTimeout())).is_true()
+            assert_that(policy.retries("POST", 0, error=requests.ConnectionError("connection reset"))).is_false()
+            assert_that(policy.retries("POST", 2, error=requests.ConnectTimeout())).is_false()
+
+    def test_if_delay_is_full_jitter_capped_at_backoff_max(self):
+        """Ensure waits stay within [0, backoff * 2 ** retry] and never exceed backoff_max."""
+        policy = RetryPolicy(backoff=0.5, backoff_max=3, rng=random.Random(7))
+        for retry in range(6):
+            bound = min(0.5 * 2**retry, 3)
+            for _ in range(50):
+                assert_that(policy.delay(retry)).is_between(0, bound)
+
+    def test_if_delay_follows_retry_after(self):
+        """Ensure a Retry-After header replaces the jitter, capped at backoff_max."""
+        policy = RetryPolicy(backoff=0.5, backoff_max=30)
+        with soft_assertions():
+            assert_that(policy.delay(0, "7")).is_equal_to(7)
+            assert_that(policy.delay(0, "120")).is_equal_to(30)
+            assert_that(policy.delay(0, "soon")).is_between(0, 0.5)
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [("12", 12), (" 3 ", 3), (formatdate(1_000_045, usegmt=True), 45), (formatdate(999_000, usegmt=True), 0)],
+        ids=["seconds", "padded", "http_date", "past_date"],
+    )
+    def test_if_retry_after_is_parsed(self, value, expected):
+        """Ensure delta-seconds and HTTP-dates are turned into seconds to wait, never negative."""
+        assert_that(parse_retry_after(value, now=1_000_000)).is_equal_to(expected)
+
+    @pytest.mark.parametrize("value", [None, "", "soon", "-5"])
+    def test_if_unreadable_retry_after_is_ignored(self, value):
+        """Ensure a missing or unreadable Retry-After yields None."""
+        assert_that(parse_retry_after(value)).is_none()
+
+    def test_if_transient_error_is_retried_transparently(self, breaker, fake_serverest):
+        """Ensure a GET that hits a connection reset once is repeated and answered."""
+        logger.info("Starting test: test_if_transient_error_is_retried_transparently")
+        session = FlakySession(failures=1)
+        response = APIRequest(session=session, retry=RetryPolicy(attempts=2, backoff=0)).get_request(
+            f"{fake_serverest.url}/usuarios", dict(DEFAULT_HEADERS)
+        )
+
+        with soft_assertions():
+            assert_that(response.status_code).is_equal_to(200)
+            assert_that(session.calls).is_equal_to(2)
+            assert_that(breaker.stats.retries).is_equal_to(1)
+            assert_that(breaker.state).is_equal_to(CLOSED)
+        logger.info("Test completed: test_if_transient_error_is_retried_transparently")
+
+    def test_if_each_policy_attempt_opens_one_connection(self, clock, monkeypatch):
+        """Ensure a refused POST is retried by the policy alone, one connect per attempt, each seen by the breaker."""
+        logger.info("Starting test: test_if_each_policy_attempt_opens_one_connection")
+        breaker = CircuitBreaker("/usuarios", threshold=10, reset_timeout=10, clock=clock)
+        monkeypatch.setattr(CircuitBreakers, "for_url", classmethod(lambda cls, url: breaker))
+        connects = []
+        connect = TimedHTTPConnection.connect
+        monkeypatch.setattr(TimedHTTPConnection, "connect", lambda self: connects.append(1) or connect(self))
+        with socket.socket() as closed:
+            closed.bind(("127.0.0.1", 0))
+            port = closed.getsockname()[1]
+        request = APIRequest(session=SessionManager.create_session(), retry=RetryPolicy(attempts=2, backoff=0))
+
+        with pytest.raises(requests.ConnectionError) as raised:
+            request.post_request(f"http://127.0.0.1:{port}/usuarios", "{}", dict(DEFAULT_HEADERS))
+
+        with soft_assertions():
+            assert_that(is_connect_error(raised.value)).is_true()
+            assert_that(connects).is_length(3)
+            assert_that(breaker.stats.retries).is_equal_to(2)
+            assert_that(breaker.stats.exhausted).is_equal_to(1)
+            assert_that(breaker._failures).is_equal_to(3)
+        logger.info("Test completed: test_if_each_policy_attempt_opens_one_connection")
@@ -0,0 +1,130 @@
+"""Tests for copy-on-write views over the shared seed (utils.seed_dataset)."""
+
+from assertpy import assert_that, soft_assertions
+
+from utils.context_store import PRODUCT_IDS, PRODUCTS, USERS
+from utils.models import Product, User
+from utils.seed_dataset import SeedDataset
+from utils.serializer import dumps, loads
+
+
+def seeded():
+    """Return a dataset seeded with an admin, a regular user and a product."""
+    seed = SeedDataset()
+    seed.data.update(
+        {
+            USERS: User.many(
+                [
+                    {"_id": "u1", "email": "admin@qa.com", "administrador": "true"},
+                    {"_id": "u2", "email": "user@qa.com", "administrador": "false"},
+                ]
+            ),
+            PRODUCTS: Product.many([{"_id": "p1", "nome": "Hub", "quantidade": 5}]),
+            PRODUCT_IDS: ["p1"],
+        }
+    )
+    return seed
+
+
+class TestSeedView:
+    """Reads share the seed; changes copy it first."""
+
+    def test_if_reads_share_seed_values_and_indexes(self):
+        """Ensure a read-only view copies nothing and reuses the lookup indexes of earlier views."""
+        seed = seeded()
+        first, second = seed.view(), seed.view()
+
+        with soft_assertions():
+            assert_that(first[USERS]).is_equal_to(seed.data[USERS])
+            assert_that(first.user("u1")._target()).is_same_as(seed.data[USERS][0])
+            assert_that(second.user_by_email("user@qa.com")["_id"]).is_equal_to("u2")
+            assert_that(first._index(USERS)).is_same_as(second._index(USERS))
+            assert_that(first._copies).is_empty()
+
+    def test_if_in_place_changes_on_an_untouched_view_copy_the_key(self):
+        """Ensure editing a record or list handed out by a fresh view changes the view's copy, not the seed."""
+        seed = seeded()
+        view = seed.view()
+        product = view.product("p1")
+
+        product["quantidade"] = 0
+        view[PRODUCT_IDS].append("p2")
+        view.user("u1").update({"nome": "Renamed"})
+
+        with soft_assertions():
+            assert_that(product["quantidade"]).is_equal_to(0)
+            assert_that(view[PRODUCTS][0]["quantidade"]).is_equal_to(0)
+            assert_that(view.product("p1")["quantidade"]).is_equal_to(0)
+            assert_that(view[PRODUCT_IDS]).is_equal_to(["p1", "p2"])
+            assert_that(view.user("u1")["nome"]).is_equal_to("Renamed")
+            assert_that(seed.data[PRODUCTS][0]["quantidade"]).is_equal_to(5)
+            assert_that(seed.data[PRODUCT_IDS]).is_equal_to(["p1"])
+            assert_that("nome" in seed.data[USERS][0]).is_false()
+            assert_that(seed.view().product("p1")["quantidade"]).is_equal_to(5)
+
+    def test_if_changes_through_the_view_copy_the_key_first(self):
+        """Ensure adding, assigning and deleting through the view leave the seed untouched."""
+        seed = seeded()
+        view = seed.view()
+
+        view.add_products([{"_id": "p2", "nome": "Dock", "quantidade": 1}])
+        view[USERS] = []
+        del view[PRODUCT_IDS]
+
+        with soft_assertions():
+            assert_that(view[PRODUCTS]).is_length(2)
+            assert_that(seed.data[PRODUCTS]).is_length(1)
+            assert_that(view.get(USERS)).is_empty()
+            assert_that(seed.data[USERS]).is_length(2)
+            assert_that(PRODUCT_IDS in view).is_false()
+            assert_that(seed.data[PRODUCT_IDS]).is_equal_to(["p1"])
+
+    def test_if_handle_outliving_its_key_never_writes_to_the_seed(self):
+        """Ensure a record read before its key was replaced keeps its edits away from the seed."""
+        seed = seeded()
+        view = seed.view()
+        user = view.user("u2")
+
+        view[USERS] = []
+        user["nome"] = "Orphan"
+
+        assert_that("nome" in seed.data[USERS][1]).is_false()
+
+    def test_if_view_behaves_as_a_mapping_of_seeded_and_own_keys(self):
+        """Ensure len, truthiness, iteration, keys, items and dict() cover seeded and own keys alike."""
+        seed = seeded()
+        view = seed.view({PRODUCTS, PRODUCT_IDS})
+        view["extra"] = 1
+
+        with soft_assertions():
+            assert_that(len(view)).is_equal_to(2)
+            assert_that(bool(view)).is_true()
+            assert_that(list(view)).is_equal_to([USERS, "extra"])
+            assert_that(list(view.keys())).is_equal_to([USERS, "extra"])
+            assert_that(dict(view.items())["extra"]).is_equal_to(1)
+            assert_that(dict(view)).contains_key(USERS)
+            assert_that(dict(view)[USERS]).is_equal_to(seed.data[USERS])
+            assert_that(bool(SeedDataset().view())).is_false()
+
+    def test_if_handles_serialize_like_records(self):
+        """Ensure seeded records can be sent as request payloads."""
+        view = seeded().view()
+        assert_that(loads(dumps({"user": view.user("u1"), "products": view[PRODUCTS]}))).is_equal_to(
+            {
+                "user": {"_id": "u1", "email": "admin@qa.com", "administrador": "true"},
+                "products": [{"_id": "p1", "nome": "Hub", "quantidade": 5}],
+            }
+        )
+
+    def test_if_fresh_keys_start_empty(self):
+        """Ensure a test creating its own products sees none of the seeded ones but keeps the seeded users."""
+        seed = seeded()
+        view = seed.view({PRODUCTS, PRODUCT_IDS})
+
+        view.add_products([{"_id": "p2", "nome": "Dock", "quantidade": 1}])
+
+        with soft_assertions():
+            assert_that([product["_id"] for product in view[PRODUCTS]]).is_equal_to(["p2"])
+            assert_that(view[PRODUCT_IDS]).is_equal_to(["p2"])
+            assert_that(view.admins()).is_length(1)
+            assert_that(seed.data[PRODUCT_IDS]).is_equal_to(["p1"])
@@ -0,0 +1,66 @@
+"""Tests for the pluggable JSON serializer (utils.serializer)."""
+
+import json
+import logging
+
+import pytest
+from assertpy import assert_that
+
+from utils.models import Product, User
+from utils.serializer import OrjsonSerializer, StdlibSerializer, get_serializer
+
+logger = logging.getLogger(__name__)
+
+PAYLOAD = {"nome": "Ação Ñandú", "preco": 150, "administrador": "true", "produtos": [{"quantidade": 2}]}
+
+
+def backends():
+    """Return the installed serializer backends."""
+    available = [StdlibSerializer()]
+    try:
+        available.append(OrjsonSerializer())
+    except ImportError:
+        logger.info("orjson is not installed; testing the stdlib backend only")
+    return available
+
+
+@pytest.mark.parametrize("serializer", backends(), ids=lambda serializer: serializer.name)
+class TestSerializer:
+    """Every backend encodes and decodes the same way."""
+
+    def test_if_payload_round_trips_as_compact_utf8(self, serializer):
+        """Ensure payloads encode to compact UTF-8 bytes that decode back unchanged."""
+        encoded = serializer.dumps(PAYLOAD)
+
+        assert_that(encoded).is_instance_of(bytes)
+        assert_that(encoded).is_equal_to(json.dumps(PAYLOAD, ensure_ascii=False, separators=(",", ":")).encode())
+        assert_that(serializer.loads(encoded)).is_equal_to(PAYLOAD)
+        assert_that(serializer.loads(encoded.decode("utf-8"))).is_equal_to(PAYLOAD)
+
+    def test_if_slotted_records_encode_as_dicts(self, serializer):
+        """Ensure slotted models, nested in lists too, encode like the dicts they replace."""
+        user = User.from_dict({"nome": "Ana", "email": "ana@example.com", "password": "x", "administrador": "true"})
+        product = Product.from_dict({"nome": "Hub", "preco": 10, "descricao": "d", "quantidade": 1})
+
+        decoded = serializer.loads(serializer.dumps({"user": user, "products": [product]}))
+
+        assert_that(decoded).is_equal_to({"user": user.to_dict(), "products": [product.to_dict()]})
+
+    def test_if_unknown_types_are_rejected(self, serializer):
+        """Ensure values JSON cannot represent raise TypeError instead of being encoded silently."""
+        with pytest.raises(TypeError):
+            serializer.dumps({"value": object()})
+
+
+class TestBackendSelection:
+    """JSON_BACKEND resolution."""
+
+    def test_if_auto_and_stdlib_backends_resolve(self):
+        """Ensure 'stdlib' is always available and 'auto' falls back to it without orjson."""
+        assert_that(get_serializer("stdlib").name).is_equal_to("stdlib")
+        assert_that(get_serializer("auto").name).is_in("stdlib", "orjson")
+
+    def test_if_unknown_backend_is_rejected(self):
+        """Ensure a misspelled JSON_BACKEND fails loudly."""
+        with pytest.raises(ValueError):
+            get_serializer("ujson")
@@ -0,0 +1,215 @@
+"""Tests for streamed dataset generation and seeding (utils.stream_seed and the pieces it streams through)."""
+
+import logging
+import threading
+import time
+
+import pytest
+from assertpy import assert_that, soft_assertions
+
+from utils.bulk_seeder import BulkSeeder
+from utils.data_generator import DataGenerator
+from utils.entity_tracker import EntityTracker
+from utils.file_manager import FileManager
+from utils.stream_seed import StreamSeeder, main
+from utils.unique_index import SequenceIndex, email_variant, name_variant
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def seed_timings(monkeypatch):
+    """Keep the phase timings of the test out of the session's bulk seeding summary."""
+    monkeypatch.setattr(BulkSeeder, "timings", [])
+    return BulkSeeder.timings
+
+
+class TestBulkSeederStream:
+    """Bounded, ordered streaming through BulkSeeder.stream."""
+
+    def test_if_stream_keeps_order_with_at_most_window_items_pulled_ahead(self, seed_timings):
+        """Ensure results come back in input order and the source is read at most window items ahead."""
+        logger.info("Starting test: test_if_stream_keeps_order_with_at_most_window_items_pulled_ahead")
+        pulled = 0
+        lock = threading.Lock()
+
+        def source():
+            nonlocal pulled
+            for number in range(40):
+                with lock:
+                    pulled += 1
+                yield number
+
+        def call(number):
+            time.sleep(0.001 * (number % 3))
+            return number * 2
+
+        received, ahead = [], []
+        for item, result in BulkSeeder(max_workers=4).stream("stream_test", call, source(), window=3):
+            received.append((item, result))
+            ahead.append(pulled - len(received))
+
+        with soft_assertions():
+            assert_that(received).is_equal_to([(number, number * 2) for number in range(40)])
+            assert_that(max(ahead)).is_less_than_or_equal_to(3)
+            assert_that(seed_timings).extracting("phase", "count").is_equal_to([("stream_test", 40)])
+        logger.info("Test completed: test_if_stream_keeps_order_with_at_most_window_items_pulled_ahead")
+
+    def test_if_window_below_one_is_rejected(self, seed_timings):
+        """Ensure a stream needs room for at least one item in flight."""
+        logger.info("Starting test: test_if_window_below_one_is_rejected")
+        with pytest.raises(ValueError, match="window"):
+            list(BulkSeeder().stream("stream_test", str, range(3), window=0))
+        logger.info("Test completed: test_if_window_below_one_is_rejected")
+
+
+class TestRecordStreams:
+    """Lazy record generation and NDJSON files."""
+
+    def test_if_user_stream_is_generated_in_batches_with_an_admin_first(self, reseed_generator):
+        """Ensure iter_user_data yields the requested count lazily, an admin first and every email unique."""
+        logger.info("Starting test: test_if_user_stream_is_generated_in_batches_with_an_admin_first")
+        reseed_generator(7)
+        users = list(DataGenerator.iter_user_data(25, batch_size=4))
+        with soft_assertions():
+            assert_that(users).is_length(25)
+            assert_that(users[0]["administrador"]).is_equal_to("true")
+            assert_that({user["email"] for user in users}).is_length(25)
+            with pytest.raises(ValueError, match="batch_size"):
+                next(DataGenerator.iter_product_data(1, batch_size=0))
+        logger.info("Test completed: test_if_user_stream_is_generated_in_batches_with_an_admin_first")
+
+    def test_if_ndjson_round_trips_a_generator(self, tmp_path):
+        """Ensure write_ndjson consumes a generator and read_ndjson yields the same records back."""
+        logger.info("Starting test: test_if_ndjson_round_trips_a_generator")
+        records = [{"nome": "Ana", "quantidade": number} for number in range(5)]
+
+        written = FileManager.write_ndjson(tmp_path / "records", iter(records))
+
+        with soft_assertions():
+            assert_that(written).is_equal_to(5)
+            assert_that(list(FileManager.read_ndjson(tmp_path / "records"))).is_equal_to(records)
+        logger.info("Test completed: test_if_ndjson_round_trips_a_generator")
+
+    def test_if_failed_stream_leaves_no_partial_file(self, tmp_path):
+        """Ensure a stream that raises midway neither creates the file nor leaves its temporary copy."""
+        logger.info("Starting test: test_if_failed_stream_leaves_no_partial_file")
+
+        def broken():
+            yield {"nome": "Ana"}
+            raise RuntimeError("source failed")
+
+        with pytest.raises(RuntimeError):
+            FileManager.write_ndjson(tmp_path / "records", broken())
+
+        assert_that(list(tmp_path.iterdir())).is_empty()
+        logger.info("Test completed: test_if_failed_stream_leaves_no_partial_file")
+
+
+class TestStreamSeeder:
+    """Seeding users and products from streams."""
+
+    def test_if_streams_are_created_with_their_ids(self, fake_serverest, reseed_generator, seed_timings):
+        """Ensure every streamed user and product is created and yielded back with its _id."""
+        logger.info("Starting test: test_if_streams_are_created_with_their_ids")
+        reseed_generator(11, sequential=True)
+        seeder = StreamSeeder(fake_serverest.url, window=2, max_workers=2)
+        try:
+            users = list(seeder.users(DataGenerator.iter_user_data(6)))
+            seeder.prewarm_admins()
+            products = list(seeder.products(DataGenerator.iter_product_data(4)))
+        finally:
+            seeder.tokens.close()
+
+        with soft_assertions():
+            assert_that([user.get("_id") for user in users]).does_not_contain(None).is_length(6)
+            assert_that([product.get("_id") for product in products]).does_not_contain(None).is_length(4)
+            assert_that(dict(seeder.created)).is_equal_to({"stream_user": 6, "stream_product": 4})
+            assert_that(seeder.failed).is_empty()
+        logger.info("Test completed: test_if_streams_are_created_with_their_ids")
+
+    def test_if_rejected_records_are_counted_and_skipped(self, fake_serverest, reseed_generator, seed_timings):
+        """Ensure a record the API rejects is counted as failed while the rest of the stream goes on."""
+        logger.info("Starting test: test_if_rejected_records_are_counted_and_skipped")
+        reseed_generator(13)
+        users = DataGenerator.batch_user_data(3)
+        users[1]["email"] = users[0]["email"]
+        seeder = StreamSeeder(fake_serverest.url, window=1)
+        try:
+            created = list(seeder.users(iter(users)))
+        finally:
+            seeder.tokens.close()
+
+        with soft_assertions():
+            assert_that([user["email"] for user in created]).is_equal_to([users[0]["email"], users[2]["email"]])
+            assert_that(seeder.failed["stream_user"]).is_equal_to(1)
+        logger.info("Test completed: test_if_rejected_records_are_counted_and_skipped")
+
+
+class TestCommandLine:
+    """python -m utils.stream_seed."""
+
+    def test_if_generate_only_writes_numbered_records(self, tmp_path, capsys, reseed_generator):
+        """Ensure --generate-only writes both files and numbers every email and product name."""
+        logger.info("Starting test: test_if_generate_only_writes_numbered_records")
+        output = tmp_path / "soak"
+
+        exit_code = main(["--users", "3", "--products", "2", "--generate-only", "--output", str(output), "--seed", "5"])
+
+        users = list(FileManager.read_ndjson(f"{output}_users"))
+        products = list(FileManager.read_ndjson(f"{output}_products"))
+        with soft_assertions():
+            assert_that(exit_code).is_equal_to(0)
+            assert_that(capsys.readouterr().out).contains("data seed: 5")
+            assert_that([user["email"].split("@")[0].rsplit(".", 1)[1] for user in users]).is_equal_to(["1", "2", "3"])
+            assert_that([product["nome"].rsplit(" ", 1)[1] for product in products]).is_equal_to(["1", "2"])
+        logger.info("Test completed: test_if_generate_only_writes_numbered_records")
+
+    def test_if_seeding_a_fake_server_reports_created_records(
+        self, capsys, monkeypatch, reseed_generator, seed_timings
+    ):
+        """Ensure a seeding run against the local fake server creates everything and exits with 0."""
+        logger.info("Starting test: test_if_seeding_a_fake_server_reports_created_records")
+        # The run's server is gone when it returns, so the session teardown must not chase its entities
+        monkeypatch.setattr(EntityTracker, "_active", None)
+        exit_code = main(["--users", "4", "--products", "3", "--fake-server", "--window", "2"])
+
+        lines = capsys.readouterr().out.splitlines()
+        with soft_assertions():
+            assert_that(exit_code).is_equal_to(0)
+            assert_that([line.split()[:4] for line in lines[1:]]).is_equal_to(
+                [["users", "4", "created", "0"], ["products", "3", "created", "0"]]
+            )
+        logger.info("Test completed: test_if_seeding_a_fake_server_reports_created_records")
+
+    @pytest.mark.parametrize(
+        "argv",
+        [["--generate-only"], ["--generate-only", "--output", "x", "--input", "y"], ["--window", "0"]],
+    )
+    def test_if_invalid_options_are_rejected(self, argv, capsys):
+        """Ensure contradictory or out-of-range options stop with a usage error."""
+        logger.info("Starting test: test_if_invalid_options_are_rejected")
+        with pytest.raises(SystemExit) as exit_info:
+            main(argv)
+        assert_that(exit_info.value.code).is_equal_to(2)
+        logger.info("Test completed: test_if_invalid_options_are_rejected")
+
+
+class TestSequenceIndex:
+    """Unique values in constant memory."""
+
+    def test_if_every_claim_gets_the_next_number(self):
+        """Ensure claims are numbered in order, repeated or not, and clear starts again from 1."""
+        logger.info("Starting test: test_if_every_claim_gets_the_next_number")
+        emails = SequenceIndex(email_variant)
+        names = SequenceIndex(name_variant)
+
+        claimed = [emails.claim("ana.lima@example.com") for _ in range(2)] + [emails.claim("bo@example.org")]
+        first_name = names.claim("Robust hub")
+        names.clear()
+
+        with soft_assertions():
+            assert_that(claimed).is_equal_to(["ana.lima.1@example.com", "ana.lima.2@example.com", "bo.3@example.org"])
+            assert_that(first_name).is_equal_to("Robust hub 1")
+            assert_that(names.claim("Robust hub")).is_equal_to("Robust hub 1")
+        logger.info("Test completed: test_if_every_claim_gets_the_next_number")
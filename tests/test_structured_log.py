@@ -0,0 +1,146 @@
+"""Tests for the structured request log: rotating sink (utils.structured_log) and reader (utils.log_reader)."""
+
+import gzip
+import json
+import logging
+
+import pytest
+from assertpy import assert_that, soft_assertions
+
+from utils.log_reader import iter_records, main, status_matches
+from utils.structured_log import RotatingLogStream, open_log
+
+logger = logging.getLogger(__name__)
+
+RECORDS = [
+    {"test": "test_users.py::test_add", "method": "POST", "status": 201, "latency_ms": 12.5, "url": "/usuarios"},
+    {"test": "test_users.py::test_list", "method": "GET", "status": 200, "latency_ms": 310.0, "url": "/usuarios"},
+    {"test": "test_carts.py::test_add", "method": "POST", "status": 400, "latency_ms": 8.0, "url": "/carrinhos"},
+    {"test": None, "method": "DELETE", "status": 503, "latency_ms": 420.0, "url": "/produtos/1"},
+]
+
+
+def lines(records):
+    """Return records as JSON Lines text."""
+    return "".join(json.dumps(record) + "\n" for record in records)
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    """Return a gzip structured log in a temporary directory holding RECORDS."""
+    with RotatingLogStream(tmp_path, "requests", compression="gzip") as stream:
+        stream.write(lines(RECORDS))
+    return tmp_path / "requests_0000.jsonl.gz"
+
+
+class TestRotatingLogStream:
+    """Numbering, rotation and compression of the structured log files."""
+
+    def test_if_files_rotate_past_max_bytes_without_splitting_records(self, tmp_path):
+        """Ensure a write that would pass max_bytes starts the next numbered file."""
+        logger.info("Starting test: test_if_files_rotate_past_max_bytes_without_splitting_records")
+        record = lines(RECORDS[:1])
+        with RotatingLogStream(tmp_path, "requests", compression="none", max_bytes=len(record) * 2) as stream:
+            for _ in range(5):
+                stream.write(record)
+
+        paths = sorted(tmp_path.iterdir())
+        with soft_assertions():
+            assert_that([path.name for path in paths]).is_equal_to(
+                ["requests_0000.jsonl", "requests_0001.jsonl", "requests_0002.jsonl"]
+            )
+            assert_that([path.read_text(encoding="utf-8").count("\n") for path in paths]).is_equal_to([2, 2, 1])
+        logger.info("Test completed: test_if_files_rotate_past_max_bytes_without_splitting_records")
+
+    def test_if_record_larger_than_max_bytes_gets_a_file_of_its_own(self, tmp_path):
+        """Ensure an oversized record is still written whole rather than rotated forever."""
+        logger.info("Starting test: test_if_record_larger_than_max_bytes_gets_a_file_of_its_own")
+        with RotatingLogStream(tmp_path, "requests", compression="none", max_bytes=10) as stream:
+            stream.write(lines(RECORDS[:1]))
+            stream.write(lines(RECORDS[1:2]))
+
+        assert_that(list(iter_records(sorted(tmp_path.iterdir())))).is_equal_to(RECORDS[:2])
+        logger.info("Test completed: test_if_record_larger_than_max_bytes_gets_a_file_of_its_own")
+
+    def test_if_gzip_files_are_compressed_and_read_back(self, log_path):
+        """Ensure the gzip sink writes real gzip data that open_log decodes."""
+        logger.info("Starting test: test_if_gzip_files_are_compressed_and_read_back")
+        with soft_assertions():
+            assert_that(log_path.read_bytes()[:2]).is_equal_to(b"\x1f\x8b")
+            assert_that(gzip.decompress(log_path.read_bytes()).decode()).is_equal_to(lines(RECORDS))
+            with open_log(log_path) as stream:
+                assert_that(stream.read()).is_equal_to(lines(RECORDS))
+        logger.info("Test completed: test_if_gzip_files_are_compressed_and_read_back")
+
+    def test_if_unknown_compression_is_rejected(self, tmp_path):
+        """Ensure a compression other than none, gzip or zstd raises ValueError."""
+        logger.info("Starting test: test_if_unknown_compression_is_rejected")
+        with pytest.raises(ValueError, match="compression"):
+            RotatingLogStream(tmp_path, "requests", compression="bzip2")
+        logger.info("Test completed: test_if_unknown_compression_is_rejected")
+
+    def test_if_zstd_files_are_read_back(self, tmp_path):
+        """Ensure the zstd sink round-trips when the optional zstandard package is installed."""
+        logger.info("Starting test: test_if_zstd_files_are_read_back")
+        pytest.importorskip("zstandard")
+        with RotatingLogStream(tmp_path, "requests", compression="zstd") as stream:
+            stream.write(lines(RECORDS))
+
+        assert_that(list(iter_records([tmp_path / "requests_0000.jsonl.zst"]))).is_equal_to(RECORDS)
+        logger.info("Test completed: test_if_zstd_files_are_read_back")
+
+
+class TestLogReader:
+    """Streaming and filtering records with utils.log_reader."""
+
+    def test_if_truncated_gzip_file_yields_complete_records(self, tmp_path):
+        """Ensure a gzip file still being written is read up to where it ends."""
+        logger.info("Starting test: test_if_truncated_gzip_file_yields_complete_records")
+        path = tmp_path / "requests_0000.jsonl.gz"
+        path.write_bytes(gzip.compress(lines(RECORDS).encode())[:-8])
+
+        assert_that(list(iter_records([path]))).is_equal_to(RECORDS)
+        logger.info("Test completed: test_if_truncated_gzip_file_yields_complete_records")
+
+    @pytest.mark.parametrize(
+        "status, expected, matched",
+        [(201, "201", True), (201, "2xx", True), (404, "4XX", True), (503, "4xx", False), (None, "5xx", False)],
+    )
+    def test_if_status_matches_codes_and_classes(self, status, expected, matched):
+        """Ensure a status filter accepts exact codes and classes such as 4xx."""
+        logger.info("Starting test: test_if_status_matches_codes_and_classes")
+        assert_that(status_matches(status, expected)).is_equal_to(matched)
+        logger.info("Test completed: test_if_status_matches_codes_and_classes")
+
+    @pytest.mark.parametrize(
+        "options, urls",
+        [
+            ([], ["/usuarios", "/usuarios", "/carrinhos", "/produtos/1"]),
+            (["--test", "test_users"], ["/usuarios", "/usuarios"]),
+            (["--method", "post"], ["/usuarios", "/carrinhos"]),
+            (["--status", "4xx", "--status", "503"], ["/carrinhos", "/produtos/1"]),
+            (["--min-latency", "300"], ["/usuarios", "/produtos/1"]),
+            (["--method", "POST", "--limit", "1"], ["/usuarios"]),
+        ],
+    )
+    def test_if_command_line_filters_select_records(self, log_path, capsys, options, urls):
+        """Ensure main prints only the records passing every filter, up to --limit."""
+        logger.info("Starting test: test_if_command_line_filters_select_records")
+        exit_code = main([str(log_path), *options])
+
+        printed = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        with soft_assertions():
+            assert_that(exit_code).is_equal_to(0)
+            assert_that([record["url"] for record in printed]).is_equal_to(urls)
+        logger.info("Test completed: test_if_command_line_filters_select_records")
+
+    def test_if_table_format_prints_one_row_per_record(self, log_path, capsys):
+        """Ensure the table format shows status, latency, method, URL and test."""
+        logger.info("Starting test: test_if_table_format_prints_one_row_per_record")
+        main([str(log_path), "--status", "503", "--format", "table"])
+
+        rows = capsys.readouterr().out.splitlines()
+        with soft_assertions():
+            assert_that(rows).is_length(1)
+            assert_that(rows[0].split()).is_equal_to(["503", "420.0ms", "DELETE", "/produtos/1", "[-]"])
+        logger.info("Test completed: test_if_table_format_prints_one_row_per_record")
@@ -0,0 +1,108 @@
+"""Tests for the session teardown of tracked entities."""
+
+import logging
+
+import pytest
+from assertpy import assert_that, soft_assertions
+
+from fake_serverest import FakeServeRest
+from services.serverest_api.api.carts import Carts
+from services.serverest_api.api.products import Products
+from services.serverest_api.api.users import Users
+from services.serverest_api.teardown import Teardown
+from utils.bulk_seeder import BulkSeeder
+from utils.data_generator import DataGenerator
+from utils.entity_tracker import EntityTracker
+from utils.token_manager import TokenManager
+
+logger = logging.getLogger(__name__)
+
+OWNERS = 3
+
+
+@pytest.fixture
+def tracked_server():
+    """Return a private fake server and a tracker recording only this test's entities."""
+    previous = EntityTracker.active()
+    tracker = EntityTracker.activate()
+    try:
+        with FakeServeRest() as server:
+            yield server, tracker
+    finally:
+        if previous is not None:
+            EntityTracker.activate(previous)
+        else:
+            EntityTracker.deactivate()
+
+
+def seed(base_uri):
+    """Create an admin with a product and OWNERS users holding a cart with it; return the users."""
+    users = DataGenerator.batch_user_data(OWNERS + 1)
+    for user in users:
+        user["administrador"] = "true"
+        assert_that(Users(base_uri).create_user(user).status_code).is_equal_to(201)
+
+    tokens = TokenManager(base_uri, auto_refresh=False)
+    product = {**DataGenerator.batch_product_data(1)[0], "quantidade": OWNERS}
+    response = Products(base_uri).create_product(product, tokens.token(users[0]))
+    assert_that(response.status_code).is_equal_to(201)
+    payload = {"produtos": [{"idProduto": response.as_dict["_id"], "quantidade": 1}]}
+    for user in users[1:]:
+        assert_that(Carts(base_uri).create_cart(payload, tokens.token(user)).status_code).is_equal_to(201)
+    return users, tokens
+
+
+def remaining(base_uri):
+    """Return how many (users, products, carts) base_uri still holds."""
+    return (
+        Users(base_uri).get_user().as_dict["quantidade"],
+        Products(base_uri).get_product().as_dict["quantidade"],
+        Carts(base_uri).get_carts().as_dict["quantidade"],
+    )
+
+
+class TestTeardown:
+    """Track created entities and delete them in dependency order."""
+
+    def test_if_teardown_deletes_entities_after_tokens_expired(self, tracked_server):
+        """Ensure carts, products and users are deleted even when every token used to create them has expired."""
+        logger.info("Starting test: test_if_teardown_deletes_entities_after_tokens_expired")
+        server, tracker = tracked_server
+        seed(server.url)
+        assert_that(tracker.counts()).is_equal_to((OWNERS + 1, 1, OWNERS))
+
+        # Expire every token the server issued, as a run longer than ServeRest's 600 s token life would
+        server.store.tokens.clear()
+        phases = Teardown().run(tracker)
+
+        with soft_assertions():
+            for stats in phases:
+                assert_that(stats.failed).described_as(stats.phase).is_equal_to(0)
+            assert_that([stats.deleted for stats in phases]).is_equal_to([OWNERS, 1, OWNERS + 1])
+            assert_that(remaining(server.url)).is_equal_to((0, 0, 0))
+            assert_that(tracker.counts()).is_equal_to((0, 0, 0))
+            # Teardown phases belong in the teardown summary only
+            assert_that(BulkSeeder.summary()).does_not_contain_key("teardown_carts")
+
+        logger.info("Test completed: test_if_teardown_deletes_entities_after_tokens_expired")
+
+    def test_if_tracker_forgets_entities_removed_during_the_run(self, tracked_server):
+        """Ensure checked-out carts and deleted users are not deleted again at teardown."""
+        logger.info("Starting test: test_if_tracker_forgets_entities_removed_during_the_run")
+        server, tracker = tracked_server
+        users, tokens = seed(server.url)
+
+        assert_that(Carts(server.url).checkout(tokens.token(users[1])).status_code).is_equal_to(200)
+        users_client = Users(server.url)
+        assert_that(
+            users_client.delete_user(
+                users_client.get_user(email=users[1]["email"]).as_dict["usuarios"][0]["_id"]
+            ).status_code
+        ).is_equal_to(200)
+
+        assert_that(tracker.counts()).is_equal_to((OWNERS, 1, OWNERS - 1))
+        phases = Teardown().run(tracker)
+        assert_that(sum(stats.failed for stats in phases)).is_equal_to(0)
+        assert_that(remaining(server.url)).is_equal_to((0, 0, 0))
+
+        logger.info("Test completed: test_if_tracker_forgets_entities_removed_during_the_run")
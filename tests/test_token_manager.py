@@ -0,0 +1,142 @@
+"""Tests for the login token cache (utils.token_manager)."""
+
+import base64
+import logging
+import time
+
+import pytest
+from assertpy import assert_that, soft_assertions
+
+from services.serverest_api.api.users import Users
+from utils.bulk_seeder import BulkSeeder
+from utils.data_generator import DataGenerator
+from utils.serializer import dumps
+from utils.token_manager import TokenManager, token_expiry
+
+logger = logging.getLogger(__name__)
+
+
+def jwt(claims):
+    """Return an unsigned JWT carrying claims."""
+
+    def encode(part):
+        return base64.urlsafe_b64encode(dumps(part)).rstrip(b"=").decode()
+
+    return f"{encode({'alg': 'HS256', 'typ': 'JWT'})}.{encode(claims)}.signature"
+
+
+@pytest.fixture
+def users(fake_serverest):
+    """Return a factory registering n users on the fake server, admins when admin is true."""
+
+    def register(n, admin=False):
+        records = DataGenerator.batch_user_data(n)
+        for record in records:
+            record["administrador"] = "true" if admin else "false"
+            assert_that(Users(fake_serverest.url).create_user(record).status_code).is_equal_to(201)
+        return records
+
+    return register
+
+
+class TestTokenExpiry:
+    """Expiry of a token: the JWT exp claim, else a fixed lifetime."""
+
+    def test_if_expiry_is_read_from_jwt_exp_claim(self):
+        """Ensure the exp claim of a bearer JWT wins over the default lifetime."""
+        authorization = f"Bearer {jwt({'email': 'a@b.com', 'exp': 1_700_000_600})}"
+        assert_that(token_expiry(authorization, 1_700_000_000, default_ttl=30)).is_equal_to(1_700_000_600)
+
+    @pytest.mark.parametrize(
+        "authorization",
+        ["Bearer opaque-token", f"Bearer {jwt({'email': 'a@b.com'})}", "Bearer a.not-base64!.c"],
+        ids=["opaque", "no_exp", "malformed"],
+    )
+    def test_if_expiry_falls_back_to_default_ttl(self, authorization):
+        """Ensure tokens without a readable exp claim live default_ttl seconds from issue."""
+        assert_that(token_expiry(authorization, 100, default_ttl=30)).is_equal_to(130)
+
+
+class TestTokenManager:
+    """Caching, renewal and the admin pool against the fake server."""
+
+    def test_if_fresh_token_is_served_from_cache(self, fake_serverest, users, clock):
+        """Ensure repeated calls for the same credentials log in once."""
+        logger.info("Starting test: test_if_fresh_token_is_served_from_cache")
+        manager = TokenManager(fake_serverest.url, auto_refresh=False, clock=clock)
+        user, other = users(2)
+
+        first = manager.token(user)
+        second = manager.token(user)
+        manager.token(other)
+
+        with soft_assertions():
+            assert_that(second).is_equal_to(first)
+            assert_that(manager.stats.logins).is_equal_to(2)
+            assert_that(manager.stats.hits).is_equal_to(1)
+            assert_that(len(manager)).is_equal_to(2)
+        logger.info("Test completed: test_if_fresh_token_is_served_from_cache")
+
+    def test_if_token_is_renewed_by_next_call_after_refresh_time(self, fake_serverest, users, clock):
+        """Ensure without the background refresher a token is replaced refresh_margin seconds before expiry."""
+        logger.info("Starting test: test_if_token_is_renewed_by_next_call_after_refresh_time")
+        manager = TokenManager(fake_serverest.url, refresh_margin=60, default_ttl=600, auto_refresh=False, clock=clock)
+        (user,) = users(1)
+        first = manager.token(user)
+
+        clock.now += 539
+        cached = manager.token(user)
+        clock.now += 1
+        renewed = manager.token(user)
+
+        with soft_assertions():
+            assert_that(cached).is_equal_to(first)
+            assert_that(renewed).is_not_equal_to(first)
+            assert_that(manager.stats.logins).is_equal_to(2)
+            assert_that(manager.stats.refreshes).is_equal_to(0)
+        logger.info("Test completed: test_if_token_is_renewed_by_next_call_after_refresh_time")
+
+    def test_if_background_thread_refreshes_tokens_before_expiry(self, fake_serverest, users, monkeypatch):
+        """Ensure the refresher replaces a short-lived token on its own, timed apart from the seeding phases."""
+        logger.info("Starting test: test_if_background_thread_refreshes_tokens_before_expiry")
+        monkeypatch.setattr(BulkSeeder, "timings", [])
+        manager = TokenManager(fake_serverest.url, refresh_margin=0.2, default_ttl=0.4, auto_refresh=True)
+        (user,) = users(1)
+        try:
+            first = manager.token(user)
+            deadline = time.monotonic() + 5
+            while manager.stats.refreshes == 0 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            renewed = manager.token(user)
+        finally:
+            manager.close()
+
+        with soft_assertions():
+            assert_that(manager.stats.refreshes).is_greater_than_or_equal_to(1)
+            assert_that(manager.stats.logins).is_equal_to(1)
+            assert_that(renewed).is_not_equal_to(first)
+            assert_that(manager.stats.refresh_time).is_greater_than(0)
+            assert_that(BulkSeeder.summary()).does_not_contain_key("token_refresh")
+        logger.info("Test completed: test_if_background_thread_refreshes_tokens_before_expiry")
+
+    def test_if_admin_tokens_are_handed_out_round_robin(self, fake_serverest, users, clock):
+        """Ensure only admins are pre-warmed and admin_token cycles through them from the cache."""
+        logger.info("Starting test: test_if_admin_tokens_are_handed_out_round_robin")
+        manager = TokenManager(fake_serverest.url, auto_refresh=False, clock=clock)
+        admins = users(2, admin=True)
+
+        warmed = manager.prewarm_admins([*admins, *users(1)])
+        handed_out = [manager.admin_token() for _ in range(3)]
+
+        with soft_assertions():
+            assert_that(warmed).is_equal_to(2)
+            assert_that(handed_out[0]).is_equal_to(manager.token(admins[0]))
+            assert_that(handed_out[1]).is_equal_to(manager.token(admins[1]))
+            assert_that(handed_out[2]).is_equal_to(handed_out[0])
+            assert_that(manager.stats.logins).is_equal_to(2)
+        logger.info("Test completed: test_if_admin_tokens_are_handed_out_round_robin")
+
+    def test_if_admin_token_without_admins_raises(self):
+        """Ensure asking for an admin token before pre-warming fails clearly."""
+        manager = TokenManager("http://serverest.test", auto_refresh=False)
+        assert_that(manager.admin_token).raises(ValueError).when_called_with().contains("No admin tokens")
@@ -0,0 +1,110 @@
+"""Tests for unique emails and product names (utils.unique_index) and their namespacing by DataGenerator."""
+
+import logging
+
+from assertpy import assert_that, soft_assertions
+
+from plugins.data_seed import pytest_report_header, seed_key
+from utils.data_generator import DataGenerator
+from utils.unique_index import UniqueIndex, email_variant, name_variant
+
+logger = logging.getLogger(__name__)
+
+
+class TestUniqueIndex:
+    """Claiming values that were never handed out before."""
+
+    def test_if_repeated_claims_get_numbered_variants(self):
+        """Ensure the first claim keeps the value and repeats get the next free number from 2."""
+        logger.info("Starting test: test_if_repeated_claims_get_numbered_variants")
+        emails = UniqueIndex(email_variant)
+        names = UniqueIndex(name_variant)
+
+        claimed = [emails.claim("ana.lima@example.com") for _ in range(3)]
+
+        with soft_assertions():
+            assert_that(claimed).is_equal_to(
+                ["ana.lima@example.com", "ana.lima.2@example.com", "ana.lima.3@example.com"]
+            )
+            assert_that([names.claim("Robust hub"), names.claim("Robust hub")]).is_equal_to(
+                ["Robust hub", "Robust hub 2"]
+            )
+        logger.info("Test completed: test_if_repeated_claims_get_numbered_variants")
+
+    def test_if_taken_variants_are_skipped(self):
+        """Ensure a variant already taken, e.g. claimed as a value of its own, is never handed out twice."""
+        logger.info("Starting test: test_if_taken_variants_are_skipped")
+        names = UniqueIndex(name_variant)
+        names.add("Robust hub")
+        names.add("Robust hub 2")
+        names.claim("Robust hub 3")
+
+        claimed = [names.claim("Robust hub"), names.claim("Robust hub")]
+
+        with soft_assertions():
+            assert_that(claimed).is_equal_to(["Robust hub 4", "Robust hub 5"])
+            assert_that(names).is_length(5)
+            assert_that("Robust hub 5" in names).is_true()
+        logger.info("Test completed: test_if_taken_variants_are_skipped")
+
+    def test_if_clear_forgets_claimed_values(self):
+        """Ensure a cleared index hands out the original values again."""
+        logger.info("Starting test: test_if_clear_forgets_claimed_values")
+        names = UniqueIndex(name_variant)
+        names.claim("Robust hub")
+        names.claim("Robust hub")
+        names.clear()
+
+        with soft_assertions():
+            assert_that(names).is_length(0)
+            assert_that(names.claim("Robust hub")).is_equal_to("Robust hub")
+            assert_that(names.claim("Robust hub")).is_equal_to("Robust hub 2")
+        logger.info("Test completed: test_if_clear_forgets_claimed_values")
+
+
+class TestNamespaces:
+    """Keeping concurrent processes' values apart."""
+
+    def test_if_namespace_is_added_to_emails_and_product_names(self, reseed_generator):
+        """Ensure a namespaced generator tags every email local part and product name."""
+        logger.info("Starting test: test_if_namespace_is_added_to_emails_and_product_names")
+        reseed_generator(31, namespace="gw1")
+        users = DataGenerator.batch_user_data(20)
+        products = DataGenerator.batch_product_data(20)
+
+        with soft_assertions():
+            for user in users:
+                assert_that(user["email"]).matches(r"\.gw1(\.\d+)?@")
+            for product in products:
+                assert_that(product["nome"]).matches(r" gw1( \d+)?$")
+        logger.info("Test completed: test_if_namespace_is_added_to_emails_and_product_names")
+
+    def test_if_workers_with_the_same_seed_never_collide(self, reseed_generator):
+        """Ensure two namespaces drawing identical base values still produce disjoint emails and names."""
+        logger.info("Starting test: test_if_workers_with_the_same_seed_never_collide")
+
+        def generate(namespace):
+            reseed_generator(32, namespace=namespace)
+            emails = {user["email"] for user in DataGenerator.batch_user_data(300)}
+            names = {product["nome"] for product in DataGenerator.batch_product_data(300)}
+            return emails, names
+
+        gw0_emails, gw0_names = generate("gw0")
+        gw1_emails, gw1_names = generate("gw1")
+
+        with soft_assertions():
+            assert_that(gw0_emails & gw1_emails).is_empty()
+            assert_that(gw0_names & gw1_names).is_empty()
+            assert_that({email.replace(".gw0", "") for email in gw0_emails}).is_equal_to(
+                {email.replace(".gw1", "") for email in gw1_emails}
+            )
+        logger.info("Test completed: test_if_workers_with_the_same_seed_never_collide")
+
+    def test_if_session_seed_is_reported_for_replay(self, pytestconfig):
+        """Ensure the report header names the seed the run was generated from."""
+        logger.info("Starting test: test_if_session_seed_is_reported_for_replay")
+        seed = pytestconfig.stash[seed_key]
+        assert_that(pytest_report_header(pytestconfig)).is_equal_to(
+            f"data seed: {seed} (reproduce with --data-seed {seed})"
+        )
+        logger.info("Test completed: test_if_session_seed_is_reported_for_replay")
@@ -2,6 +2,7 @@
 
 import logging
 
+import pytest
 from assertpy import assert_that, soft_assertions
 
 from services.serverest_api.api.users import Users
@@ -121,6 +122,7 @@ class TestUsers:
 
         logger.info("Test completed: test_if_user_can_be_fetched_by_id")
 
+    @pytest.mark.mutating("usuarios")
     def test_if_user_can_be_updated(self, create_user, context, user_data_for_update):
         """Ensure update calls succeed with replacement payloads."""
         logger.info("Starting test: test_if_user_can_be_updated")
@@ -164,6 +166,7 @@ class TestUsers:
         context.update({"usuarios": users})
         logger.info("Test completed: test_if_user_can_be_updated")
 
+    @pytest.mark.mutating("usuarios")
     def test_if_user_can_be_deleted(self, create_user, context):
         """Ensure deletion reports success for each user."""
         logger.info("Starting test: test_if_user_can_be_deleted")
@@ -0,0 +1,153 @@
+import asyncio
+import time
+
+import requests
+
+from config import ASYNC_MAX_CONNECTIONS, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT
+from utils.async_transport import AsyncConnectionPool
+from utils.entity_tracker import EntityTracker
+from utils.logger import Logger
+from utils.metrics import LatencyRecorder
+from utils.rate_limiter import RateLimiter
+from utils.request import APIRequest, APIResponse
+from utils.response_cache import ResponseCache
+from utils.retry import TRANSIENT_ERRORS, CircuitBreakers, RetryPolicy
+
+
+class AsyncAPIRequest:
+    """Awaitable counterpart of APIRequest sending calls without blocking the event loop.
+
+    Calls pass the same response cache, rate limiter, retry policy, circuit
+    breakers, entity tracker, logs and latency statistics as APIRequest,
+    but go out through an AsyncConnectionPool: a call waiting for its
+    answer holds no thread, so one event loop keeps up to
+    ``max_connections`` calls in flight. Rate limiter and retry waits are
+    slept on the event loop.
+    """
+
+    def __init__(self, max_connections=ASYNC_MAX_CONNECTIONS, timeout=None, cache=None, retry=None, limiter=None):
+        """Size the connection pool; timeout, cache, retry and limiter default like APIRequest's."""
+        self.pool = AsyncConnectionPool(max_connections)
+        self.timeout = timeout or (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+        self.cache = cache if cache is not None else ResponseCache.shared()
+        self.retry = retry or RetryPolicy()
+        self.limiter = limiter if limiter is not None else RateLimiter.shared()
+
+    async def get_request(self, url, headers):
+        """Execute a GET request."""
+        return await self._send("GET", url, headers)
+
+    async def post_request(self, url, payload, headers):
+        """Execute a POST request."""
+        return await self._send("POST", url, headers, payload)
+
+    async def put_request(self, url, payload, headers):
+        """Execute a PUT request."""
+        return await self._send("PUT", url, headers, payload)
+
+    async def delete_request(self, url, headers):
+        """Execute a DELETE request."""
+        return await self._send("DELETE", url, headers)
+
+    async def aclose(self):
+        """Close the pooled connections of the running event loop."""
+        await self.pool.aclose()
+
+    async def _send(self, method, url, headers, payload=None):
+        """Execute one call, then update the cache and the entity tracker."""
+        cache = self.cache
+        if cache is not None and method == "GET":
+            return await self._send_cached(cache, url, headers)
+
+        api_response = await self._call(method, url, headers, payload)
+        if cache is not None:
+            cache.invalidate(url)
+        tracker = EntityTracker.active()
+        if tracker is not None:
+            tracker.observe(method, url, headers, api_response, payload)
+        return api_response
+
+    async def _send_cached(self, cache, url, headers):
+        """Answer a GET from cache, revalidate a stale entry with If-None-Match, or fetch and store it."""
+        key = cache.key(url, headers)
+        entry, etag = cache.lookup(key)
+        if entry is not None:
+            return APIResponse(entry.status_code, entry.content, entry.headers, encoding=entry.encoding)
+
+        if etag:
+            headers = {**(headers or {}), "If-None-Match": etag}
+        generation = cache.generation(url)
+        api_response = await self._call("GET", url, headers)
+        if api_response.status_code == 304 and etag:
+            entry = cache.revalidate(key)
+            if entry is not None:
+                return APIResponse(
+                    entry.status_code,
+                    entry.content,
+                    entry.headers,
+                    api_response.elapsed,
+                    api_response.connect_time,
+                    entry.encoding,
+                )
+        cache.store(
+            key,
+            api_response.status_code,
+            api_response.content,
+            api_response.headers,
+            api_response.encoding,
+            generation,
+        )
+        return api_response
+
+    async def _call(self, method, url, headers, payload=None):
+        """Execute a call through its endpoint's circuit breaker and the rate limiter, retrying like APIRequest."""
+        breaker = CircuitBreakers.for_url(url)
+        retry = 0
+        waited = 0.0
+        while True:
+            breaker.before_call()
+            try:
+                if self.limiter is not None:
+                    wait = self.limiter.reserve(url)
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    waited += wait
+                api_response = await self._attempt(method, url, headers, payload)
+            except TRANSIENT_ERRORS as error:
+                breaker.record_failure()
+                if not self.retry.retries(method, retry, error=error):
+                    if retry:
+                        breaker.record_exhausted()
+                    raise
+                wait = self.retry.delay(retry)
+            except BaseException:
+                # No verdict on the endpoint's health, but a half-open trial must not stay taken
+                breaker.release_trial()
+                raise
+            else:
+                status = api_response.status_code
+                if status == 429 or status >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if not self.retry.retries(method, retry, status):
+                    if retry and status in self.retry.statuses:
+                        breaker.record_exhausted()
+                    api_response.rate_limit_wait = waited
+                    return api_response
+                wait = self.retry.delay(retry, api_response.headers.get("Retry-After"))
+            retry += 1
+            breaker.record_retry()
+            await asyncio.sleep(wait)
+
+    async def _attempt(self, method, url, headers, payload=None):
+        """Log, time and execute one HTTP call and convert the response."""
+        Logger.add_request(url, method=method, body=payload, headers=headers)
+        prepared = requests.Request(method, url, headers=headers, data=payload).prepare()
+        started = time.perf_counter()
+        response, connect_time = await self.pool.send(prepared, self.timeout)
+        elapsed = time.perf_counter() - started
+
+        LatencyRecorder.record(url, elapsed)
+        Logger.add_response(response, elapsed=elapsed, connect_time=connect_time)
+        return APIRequest.get_responses(response, elapsed, connect_time)
@@ -0,0 +1,215 @@
+import asyncio
+import ssl
+import time
+import weakref
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.exceptions import NewConnectionError
+
+from config import ASYNC_MAX_CONNECTIONS, HTTP_CONNECT_TIMEOUT, HTTP_KEEP_ALIVE, HTTP_READ_TIMEOUT
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+@dataclass
+class _Connection:
+    """One open stream pair to an origin."""
+
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+
+    def close(self):
+        """Close the socket without waiting for the peer."""
+        self.writer.close()
+
+
+@dataclass
+class _LoopPool:
+    """Connections and in-flight limit of one event loop; asyncio objects cannot be shared between loops."""
+
+    slots: asyncio.Semaphore
+    idle: dict = field(default_factory=dict)
+
+
+class AsyncConnectionPool:
+    """Non-blocking HTTP/1.1 client on asyncio streams with keep-alive connections per origin.
+
+    A call waiting for its answer holds a connection but no thread, so one
+    event loop keeps up to ``max_connections`` calls in flight; further
+    calls wait for a free slot. Answered connections are kept for reuse
+    unless keep-alive is off or the server closes them. Responses are
+    returned as ``requests.Response`` objects, so the logs and response
+    conversion of the synchronous stack apply unchanged. Failures raise the
+    same exceptions as requests: ConnectTimeout, ReadTimeout and
+    ConnectionError, which wraps NewConnectionError when no connection
+    could be opened.
+    """
+
+    def __init__(
+        self,
+        max_connections=ASYNC_MAX_CONNECTIONS,
+        keep_alive=HTTP_KEEP_ALIVE,
+        ssl_context=None,
+    ):
+        """Allow max_connections calls in flight per event loop, reusing connections when keep_alive is on."""
+        if max_connections < 1:
+            raise ValueError("max_connections must be at least 1")
+        self.max_connections = max_connections
+        self.keep_alive = keep_alive
+        self.ssl_context = ssl_context
+        self._pools = weakref.WeakKeyDictionary()
+
+    def _pool(self):
+        """Return the connections and slots of the running event loop."""
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            pool = _LoopPool(asyncio.Semaphore(self.max_connections))
+            self._pools[loop] = pool
+        return pool
+
+    def idle_connections(self):
+        """Return how many connections of the running event loop are open and waiting for reuse."""
+        return sum(len(connections) for connections in self._pool().idle.values())
+
+    async def send(self, prepared, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)):
+        """Send a prepared request and return (response, seconds spent opening a connection).
+
+        timeout is (connect, read): opening the connection and receiving the
+        whole answer each have to finish within their limit.
+        """
+        connect_timeout, read_timeout = timeout
+        parts = urlsplit(prepared.url)
+        origin = (parts.scheme, parts.hostname, parts.port or DEFAULT_PORTS[parts.scheme])
+        pool = self._pool()
+        async with pool.slots:
+            connection, connect_time = await self._acquire(pool, origin, connect_timeout)
+            try:
+                response, reusable = await asyncio.wait_for(
+                    self._exchange(connection, prepared, parts.netloc), read_timeout
+                )
+            except TimeoutError as exc:
+                connection.close()
+                raise requests.ReadTimeout(f"No answer from {prepared.url} within {read_timeout}s") from exc
+            except (OSError, asyncio.IncompleteReadError, ValueError) as exc:
+                connection.close()
+                raise requests.ConnectionError(f"Connection to {prepared.url} failed: {exc!r}") from exc
+            except BaseException:
+                # Cancelled mid-exchange: the rest of the answer would be read by the next call
+                connection.close()
+                raise
+            if reusable:
+                pool.idle.setdefault(origin, []).append(connection)
+            else:
+                connection.close()
+        return response, connect_time
+
+    async def aclose(self):
+        """Close the idle connections of the running event loop."""
+        pool = self._pool()
+        connections = [connection for idle in pool.idle.values() for connection in idle]
+        pool.idle.clear()
+        for connection in connections:
+            connection.close()
+        await asyncio.gather(*(connection.writer.wait_closed() for connection in connections), return_exceptions=True)
+
+    async def _acquire(self, pool, origin, connect_timeout):
+        """Return a reusable connection to origin, or open one; also return the seconds spent opening it."""
+        idle = pool.idle.get(origin)
+        while idle:
+            connection = idle.pop()
+            # The server may have closed it while it was idle
+            if not connection.reader.at_eof() and not connection.writer.is_closing():
+                return connection, 0.0
+            connection.close()
+
+        scheme, host, port = origin
+        context = None
+        if scheme == "https":
+            context = self.ssl_context or ssl.create_default_context()
+        started = time.perf_counter()
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=context, server_hostname=host if context else None),
+                connect_timeout,
+            )
+        except TimeoutError as exc:
+            raise requests.ConnectTimeout(f"Connecting to {host}:{port} timed out after {connect_timeout}s") from exc
+        except OSError as exc:
+            raise requests.ConnectionError(
+                NewConnectionError(None, f"Failed to establish a new connection to {host}:{port}: {exc}")
+            ) from exc
+        return _Connection(reader, writer), time.perf_counter() - started
+
+    async def _exchange(self, connection, prepared, host):
+        """Write the request, read the answer and report whether the connection can be reused."""
+        body = prepared.body or b""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        headers = {"Host": host, **prepared.headers}
+        headers.pop("Content-Length", None)
+        if body or prepared.method not in ("GET", "HEAD"):
+            headers["Content-Length"] = str(len(body))
+        if not self.keep_alive:
+            headers["Connection"] = "close"
+        head = f"{prepared.method} {prepared.path_url} HTTP/1.1\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        connection.writer.write(head.encode("latin-1") + b"\r\n" + body)
+        await connection.writer.drain()
+
+        reader = connection.reader
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("server closed the connection without answering")
+        version, status, *reason = status_line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+        response_headers = CaseInsensitiveDict()
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            name, value = name.strip(), value.strip()
+            response_headers[name] = f"{response_headers[name]}, {value}" if name in response_headers else value
+
+        status_code = int(status)
+        framed = True
+        if prepared.method == "HEAD" or status_code in (204, 304) or status_code < 200:
+            content = b""
+        elif "chunked" in response_headers.get("Transfer-Encoding", "").lower():
+            content = await _read_chunked(reader)
+        elif "Content-Length" in response_headers:
+            content = await reader.readexactly(int(response_headers["Content-Length"]))
+        else:
+            # Delimited by the server closing the connection
+            content = await reader.read()
+            framed = False
+
+        response = requests.Response()
+        response.status_code = status_code
+        response.reason = reason[0] if reason else ""
+        response.headers = response_headers
+        response._content = content
+        response.encoding = get_encoding_from_headers(response_headers)
+        response.url = prepared.url
+        response.request = prepared
+        reusable = (
+            framed
+            and self.keep_alive
+            and version == "HTTP/1.1"
+            and response_headers.get("Connection", "").lower() != "close"
+        )
+        return response, reusable
+
+
+async def _read_chunked(reader):
+    """Return a chunked transfer-encoded body, trailers discarded."""
+    chunks = []
+    while True:
+        size = int((await reader.readline()).split(b";", 1)[0], 16)
+        if size == 0:
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
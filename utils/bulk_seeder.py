@@ -0,0 +1,95 @@
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+
+from config import SEED_CONCURRENCY, SEED_STREAM_WINDOW
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PhaseTiming:
+    """Wall-clock statistics for one seeding phase."""
+
+    phase: str
+    count: int
+    elapsed: float
+
+    @property
+    def rate(self):
+        """Return entities processed per second."""
+        return self.count / self.elapsed if self.elapsed else 0.0
+
+
+class BulkSeeder:
+    """Issue entity-creation calls concurrently while preserving input order."""
+
+    timings = []
+
+    def __init__(self, max_workers=SEED_CONCURRENCY, record_timings=True):
+        """Set how many calls may be in flight at once and whether phases count in the seeding summary."""
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.record_timings = record_timings
+
+    def run(self, phase, call, items):
+        """Return call(item) for every item, in the order of items.
+
+        API clients keep no per-call state, so call is usually a bound method
+        of one client shared by every worker thread, e.g. Users().create_user.
+        """
+        items = list(items)
+        return [result for _, result in self.stream(phase, call, items, window=max(len(items), 1))]
+
+    def stream(self, phase, call, items, window=SEED_STREAM_WINDOW):
+        """Yield (item, call(item)) pairs in the order of items, consuming items lazily.
+
+        At most window items are pulled from items and held in flight at once,
+        so a generator of any length is seeded in bounded memory. The phase
+        timing is recorded when the stream is exhausted or closed.
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        items = iter(items)
+        started = time.perf_counter()
+        count = 0
+        workers = min(self.max_workers, window)
+        try:
+            if workers <= 1:
+                for item in items:
+                    result = call(item)
+                    count += 1
+                    yield item, result
+                return
+
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"seed-{phase}") as executor:
+                pending = deque((item, executor.submit(call, item)) for item in islice(items, window))
+                while pending:
+                    item, future = pending.popleft()
+                    for next_item in islice(items, 1):
+                        pending.append((next_item, executor.submit(call, next_item)))
+                    result = future.result()
+                    count += 1
+                    yield item, result
+        finally:
+            timing = PhaseTiming(phase, count, time.perf_counter() - started)
+            if self.record_timings:
+                BulkSeeder.timings.append(timing)
+            logger.info(
+                f"Seeding phase '{phase}': {timing.count} call(s) in {timing.elapsed:.3f}s "
+                f"({timing.rate:.1f}/s, {workers} worker(s))"
+            )
+
+    @classmethod
+    def summary(cls):
+        """Aggregate recorded timings per phase as {phase: PhaseTiming}."""
+        totals = {}
+        for timing in cls.timings:
+            total = totals.setdefault(timing.phase, PhaseTiming(timing.phase, 0, 0.0))
+            total.count += timing.count
+            total.elapsed += timing.elapsed
+        return totals
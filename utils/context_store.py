@@ -0,0 +1,143 @@
+from utils.models import Cart, Product, Record, User
+
+USERS = "usuarios"
+PRODUCTS = "produtos"
+PRODUCT_IDS = "produto_ids"
+CARTS = "carrinhos"
+MODELS = {USERS: User, PRODUCTS: Product, CARTS: Cart}
+
+
+class EntityIndex:
+    """Lookup tables over one entity list: by _id, by email and the admin subset."""
+
+    def __init__(self, records: list):
+        """Index every record of records, the list the context holds."""
+        self.records = records
+        self.by_id = {}
+        self.by_email = {}
+        self.admins = []
+        self.size = 0
+        self.extend(records)
+
+    def extend(self, new_records):
+        """Index records just appended to the indexed list."""
+        for record in new_records:
+            if "_id" in record:
+                self.by_id[record["_id"]] = record
+            if "email" in record:
+                self.by_email[record["email"]] = record
+            if record.get("administrador") == "true":
+                self.admins.append(record)
+        self.size = len(self.records)
+
+    def is_current(self, records):
+        """Report whether this index still describes records."""
+        return records is self.records and len(records) == self.size
+
+
+class ContextStore(dict):
+    """Fixture context with O(1) lookups of users, products and carts.
+
+    It is a plain dict of entity lists (``usuarios``, ``produtos``,
+    ``carrinhos``, ...), so existing ``get``/``update`` code keeps working.
+    Entities added through ``add_*`` are stored as slotted models
+    (utils.models) that read and write like dicts, and the per-key lookup
+    indexes are extended incrementally; assigning a key drops its index,
+    which is rebuilt on the next lookup.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Create the context from dict arguments."""
+        super().__init__(*args, **kwargs)
+        self._indexes = {}
+
+    def __setitem__(self, key, value):
+        """Store value and drop the stale index of key."""
+        super().__setitem__(key, value)
+        self._indexes.pop(key, None)
+
+    def __delitem__(self, key):
+        """Remove key and its index."""
+        super().__delitem__(key)
+        self._indexes.pop(key, None)
+
+    def update(self, *args, **kwargs):
+        """Store every given key, dropping their indexes."""
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def pop(self, key, *default):
+        """Remove key and its index and return its value."""
+        self._indexes.pop(key, None)
+        return super().pop(key, *default)
+
+    def clear(self):
+        """Remove every key and index."""
+        super().clear()
+        self._indexes.clear()
+
+    def _index(self, key) -> EntityIndex:
+        """Return an up-to-date index of the list under key."""
+        records = self.get(key)
+        if records is None:
+            records = []
+        index = self._indexes.get(key)
+        if index is None or not index.is_current(records):
+            index = self._indexes[key] = EntityIndex(records)
+        return index
+
+    def _add(self, key, records):
+        """Append records to the list under key as slotted models and index them."""
+        records = [record if isinstance(record, Record) else MODELS[key].from_dict(record) for record in records]
+        if self.get(key) is None:
+            self[key] = []
+        index = self._index(key)
+        index.records.extend(records)
+        index.extend(records)
+
+    def add_users(self, users):
+        """Append created users."""
+        self._add(USERS, users)
+
+    def add_products(self, products):
+        """Append created products and their ids."""
+        self._add(PRODUCTS, products)
+        if self.get(PRODUCT_IDS) is None:
+            self[PRODUCT_IDS] = []
+        self[PRODUCT_IDS].extend(product["_id"] for product in products)
+
+    def add_carts(self, carts):
+        """Append created carts."""
+        self._add(CARTS, carts)
+
+    def user(self, user_id) -> User:
+        """Return the user with user_id."""
+        user = self._index(USERS).by_id.get(user_id)
+        if user is None:
+            raise ValueError(f"User with id {user_id} not found")
+        return user
+
+    def user_by_email(self, email) -> User:
+        """Return the user registered with email."""
+        user = self._index(USERS).by_email.get(email)
+        if user is None:
+            raise ValueError(f"User with email {email} not found")
+        return user
+
+    def admins(self) -> list:
+        """Return the admin users."""
+        return list(self._index(USERS).admins)
+
+    def product(self, product_id) -> Product:
+        """Return the product with product_id."""
+        product = self._index(PRODUCTS).by_id.get(product_id)
+        if product is None:
+            raise ValueError(f"Product with id {product_id} not found")
+        return product
+
+    def cart(self, cart_id) -> Cart:
+        """Return the cart with cart_id."""
+        cart = self._index(CARTS).by_id.get(cart_id)
+        if cart is None:
+            raise ValueError(f"Cart with id {cart_id} not found")
+        return cart
@@ -2,163 +2,217 @@ import random
 
 from faker import Faker
 
+from config import DATA_BATCH_SIZE
+from utils.batch_faker import BatchFaker
 from utils.file_manager import FileManager
+from utils.inventory_sampler import InventorySampler
+from utils.unique_index import SequenceIndex, UniqueIndex, email_variant, name_variant
 
+rng = random.Random()
 fake = Faker()
+batch_fake = BatchFaker(fake, rng)
 
 
 class DataGenerator:
-    """Generate fake ServeRest fixtures for users, products, and carts."""
+    """Generate fake ServeRest fixtures for users, products, and carts.
+
+    Users and products are drawn in batches from pre-sampled Faker pools
+    (utils.batch_faker); ``fake_*`` builds a single record the slower
+    per-call way. ``iter_*`` methods yield records lazily, so datasets of
+    any size can be streamed (see utils.stream_seed). ``generate_*`` methods
+    return whole lists for fixtures; with DATA_SNAPSHOT enabled a copy is
+    also saved to tests/data in the background for debugging.
+
+    All randomness comes from one generator that ``seed`` makes
+    reproducible. Batched emails and product names are unique within the
+    process: a repeat gets a numbered variant instead of a server conflict.
+    Processes generating for the same server at once (pytest-xdist workers)
+    each pass their own ``namespace`` to ``seed``; it is added to every
+    email and product name, so their values never collide either. The
+    claimed values are kept in memory; ``seed(..., sequential=True)``
+    numbers every value instead, for streams of millions of records.
+    """
+
+    seed_value = None
+    namespace = None
+    emails = UniqueIndex(email_variant)
+    product_names = UniqueIndex(name_variant)
+
+    @staticmethod
+    def seed(value=None, namespace=None, sequential=False):
+        """Make generation reproducible from value (a fresh random one when None) and return it.
+
+        Claimed emails and product names are forgotten, so the same seed
+        yields the same records again. namespace, e.g. an xdist worker id,
+        is appended to every email's local part and product name. With
+        sequential, every email and product name gets a running number
+        instead of being remembered, so memory stays flat however many
+        records are generated.
+        """
+        if value is None:
+            value = random.SystemRandom().randrange(2**32)
+        rng.seed(value)
+        fake.seed_instance(value)
+        index = SequenceIndex if sequential else UniqueIndex
+        DataGenerator.emails = index(email_variant)
+        DataGenerator.product_names = index(name_variant)
+        DataGenerator.seed_value = value
+        DataGenerator.namespace = namespace
+        return value
+
+    @staticmethod
+    def fake_user_data(is_admin):
+        """Return one user payload built with per-call Faker methods (reference path for benchmarks)."""
+        return {
+            "nome": fake.name(),
+            "email": fake.email(),
+            "password": fake.password(),
+            "administrador": str(is_admin).lower(),
+        }
+
+    @staticmethod
+    def fake_product_data():
+        """Return one product payload built with per-call Faker methods (reference path for benchmarks)."""
+        return {
+            "nome": fake.catch_phrase(),
+            "preco": rng.randint(100, 1000),
+            "descricao": fake.catch_phrase(),
+            "quantidade": rng.randint(10, 100),
+        }
+
+    @staticmethod
+    def batch_user_data(num_users, first_is_admin=True):
+        """Return num_users user payloads built in one batch; about one in five is an admin."""
+        people = batch_fake.people(num_users)
+        passwords = batch_fake.passwords(num_users)
+        admins = batch_fake.flags(0.2, num_users)
+        namespace = DataGenerator.namespace
+        if first_is_admin and admins:
+            admins[0] = True
+        return [
+            {
+                "nome": name,
+                "email": DataGenerator.emails.claim(email_variant(email, namespace) if namespace else email),
+                "password": password,
+                "administrador": "true" if is_admin else "false",
+            }
+            for (name, email), password, is_admin in zip(people, passwords, admins, strict=True)
+        ]
+
+    @staticmethod
+    def batch_product_data(num_products):
+        """Return num_products product payloads built in one batch."""
+        names = batch_fake.catch_phrases(num_products)
+        descriptions = batch_fake.catch_phrases(num_products)
+        prices = batch_fake.integers(100, 1000, num_products)
+        quantities = batch_fake.integers(10, 100, num_products)
+        namespace = DataGenerator.namespace
+        return [
+            {
+                "nome": DataGenerator.product_names.claim(name_variant(name, namespace) if namespace else name),
+                "preco": price,
+                "descricao": description,
+                "quantidade": quantity,
+            }
+            for name, price, description, quantity in zip(names, prices, descriptions, quantities, strict=True)
+        ]
+
+    @staticmethod
+    def iter_user_data(num_users, batch_size=DATA_BATCH_SIZE):
+        """Yield num_users user payloads, generated batch_size at a time; the first one is always an admin."""
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        for start in range(0, num_users, batch_size):
+            yield from DataGenerator.batch_user_data(min(batch_size, num_users - start), first_is_admin=start == 0)
+
+    @staticmethod
+    def iter_product_data(num_products, batch_size=DATA_BATCH_SIZE):
+        """Yield num_products product payloads, generated batch_size at a time."""
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        for start in range(0, num_products, batch_size):
+            yield from DataGenerator.batch_product_data(min(batch_size, num_products - start))
+
+    @staticmethod
+    def iter_cart_data(product_ids, products_quantity, num_carts, max_products_per_cart, max_quantity_per_product):
+        """Yield num_carts cart payloads, reserving stock in products_quantity as they are produced.
+
+        Each cart costs O(products in the cart), independent of the catalogue size.
+        """
+        if not product_ids:
+            raise ValueError("product_ids cannot be empty")
+        if not products_quantity:
+            raise ValueError("products_quantity cannot be empty")
+
+        inventory = InventorySampler(product_ids, products_quantity, rng)
+        for _ in range(num_carts):
+            num_products = min(rng.randint(1, max_products_per_cart), len(product_ids))
+            products = []
+
+            for product_id in inventory.sample(num_products):
+                available_quantity = products_quantity[product_id]
+                quantity_cap = min(max_quantity_per_product, available_quantity)
+                quantity = rng.randint(1, quantity_cap)
+
+                products.append({"idProduto": product_id, "quantidade": quantity})
+                inventory.reserve(product_id, quantity)
+
+            yield {"produtos": products}
 
     @staticmethod
     def generate_user_data_for_create(num_users):
-        """Create user payloads for POST scenarios."""
+        """Return {"usuarios": [...]} payloads for POST scenarios."""
         file_name = "create_user_data.json"
-        users = []
-
-        num_admins = 0
-
-        for _ in range(num_users):
-            if num_admins == 0 or random.random() < 0.2:
-                is_admin = True
-                num_admins += 1
-            else:
-                is_admin = False
-
-            users.append(
-                {
-                    "nome": fake.name(),
-                    "email": fake.email(),
-                    "password": fake.password(),
-                    "administrador": str(is_admin).lower(),
-                }
-            )
-
-        if num_admins == 0:
-            if not users:
-                raise ValueError("Cannot set admin: users list is empty")
-            random_user = random.choice(users)
-            random_user["administrador"] = "true"
+        users = list(DataGenerator.iter_user_data(num_users))
+        if not users:
+            raise ValueError("Cannot set admin: users list is empty")
 
         data = {"usuarios": users}
 
-        FileManager.clear_file(file_name)
-        FileManager.update_file(file_name, data)
+        FileManager.snapshot(file_name, data)
+        return data
 
     @staticmethod
     def generate_user_data_for_update(num_users):
-        """Create user payloads for PUT scenarios."""
+        """Return {"usuarios": [...]} payloads for PUT scenarios."""
         file_name = "update_user_data.json"
-        users = []
-
-        num_admins = 0
-
-        for _ in range(num_users):
-            if num_admins == 0 or random.random() < 0.2:
-                is_admin = True
-                num_admins += 1
-            else:
-                is_admin = False
-
-            users.append(
-                {
-                    "nome": fake.name(),
-                    "email": fake.email(),
-                    "password": fake.password(),
-                    "administrador": str(is_admin).lower(),
-                }
-            )
-
-        if num_admins == 0:
-            if not users:
-                raise ValueError("Cannot set admin: users list is empty")
-            random_user = random.choice(users)
-            random_user["administrador"] = "true"
+        users = list(DataGenerator.iter_user_data(num_users))
+        if not users:
+            raise ValueError("Cannot set admin: users list is empty")
 
         data = {"usuarios": users}
 
-        FileManager.clear_file(file_name)
-        FileManager.update_file(file_name, data)
+        FileManager.snapshot(file_name, data)
+        return data
 
     @staticmethod
     def generate_product_data_for_create(num_products):
-        """Create product payloads for POST scenarios."""
+        """Return {"produtos": [...]} payloads for POST scenarios."""
         file_name = "create_product_data.json"
-        products = []
-
-        for _ in range(num_products):
-            products.append(
-                {
-                    "nome": fake.catch_phrase(),
-                    "preco": random.randint(100, 1000),
-                    "descricao": fake.catch_phrase(),
-                    "quantidade": random.randint(10, 100),
-                }
-            )
+        data = {"produtos": list(DataGenerator.iter_product_data(num_products))}
 
-        data = {"produtos": products}
-
-        FileManager.clear_file(file_name)
-        FileManager.update_file(file_name, data)
+        FileManager.snapshot(file_name, data)
+        return data
 
     @staticmethod
     def generate_product_data_for_update(num_products):
-        """Create product payloads for PUT scenarios."""
+        """Return {"produtos": [...]} payloads for PUT scenarios."""
         file_name = "update_product_data.json"
-        products = []
-
-        for _ in range(num_products):
-            products.append(
-                {
-                    "nome": fake.catch_phrase(),
-                    "preco": random.randint(100, 1000),
-                    "descricao": fake.catch_phrase(),
-                    "quantidade": random.randint(10, 100),
-                }
-            )
-
-        data = {"produtos": products}
+        data = {"produtos": list(DataGenerator.iter_product_data(num_products))}
 
-        FileManager.clear_file(file_name)
-        FileManager.update_file(file_name, data)
+        FileManager.snapshot(file_name, data)
+        return data
 
     @staticmethod
     def generate_cart_data_for_create(
         product_ids, products_quantity, num_carts, max_products_per_cart, max_quantity_per_product
     ):
-        """Create cart payloads constrained by available inventory."""
-        if not product_ids:
-            raise ValueError("product_ids cannot be empty")
-        if not products_quantity:
-            raise ValueError("products_quantity cannot be empty")
-
+        """Return {"carrinhos": [...]} payloads constrained by available inventory."""
         file_name = "create_cart_data.json"
-        carts = []
-
-        for _ in range(num_carts):
-            num_products = min(random.randint(1, max_products_per_cart), len(product_ids))
-            products = []
-            available_products = [product_id for product_id in product_ids if products_quantity.get(product_id, 0) > 0]
-
-            random.shuffle(available_products)
-            available_products = available_products[:num_products]
-
-            for product_id in available_products:
-                available_quantity = products_quantity.get(product_id, 0)
-                quantity_cap = min(max_quantity_per_product, available_quantity)
-                quantity = min(
-                    random.randint(1, quantity_cap),
-                    max_quantity_per_product,
-                )
-
-                product = {"idProduto": product_id, "quantidade": quantity}
-                products.append(product)
-                products_quantity[product_id] -= quantity
-
-            cart = {"produtos": products}
-            carts.append(cart)
-
-        data = {"carrinhos": carts}
+        carts = DataGenerator.iter_cart_data(
+            product_ids, products_quantity, num_carts, max_products_per_cart, max_quantity_per_product
+        )
+        data = {"carrinhos": list(carts)}
 
-        FileManager.clear_file(file_name)
-        FileManager.update_file(file_name, data)
+        FileManager.snapshot(file_name, data)
+        return data
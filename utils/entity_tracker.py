@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from config import TOKEN_TTL
+from utils.serializer import loads
+
+CLOSE_CART_ROUTES = ("concluir-compra", "cancelar-compra")
+
+
+class EntityTracker:
+    """Remember every user, product and cart created through APIRequest.
+
+    ``APIRequest`` reports each answered write to the active tracker: a 201
+    from POST /usuarios, /produtos or /carrinhos records the new entity
+    with its API address, the Authorization token that created it and,
+    when that token came from a POST /login seen by the tracker, the
+    credentials behind it, so a teardown can log the owner in again once
+    the token has expired. Logins are remembered for TOKEN_TTL seconds, as
+    long as their token can create anything, so a load test logging in
+    constantly does not pile them up. A successful delete, checkout or
+    cancel forgets the entity. ``drain`` hands the remaining entities to a teardown
+    (services.serverest_api.teardown).
+    """
+
+    _active = None
+
+    def __init__(self, login_ttl=TOKEN_TTL, clock=time.monotonic):
+        """Start with nothing tracked; logins are remembered for login_ttl seconds."""
+        self.login_ttl = login_ttl
+        self.clock = clock
+        self._logins = {}
+        self._login_order = deque()
+        self._users = {}
+        self._products = {}
+        self._carts = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def activate(cls, tracker=None):
+        """Make tracker (default: a new one) the one APIRequest reports to and return it."""
+        cls._active = tracker if tracker is not None else cls()
+        return cls._active
+
+    @classmethod
+    def active(cls):
+        """Return the tracker APIRequest reports to, or None when tracking is off."""
+        return cls._active
+
+    @classmethod
+    def deactivate(cls):
+        """Stop tracking and return the tracker that was active."""
+        tracker, cls._active = cls._active, None
+        return tracker
+
+    def observe(self, method, url, headers, response, payload=None):
+        """Record or forget the entity an answered write created or removed, or the credentials of a login."""
+        if response.status_code not in (200, 201):
+            return
+        parts = urlsplit(url)
+        base = f"{parts.scheme}://{parts.netloc}"
+        resource, _, record_id = parts.path.strip("/").partition("/")
+        token = (headers or {}).get("Authorization")
+        with self._lock:
+            if method == "POST" and resource == "login" and response.status_code == 200 and payload:
+                authorization = response.as_dict.get("authorization")
+                body = loads(payload) if isinstance(payload, (bytes, str)) else payload
+                if authorization:
+                    self._remember_login((base, authorization), {"email": body["email"], "password": body["password"]})
+            elif method == "POST" and response.status_code == 201 and not record_id:
+                created = response.as_dict.get("_id")
+                credentials = self._logins.get((base, token))
+                if created and resource == "usuarios":
+                    self._users[(base, created)] = None
+                elif created and resource == "produtos":
+                    self._products[(base, created)] = (token, credentials)
+                elif created and resource == "carrinhos":
+                    self._carts[self._owner(base, token)] = (token, credentials)
+            elif method == "DELETE" and resource == "usuarios" and record_id:
+                self._users.pop((base, record_id), None)
+            elif method == "DELETE" and resource == "produtos" and record_id:
+                self._products.pop((base, record_id), None)
+            elif method == "DELETE" and resource == "carrinhos" and record_id in CLOSE_CART_ROUTES:
+                self._carts.pop(self._owner(base, token), None)
+
+    def forget(self, base_uri):
+        """Drop every entity of base_uri, e.g. once a local fake server has been stopped."""
+        base_uri = base_uri.rstrip("/")
+        with self._lock:
+            for entities in (self._logins, self._users, self._products, self._carts):
+                for key in [key for key in entities if key[0] == base_uri]:
+                    del entities[key]
+
+    def counts(self):
+        """Return how many (users, products, carts) are tracked."""
+        with self._lock:
+            return len(self._users), len(self._products), len(self._carts)
+
+    def drain(self):
+        """Return and forget everything tracked as (carts, products, users).
+
+        carts are (base_uri, owner token, owner credentials), products
+        ((base_uri, _id), creator token, creator credentials) and users
+        (base_uri, _id), each in creation order; credentials are None when
+        the token's login was not seen.
+        """
+        with self._lock:
+            carts = [(base, token, credentials) for (base, _), (token, credentials) in self._carts.items()]
+            products = [(key, token, credentials) for key, (token, credentials) in self._products.items()]
+            users = list(self._users)
+            self._logins, self._users, self._products, self._carts = {}, {}, {}, {}
+            self._login_order.clear()
+        return carts, products, users
+
+    def _remember_login(self, key, credentials):
+        """Map a token to its credentials and drop logins older than login_ttl; the caller holds the lock."""
+        now = self.clock()
+        while self._login_order and self._login_order[0][0] <= now - self.login_ttl:
+            self._logins.pop(self._login_order.popleft()[1], None)
+        self._logins[key] = credentials
+        self._login_order.append((now, key))
+
+    def _owner(self, base, token):
+        """Return the key of the cart token's user: their email when their login was seen, else the token."""
+        credentials = self._logins.get((base, token))
+        return base, credentials["email"] if credentials else token
@@ -1,11 +1,80 @@
+import atexit
 import json
+import logging
+import os
+import threading
 from pathlib import Path
 
+from config import DATA_SNAPSHOT
+
 BASE_PATH = Path.cwd() / "tests" / "data"
 
+logger = logging.getLogger(__name__)
+
+
+def data_dir() -> Path:
+    """Return this process's data directory: tests/data, or tests/data/<worker id> under pytest-xdist."""
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    return BASE_PATH / worker if worker else BASE_PATH
+
+
+class SnapshotWriter:
+    """Write JSON snapshots from a background thread.
+
+    Only the newest pending snapshot of each file is kept, so a burst of
+    regenerations costs one write per file rather than one per call.
+    """
+
+    def __init__(self):
+        """Start the writer thread and flush pending snapshots at interpreter exit."""
+        self._pid = os.getpid()
+        self._pending = {}
+        self._busy = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="data-snapshot", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def submit(self, file_path: Path, text: str):
+        """Queue text to replace file_path, superseding any unwritten snapshot of it."""
+        with self._condition:
+            self._pending[file_path] = text
+            self._condition.notify_all()
+
+    def flush(self):
+        """Block until every queued snapshot is on disk; a no-op in a forked child, which has no writer thread."""
+        if os.getpid() != self._pid:
+            return
+        with self._condition:
+            self._condition.wait_for(lambda: not self._pending and not self._busy)
+
+    def _run(self):
+        """Write queued snapshots one at a time."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                file_path, text = self._pending.popitem()
+                self._busy = True
+            try:
+                FileManager.write_text(file_path, text)
+            except OSError as exc:
+                logger.warning(f"Could not write data snapshot {file_path}: {exc}")
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
 
 class FileManager:
-    """Utility helpers for reading and writing JSON fixtures."""
+    """Utility helpers for reading and writing JSON fixtures.
+
+    Under pytest-xdist every worker reads and writes its own copy of each
+    file, so parallel workers never clobber each other's generated data.
+    """
+
+    _snapshot_writer = None
+    _snapshot_pid = None
+    _snapshot_lock = threading.Lock()
 
     @staticmethod
     def read_file(file_name: str) -> dict:
@@ -31,20 +100,101 @@ class FileManager:
             json_data = {}
 
         json_data.update(data)
-        with open(file_path, mode="w", encoding="utf-8") as file:
-            json.dump(json_data, file, indent=4)
+        FileManager.write_json(file_path, json_data)
 
     @staticmethod
     def clear_file(file_name):
         """Overwrite the target JSON file with an empty object."""
         file_path = FileManager.get_file_with_json_ext(file_name)
-        json_data = {}
-        with open(file_path, mode="w", encoding="utf-8") as file:
-            json.dump(json_data, file, indent=4)
+        FileManager.write_json(file_path, {})
+
+    @classmethod
+    def snapshot(cls, file_name, data):
+        """Save data to file_name in the background when DATA_SNAPSHOT is on.
+
+        data is encoded right away, so later changes to it (ids, tokens) are
+        not part of the snapshot; the disk write happens off the caller's thread.
+        """
+        if not DATA_SNAPSHOT:
+            return
+        text = json.dumps(data, ensure_ascii=False)
+        cls._get_snapshot_writer().submit(cls.get_file_with_json_ext(file_name), text)
+
+    @classmethod
+    def flush_snapshots(cls):
+        """Block until queued snapshots of this process are written."""
+        if cls._snapshot_writer is not None and cls._snapshot_pid == os.getpid():
+            cls._snapshot_writer.flush()
+
+    @classmethod
+    def _get_snapshot_writer(cls) -> SnapshotWriter:
+        """Return this process's snapshot writer, creating it on first use or after a fork."""
+        if cls._snapshot_writer is None or cls._snapshot_pid != os.getpid():
+            with cls._snapshot_lock:
+                if cls._snapshot_writer is None or cls._snapshot_pid != os.getpid():
+                    cls._snapshot_writer = SnapshotWriter()
+                    cls._snapshot_pid = os.getpid()
+        return cls._snapshot_writer
+
+    @staticmethod
+    def write_json(file_path: Path, data):
+        """Replace file_path with data as indented JSON, atomically."""
+        FileManager.write_text(file_path, json.dumps(data, indent=4))
+
+    @staticmethod
+    def write_text(file_path: Path, text: str):
+        """Replace file_path with text atomically, so readers never see a half-written file."""
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, mode="w", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(tmp_path, file_path)
+
+    @staticmethod
+    def write_ndjson(file_name, records) -> int:
+        """Write records to file_name as newline-delimited JSON, one at a time, and return the count.
+
+        records may be any iterable, including a generator, so the dataset is
+        never held in memory; the file is replaced atomically once complete.
+        """
+        file_path = FileManager.get_file_with_ndjson_ext(file_name)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        count = 0
+        try:
+            with open(tmp_path, mode="w", encoding="utf-8") as file:
+                for record in records:
+                    file.write(json.dumps(record, ensure_ascii=False))
+                    file.write("\n")
+                    count += 1
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        os.replace(tmp_path, file_path)
+        return count
+
+    @staticmethod
+    def read_ndjson(file_name):
+        """Yield records from a newline-delimited JSON file one line at a time."""
+        file_path = FileManager.get_file_with_ndjson_ext(file_name)
+        if not file_path.is_file():
+            raise FileNotFoundError(f"File {file_name} not found at {file_path}. Ensure the file is created first.")
+        with open(file_path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+    @staticmethod
+    def get_file_with_ndjson_ext(file_name) -> Path:
+        """Return the path for an NDJSON file; absolute paths and paths with a directory are used as given."""
+        file_path = Path(file_name)
+        if file_path.suffix != ".ndjson":
+            file_path = file_path.with_name(file_path.name + ".ndjson")
+        return file_path if file_path.parent != Path(".") else data_dir() / file_path
 
     @staticmethod
     def get_file_with_json_ext(file_name: str) -> Path:
-        """Return the canonical path under tests/data for the given name."""
+        """Return the canonical path in this process's data directory for the given name."""
         if not file_name.endswith(".json"):
             file_name += ".json"
-        return BASE_PATH / file_name
+        return data_dir() / file_name
@@ -0,0 +1,48 @@
+import random
+
+
+class InventorySampler:
+    """Draw distinct in-stock product ids and reserve their stock.
+
+    In-stock ids live in an array with a position index. Sampling k ids is a
+    partial Fisher-Yates shuffle of the array's first k slots (O(k)), and an
+    id whose stock reaches zero is swap-removed with the last slot (O(1)), so
+    composing a cart never scans the whole catalogue.
+    """
+
+    def __init__(self, product_ids, products_quantity, rng=None):
+        """Track ids from product_ids with stock in products_quantity, which reserve() updates in place."""
+        self.products_quantity = products_quantity
+        self.rng = rng or random
+        self._in_stock = [
+            product_id for product_id in dict.fromkeys(product_ids) if products_quantity.get(product_id, 0) > 0
+        ]
+        self._positions = {product_id: position for position, product_id in enumerate(self._in_stock)}
+
+    def __len__(self):
+        """Return how many products are still in stock."""
+        return len(self._in_stock)
+
+    def sample(self, k):
+        """Return up to k distinct in-stock product ids in random order."""
+        in_stock = self._in_stock
+        positions = self._positions
+        k = min(k, len(in_stock))
+        for position in range(k):
+            other = self.rng.randrange(position, len(in_stock))
+            if other != position:
+                in_stock[position], in_stock[other] = in_stock[other], in_stock[position]
+                positions[in_stock[position]] = position
+                positions[in_stock[other]] = other
+        return in_stock[:k]
+
+    def reserve(self, product_id, quantity):
+        """Take quantity of product_id out of stock, dropping it from sampling once none is left."""
+        remaining = self.products_quantity[product_id] - quantity
+        self.products_quantity[product_id] = remaining
+        if remaining <= 0 and product_id in self._positions:
+            position = self._positions.pop(product_id)
+            last = self._in_stock.pop()
+            if last != product_id:
+                self._in_stock[position] = last
+                self._positions[last] = position
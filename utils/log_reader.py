@@ -0,0 +1,95 @@
+"""Stream and filter structured request logs written by utils.logger.
+
+Records are read one line at a time, so files of any size can be scanned
+without loading them into memory. Examples::
+
+    python -m utils.log_reader --status 5xx
+    python -m utils.log_reader logs/requests_*.jsonl.gz --test test_carts --min-latency 250 --format table
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from utils.logger import Logger
+from utils.structured_log import open_log
+
+
+def iter_records(paths):
+    """Yield decoded records from every file in order."""
+    for path in paths:
+        with open_log(path, "r") as stream:
+            try:
+                for line in stream:
+                    line = line.strip()
+                    if line:
+                        yield json.loads(line)
+            except EOFError:
+                # A compressed file that is still being written ends mid-stream
+                continue
+
+
+def status_matches(status, expected):
+    """Match a status code against an exact code or a class such as '4xx'."""
+    if expected.lower().endswith("xx"):
+        return status is not None and str(status).startswith(expected[0])
+    return str(status) == expected
+
+
+def matches(record, args):
+    """Return True when a record passes every filter given on the command line."""
+    if args.test and args.test not in (record.get("test") or ""):
+        return False
+    if args.method and record.get("method") != args.method.upper():
+        return False
+    if args.status and not any(status_matches(record.get("status"), status) for status in args.status):
+        return False
+    return not (args.min_latency is not None and (record.get("latency_ms") or 0) < args.min_latency)
+
+
+def format_record(record, output_format):
+    """Render a record as a JSON line or a fixed-width table row."""
+    if output_format == "jsonl":
+        return json.dumps(record, ensure_ascii=False)
+    return (
+        f"{record.get('status')!s:>4} {record.get('latency_ms', 0):>10.1f}ms "
+        f"{record.get('method', ''):<6} {record.get('url', '')}  [{record.get('test') or '-'}]"
+    )
+
+
+def default_paths():
+    """Return structured log files in the logs directory, oldest first."""
+    return sorted(Path(Logger.logs_dir).glob("requests_*.jsonl*"))
+
+
+def main(argv=None):
+    """Parse arguments, stream matching records to stdout and return an exit code."""
+    parser = argparse.ArgumentParser(description="Stream and filter structured request logs.")
+    parser.add_argument("paths", nargs="*", type=Path, help="log files (default: logs/requests_*.jsonl*)")
+    parser.add_argument("--test", help="keep records whose test id contains this text")
+    parser.add_argument("--status", action="append", help="status code or class like 4xx (repeatable)")
+    parser.add_argument("--method", help="HTTP method, e.g. GET")
+    parser.add_argument("--min-latency", type=float, help="keep records at or above this latency in ms")
+    parser.add_argument("--limit", type=int, help="stop after this many matching records")
+    parser.add_argument("--format", choices=("jsonl", "table"), default="jsonl", help="output format")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or default_paths()
+    if not paths:
+        print("No structured log files found.", file=sys.stderr)
+        return 1
+
+    shown = 0
+    for record in iter_records(paths):
+        if not matches(record, args):
+            continue
+        print(format_record(record, args.format))
+        shown += 1
+        if args.limit is not None and shown >= args.limit:
+            break
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
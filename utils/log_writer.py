@@ -0,0 +1,150 @@
+import atexit
+import contextlib
+import queue
+import sys
+import threading
+from pathlib import Path
+
+from config import LOG_BATCH_SIZE, LOG_BUFFER_SIZE, LOG_FLUSH_INTERVAL, LOG_OVERFLOW_POLICY
+
+OVERFLOW_POLICIES = ("block", "drop")
+
+
+class BackgroundLogWriter:
+    """Append log records to a file from a dedicated thread in batches.
+
+    Records are either ready strings or zero-argument callables returning a
+    string; callables are formatted on the writer thread, off the request path.
+    By default records are appended to file_path; stream_factory may supply
+    any other writable text stream, such as a rotating compressed sink.
+
+    A batch that cannot be written (disk full, closed stream, ...) is
+    dropped and counted in ``lost``; the thread reports the error on stderr
+    and keeps draining the buffer, so producers are never left blocked.
+    """
+
+    def __init__(
+        self,
+        file_path,
+        max_buffer=LOG_BUFFER_SIZE,
+        batch_size=LOG_BATCH_SIZE,
+        flush_interval=LOG_FLUSH_INTERVAL,
+        overflow_policy=LOG_OVERFLOW_POLICY,
+        stream_factory=None,
+    ):
+        """Configure the bounded buffer; the thread starts on the first record."""
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {OVERFLOW_POLICIES}, got '{overflow_policy}'")
+
+        self.file_path = Path(file_path)
+        self.stream_factory = stream_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+        self.lost = 0
+        self._queue = queue.Queue(maxsize=max_buffer)
+        self._thread = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def submit(self, record):
+        """Queue a record, blocking or dropping when the buffer is full."""
+        self._ensure_started()
+        if self.overflow_policy == "block":
+            self._queue.put(record)
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def flush(self):
+        """Block until every queued record has been written to disk."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self):
+        """Flush pending records and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def _ensure_started(self):
+        """Start the writer thread on first use."""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        """Drain the queue in batches and append them with a single write."""
+        log_file = None
+        failing = False
+        try:
+            log_file = self._open_stream()
+        except Exception as exc:
+            self._report(f"could not open {self.file_path}", exc)
+            failing = True
+        try:
+            while True:
+                try:
+                    batch = [self._queue.get(timeout=self.flush_interval)]
+                except queue.Empty:
+                    continue
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                try:
+                    if log_file is None:
+                        raise OSError("log stream is not open")
+                    log_file.write("".join(self._format(batch)))
+                    log_file.flush()
+                    failing = False
+                except Exception as exc:
+                    with self._lock:
+                        self.lost += sum(record is not None for record in batch)
+                    # Report once per run of failures, not for every batch of a full disk
+                    if not failing:
+                        self._report(f"could not write to {self.file_path}, dropping records", exc)
+                    failing = True
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if None in batch:
+                    return
+        finally:
+            if log_file is not None:
+                with contextlib.suppress(Exception):
+                    log_file.close()
+
+    @staticmethod
+    def _report(message, exc):
+        """Tell the user about a log write problem; the writer cannot log it itself."""
+        print(f"log-writer: {message}: {exc!r}", file=sys.stderr)
+
+    def _open_stream(self):
+        """Return the text stream records are written to."""
+        if self.stream_factory is not None:
+            return self.stream_factory()
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        return open(self.file_path, "a", encoding="utf-8")
+
+    @staticmethod
+    def _format(batch):
+        """Yield the text of every record in the batch."""
+        for record in batch:
+            if record is None:
+                continue
+            try:
+                yield record() if callable(record) else record
+            except Exception as exc:
+                # A record that fails to format must not stop the writer thread
+                yield f"\n<log record failed to format: {exc!r}>\n"
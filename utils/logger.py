@@ -1,76 +1,185 @@
 import datetime
+import json
 import logging
 import os
 import pathlib
+import threading
+import time
 from pathlib import Path
 
 from requests import Response
 
+from config import STRUCTURED_LOG_ENABLED
+from utils.log_writer import BackgroundLogWriter
+from utils.structured_log import RotatingLogStream
+
 logger = logging.getLogger(__name__)
 
 
 class Logger:
-    """Persist HTTP requests and responses for debugging."""
+    """Persist HTTP requests and responses for debugging.
+
+    Records are handed to background writer threads, which format them and
+    append them in batches to the text log and, when enabled, to the
+    structured JSON Lines log (``requests_*.jsonl[.gz|.zst]``).
+    """
 
     dir_path = pathlib.Path(__file__).parent.parent
-    file_name = f"log_{str(datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S'))}.log"
+    run_stamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    # pytest-xdist workers write separate files, e.g. log_<stamp>_gw0.log
+    worker_suffix = f"_{os.environ['PYTEST_XDIST_WORKER']}" if os.environ.get("PYTEST_XDIST_WORKER") else ""
+    file_name = f"log_{run_stamp}{worker_suffix}.log"
     logs_dir = Path(dir_path, "./logs")
     file_path = Path(logs_dir, file_name)
+    structured_prefix = f"requests_{run_stamp}{worker_suffix}"
+
+    _writers = {}
+    _writers_pid = None
+    _writer_lock = threading.Lock()
+
+    @classmethod
+    def _get(cls, name, factory):
+        """Return the named writer for this process, creating it on first use or after a fork."""
+        if cls._writers_pid != os.getpid() or name not in cls._writers:
+            with cls._writer_lock:
+                if cls._writers_pid != os.getpid():
+                    cls._writers = {}
+                    cls._writers_pid = os.getpid()
+                if name not in cls._writers:
+                    cls._writers[name] = factory()
+        return cls._writers[name]
+
+    @classmethod
+    def get_writer(cls) -> BackgroundLogWriter:
+        """Return the writer for the text log."""
+        return cls._get("text", lambda: BackgroundLogWriter(cls.file_path))
+
+    @classmethod
+    def get_structured_writer(cls) -> BackgroundLogWriter:
+        """Return the writer for the structured JSON Lines log."""
+        return cls._get(
+            "structured",
+            lambda: BackgroundLogWriter(
+                cls.logs_dir,
+                stream_factory=lambda: RotatingLogStream(cls.logs_dir, cls.structured_prefix),
+            ),
+        )
 
     @classmethod
-    def _ensure_logs_dir(cls):
-        """Create logs directory if it doesn't exist."""
-        cls.logs_dir.mkdir(parents=True, exist_ok=True)
+    def add_worker_suffix(cls, suffix):
+        """Append suffix to this process's log file names, e.g. ``_lt0`` for a forked load-test worker.
+
+        Processes writing at the same time need distinct names: they would
+        otherwise append to one text log and truncate each other's structured
+        files. Call it before the process logs anything; writers it already
+        opened are closed first.
+        """
+        cls.close()
+        cls.worker_suffix += suffix
+        cls.file_name = f"log_{cls.run_stamp}{cls.worker_suffix}.log"
+        cls.file_path = Path(cls.logs_dir, cls.file_name)
+        cls.structured_prefix = f"requests_{cls.run_stamp}{cls.worker_suffix}"
 
     @classmethod
-    def write_log_to_file(cls, data: str):
-        """Append the given string to the log file."""
-        cls._ensure_logs_dir()
-        with open(cls.file_path, "a", encoding="utf-8") as logger_file:
-            logger_file.write(data)
+    def close(cls):
+        """Write out and close this process's log files; later records open new writers."""
+        with cls._writer_lock:
+            writers = list(cls._writers.values()) if cls._writers_pid == os.getpid() else []
+            cls._writers = {}
+            cls._writers_pid = os.getpid()
+        for writer in writers:
+            writer.close()
 
     @classmethod
-    def add_request(cls, url: str, method: str, body: str = None, headers: dict = None):
-        """Record outgoing request metadata."""
+    def flush(cls):
+        """Block until every queued log record is on disk."""
+        if cls._writers_pid != os.getpid():
+            return
+        for name, writer in list(cls._writers.items()):
+            writer.flush()
+            if writer.dropped:
+                logger.warning(f"Log buffer overflow: {writer.dropped} {name} record(s) dropped")
+
+    @classmethod
+    def write_log_to_file(cls, data):
+        """Queue a string, or a callable producing one, for the log file."""
+        cls.get_writer().submit(data)
+
+    @classmethod
+    def add_request(cls, url: str, method: str, body: str | bytes = None, headers: dict = None):
+        """Record outgoing request metadata; bytes bodies are shown as UTF-8 text."""
         test_name = os.environ.get("PYTEST_CURRENT_TEST")
+        timestamp = datetime.datetime.now()
+        headers = dict(headers) if headers else None
 
-        data_to_add = "\n-----\n"
-        data_to_add += f"Test: {test_name}\n"
-        data_to_add += f"Time: {str(datetime.datetime.now())}\n"
-        data_to_add += f"Request method: {method}\n"
-        data_to_add += f"Request URL: {url}\n"
+        def format_request():
+            data_to_add = "\n-----\n"
+            data_to_add += f"Test: {test_name}\n"
+            data_to_add += f"Time: {str(timestamp)}\n"
+            data_to_add += f"Request method: {method}\n"
+            data_to_add += f"Request URL: {url}\n"
 
-        if headers:
-            data_to_add += f"Request headers: {headers}\n"
+            if headers:
+                data_to_add += f"Request headers: {headers}\n"
 
-        if body:
-            data_to_add += f"Request body: {body}\n"
+            if body:
+                text = body.decode("utf-8", errors="replace") if isinstance(body, bytes) else body
+                data_to_add += f"Request body: {text}\n"
 
-        data_to_add += "\n"
+            data_to_add += "\n"
+            return data_to_add
 
-        cls.write_log_to_file(data_to_add)
+        cls.write_log_to_file(format_request)
 
-        # Also log to standard logger for HTML report
+        # Also log to standard logger for HTML report; bodies are only decoded by the log writer thread
         logger.info(f"HTTP {method} Request: {url}")
-        if body:
-            logger.debug(f"Request body: {body[:200]}..." if len(body) > 200 else f"Request body: {body}")
 
     @classmethod
-    def add_response(cls, result: Response):
-        """Record response metadata and body."""
-        cookies_as_dict = dict(result.cookies)
-        headers_as_dict = dict(result.headers)
-
-        data_to_add = f"Response code: {result.status_code}\n"
-        data_to_add += f"Response text: {result.text}\n"
-        data_to_add += f"Response headers: {headers_as_dict}\n"
-        data_to_add += f"Response cookies: {cookies_as_dict}\n"
-        data_to_add += "\n-----\n"
-
-        cls.write_log_to_file(data_to_add)
+    def add_response(cls, result: Response, elapsed: float = None, connect_time: float = None):
+        """Record response metadata and body, plus timings measured by the caller."""
+
+        def format_response():
+            cookies_as_dict = dict(result.cookies)
+            headers_as_dict = dict(result.headers)
+
+            data_to_add = f"Response code: {result.status_code}\n"
+            if elapsed is not None:
+                data_to_add += f"Response time: {elapsed * 1000:.1f} ms\n"
+            data_to_add += f"Response text: {result.text}\n"
+            data_to_add += f"Response headers: {headers_as_dict}\n"
+            data_to_add += f"Response cookies: {cookies_as_dict}\n"
+            data_to_add += "\n-----\n"
+            return data_to_add
+
+        cls.write_log_to_file(format_response)
+        if STRUCTURED_LOG_ENABLED:
+            cls.add_structured_record(result, elapsed, connect_time)
 
         # Also log to standard logger for HTML report
         logger.info(f"HTTP Response: {result.status_code} - {result.url}")
-        logger.debug(
-            f"Response body: {result.text[:200]}..." if len(result.text) > 200 else f"Response body: {result.text}"
-        )
+
+    @classmethod
+    def add_structured_record(cls, result: Response, elapsed: float = None, connect_time: float = None):
+        """Queue one JSON Lines record describing a finished HTTP call."""
+        current_test = os.environ.get("PYTEST_CURRENT_TEST") or ""
+        test_id, _, phase = current_test.partition(" (")
+        timestamp = time.time()
+
+        def format_record():
+            request = result.request
+            body = request.body or b""
+            record = {
+                "time": round(timestamp, 6),
+                "test": test_id or None,
+                "phase": phase.rstrip(")") or None,
+                "method": request.method,
+                "url": request.url,
+                "status": result.status_code,
+                "latency_ms": round((result.elapsed.total_seconds() if elapsed is None else elapsed) * 1000, 3),
+                "connect_ms": None if connect_time is None else round(connect_time * 1000, 3),
+                "request_bytes": len(body.encode("utf-8") if isinstance(body, str) else body),
+                "response_bytes": len(result.content),
+            }
+            return json.dumps(record, separators=(",", ":")) + "\n"
+
+        cls.get_structured_writer().submit(format_record)
@@ -0,0 +1,283 @@
+import contextlib
+import contextvars
+import functools
+import inspect
+import itertools
+import math
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from config import LATENCY_RECENT_SAMPLES, LATENCY_RESERVOIR_SIZE
+
+# Client method currently issuing requests, e.g. "Products.get_product"
+current_operation = contextvars.ContextVar("current_operation", default=None)
+# Name set by attribute_to, overriding the client method, e.g. "token_refresh"
+pinned_operation = contextvars.ContextVar("pinned_operation", default=None)
+
+
+def endpoint_of(url):
+    """Return the ServeRest resource of a URL, e.g. '/produtos' for '/produtos/abc?x=1'."""
+    path = urlsplit(url).path.strip("/")
+    return f"/{path.split('/', 1)[0]}" if path else "/"
+
+
+def percentile(sorted_values, pct):
+    """Return the pct-th percentile of already sorted values (nearest-rank)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def track_operation(name, func):
+    """Wrap a client method so requests it issues are attributed to name."""
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            token = current_operation.set(name)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                current_operation.reset(token)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = current_operation.set(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            current_operation.reset(token)
+
+    return wrapper
+
+
+@contextlib.contextmanager
+def attribute_to(name):
+    """Attribute every request issued in the block to name instead of the client method issuing it."""
+    token = pinned_operation.set(name)
+    try:
+        yield
+    finally:
+        pinned_operation.reset(token)
+
+
+def track_public_methods(cls, prefix):
+    """Apply track_operation to every public function defined directly on cls."""
+    for name, attr in list(vars(cls).items()):
+        if inspect.isfunction(attr) and not name.startswith("_"):
+            setattr(cls, name, track_operation(f"{prefix}.{name}", attr))
+
+
+@dataclass
+class LatencyStats:
+    """Latency summary for one endpoint; times are in seconds."""
+
+    endpoint: str
+    count: int
+    p50: float
+    p90: float
+    p99: float
+    max: float
+    throughput: float
+
+
+class LatencyReservoir:
+    """Uniform random sample of at most size call durations, with the exact count, max and time span.
+
+    Durations are kept with reservoir sampling (Algorithm R), so percentiles
+    are exact up to size calls and an unbiased estimate beyond, in bounded memory.
+    """
+
+    __slots__ = ("size", "rng", "count", "max", "first", "last", "durations")
+
+    def __init__(self, size=LATENCY_RESERVOIR_SIZE, rng=None):
+        """Keep at most size durations."""
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self.rng = rng or random.Random()
+        self.count = 0
+        self.max = 0.0
+        self.first = math.inf
+        self.last = -math.inf
+        self.durations = []
+
+    def add(self, started, elapsed):
+        """Count one call that started at started and took elapsed seconds."""
+        self.count += 1
+        self.max = max(self.max, elapsed)
+        self.first = min(self.first, started)
+        self.last = max(self.last, started + elapsed)
+        if len(self.durations) < self.size:
+            self.durations.append(elapsed)
+            return
+        slot = self.rng.randrange(self.count)
+        if slot < self.size:
+            self.durations[slot] = elapsed
+
+    def merge(self, other):
+        """Add the calls of other, keeping the sample uniform over both."""
+        total = self.count + other.count
+        if len(self.durations) + len(other.durations) <= self.size:
+            durations = self.durations + other.durations
+        else:
+            # Draw from each side in proportion to the calls it stands for
+            take = min(round(self.size * self.count / total), len(self.durations)) if total else 0
+            take = max(take, self.size - len(other.durations))
+            durations = self.rng.sample(self.durations, take) + self.rng.sample(other.durations, self.size - take)
+        self.count = total
+        self.max = max(self.max, other.max)
+        self.first = min(self.first, other.first)
+        self.last = max(self.last, other.last)
+        self.durations = durations
+
+    def export(self):
+        """Return a JSON-serialisable copy."""
+        return {
+            "count": self.count,
+            "max": self.max,
+            "first": self.first,
+            "last": self.last,
+            "durations": self.durations,
+        }
+
+    @classmethod
+    def from_export(cls, data, size=LATENCY_RESERVOIR_SIZE):
+        """Rebuild a reservoir exported by another process."""
+        reservoir = cls(size)
+        reservoir.count = data["count"]
+        reservoir.max = data["max"]
+        reservoir.first = data["first"]
+        reservoir.last = data["last"]
+        reservoir.durations = list(data["durations"])
+        return reservoir
+
+
+class LatencyRecorder:
+    """Process-wide, thread-safe store of per-call latencies in bounded memory.
+
+    Every call is counted in a ``LatencyReservoir`` per endpoint, per client
+    operation and overall, so load and soak runs keep a fixed footprint. The
+    last ``LATENCY_RECENT_SAMPLES`` calls are also kept as
+    ``(endpoint, operation, started, elapsed)`` samples in arrival order, so a
+    caller can take the slice recorded between two ``count()`` calls.
+    """
+
+    _recent = deque(maxlen=LATENCY_RECENT_SAMPLES)
+    _recorded = 0
+    _endpoints = {}
+    _operations = {}
+    _all = LatencyReservoir()
+    _lock = threading.Lock()
+
+    @classmethod
+    def record(cls, url, elapsed, finished=None):
+        """Store the duration of one call to url under the current operation."""
+        finished = finished or time.time()
+        operation = pinned_operation.get() or current_operation.get()
+        endpoint, started = endpoint_of(url), finished - elapsed
+        with cls._lock:
+            cls._recent.append((endpoint, operation, started, elapsed))
+            cls._recorded += 1
+            cls._reservoir(cls._endpoints, endpoint).add(started, elapsed)
+            if operation:
+                cls._reservoir(cls._operations, operation).add(started, elapsed)
+            cls._all.add(started, elapsed)
+
+    @classmethod
+    def count(cls):
+        """Return how many calls have been recorded so far."""
+        return cls._recorded
+
+    @classmethod
+    def samples(cls, start=0):
+        """Return the samples recorded from call number start onwards that are still kept."""
+        with cls._lock:
+            skip = max(0, start - (cls._recorded - len(cls._recent)))
+            return list(itertools.islice(cls._recent, skip, None))
+
+    @classmethod
+    def export(cls):
+        """Return a JSON-serialisable copy of the reservoirs."""
+        with cls._lock:
+            return {
+                "endpoints": {name: reservoir.export() for name, reservoir in cls._endpoints.items()},
+                "operations": {name: reservoir.export() for name, reservoir in cls._operations.items()},
+                "all": cls._all.export(),
+            }
+
+    @classmethod
+    def merge(cls, exported):
+        """Add reservoirs exported by another process, e.g. a pytest-xdist worker."""
+        with cls._lock:
+            for group, reservoirs in (("endpoints", cls._endpoints), ("operations", cls._operations)):
+                for name, data in exported[group].items():
+                    cls._reservoir(reservoirs, name).merge(LatencyReservoir.from_export(data))
+            cls._all.merge(LatencyReservoir.from_export(exported["all"]))
+
+    @classmethod
+    def reset(cls):
+        """Forget every recorded call, e.g. between load-test windows."""
+        with cls._lock:
+            cls._recent.clear()
+            cls._recorded = 0
+            cls._endpoints = {}
+            cls._operations = {}
+            cls._all = LatencyReservoir()
+
+    @classmethod
+    def summary(cls):
+        """Return LatencyStats per endpoint plus an 'all' row, sorted by endpoint."""
+        with cls._lock:
+            rows = [cls._stats(name, reservoir) for name, reservoir in sorted(cls._endpoints.items())]
+            if len(rows) > 1:
+                rows.append(cls._stats("all", cls._all))
+        return rows
+
+    @classmethod
+    def operation_reservoirs(cls, samples=None):
+        """Return {operation: LatencyReservoir}: copies of the run-wide ones, or exact ones over the given samples."""
+        if samples is None:
+            with cls._lock:
+                return {
+                    operation: LatencyReservoir.from_export(reservoir.export(), reservoir.size)
+                    for operation, reservoir in cls._operations.items()
+                }
+        grouped = {}
+        for _, operation, started, elapsed in samples:
+            if operation:
+                reservoir = grouped.get(operation)
+                if reservoir is None:
+                    reservoir = grouped[operation] = LatencyReservoir(max(len(samples), 1))
+                reservoir.add(started, elapsed)
+        return grouped
+
+    @staticmethod
+    def _reservoir(reservoirs, name):
+        """Return the reservoir of name, creating it; the caller holds the lock."""
+        reservoir = reservoirs.get(name)
+        if reservoir is None:
+            reservoir = reservoirs[name] = LatencyReservoir()
+        return reservoir
+
+    @staticmethod
+    def _stats(name, reservoir):
+        """Build LatencyStats from a reservoir."""
+        durations = sorted(reservoir.durations)
+        window = reservoir.last - reservoir.first
+        return LatencyStats(
+            endpoint=name,
+            count=reservoir.count,
+            p50=percentile(durations, 50),
+            p90=percentile(durations, 90),
+            p99=percentile(durations, 99),
+            max=reservoir.max,
+            throughput=reservoir.count / window if window > 0 else 0.0,
+        )
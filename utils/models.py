@@ -0,0 +1,108 @@
+from collections.abc import MutableMapping
+
+
+class Record(MutableMapping):
+    """Slotted ServeRest entity that reads and writes like the dict it replaces.
+
+    Fields are the API's own keys (``nome``, ``_id``, ``preco``, ...) stored
+    in ``__slots__``, so a record carries no per-instance dict: a user takes
+    about a third of the memory of the equivalent dict. Unset fields are
+    absent keys; unknown keys raise KeyError.
+    """
+
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        """Remember the subclass's field names for key checks."""
+        super().__init_subclass__(**kwargs)
+        cls._fields = frozenset(cls.__slots__)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from an API payload or response dict."""
+        record = cls()
+        record.update(data)
+        return record
+
+    @classmethod
+    def many(cls, items):
+        """Build a list of records from a list of dicts."""
+        return [cls.from_dict(item) for item in items]
+
+    def __getitem__(self, key):
+        """Return a set field, or raise KeyError."""
+        if key in self._fields:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        """Set a field; keys outside the model raise KeyError."""
+        if key not in self._fields:
+            raise KeyError(f"{type(self).__name__} has no field '{key}'")
+        setattr(self, key, value)
+
+    def __delitem__(self, key):
+        """Unset a field."""
+        if key not in self._fields or not hasattr(self, key):
+            raise KeyError(key)
+        delattr(self, key)
+
+    def __iter__(self):
+        """Iterate set fields in declaration order."""
+        return (field for field in self.__slots__ if hasattr(self, field))
+
+    def __len__(self):
+        """Return the number of set fields."""
+        return sum(1 for _ in self)
+
+    def to_dict(self):
+        """Return a plain dict, converting nested records too, e.g. for JSON."""
+        return {key: _plain(value) for key, value in self.items()}
+
+    def __repr__(self):
+        """Show the record as its class name and fields."""
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+def _plain(value):
+    """Return value with nested records turned into dicts."""
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+class User(Record):
+    """A ServeRest user with its id and login token once known."""
+
+    __slots__ = ("nome", "email", "password", "administrador", "_id", "authorization")
+
+
+class Product(Record):
+    """A ServeRest product."""
+
+    __slots__ = ("nome", "preco", "descricao", "quantidade", "_id")
+
+
+class CartItem(Record):
+    """One product line of a cart."""
+
+    __slots__ = ("idProduto", "quantidade")
+
+
+class Cart(Record):
+    """A ServeRest cart with the totals and owner recorded by the fixtures."""
+
+    __slots__ = ("produtos", "_id", "quantidadeTotal", "precoTotal", "idUsuario")
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a cart, turning its product lines into CartItem records."""
+        cart = super().from_dict(data)
+        if "produtos" in cart:
+            cart.produtos = CartItem.many(cart.produtos)
+        return cart
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+from config import HTTP_ENDPOINT_RATE_LIMITS, HTTP_RATE_BURST, HTTP_RATE_LIMIT
+from utils.metrics import endpoint_of
+
+
+@dataclass
+class RateLimitStats:
+    """How often and how long calls to one endpoint waited on the rate limiter; times in seconds."""
+
+    endpoint: str
+    calls: int = 0
+    delayed: int = 0
+    waited: float = 0.0
+    max_wait: float = 0.0
+
+    def add(self, wait):
+        """Count one call that waited wait seconds."""
+        self.calls += 1
+        if wait > 0:
+            self.delayed += 1
+            self.waited += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def merge(self, other):
+        """Add the counters of other, e.g. from a pytest-xdist worker."""
+        self.calls += other.calls
+        self.delayed += other.delayed
+        self.waited += other.waited
+        self.max_wait = max(self.max_wait, other.max_wait)
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing rate calls per second with bursts of up to burst calls.
+
+    A caller that finds the bucket empty reserves the next token (the level
+    goes negative) and sleeps outside the lock until it is due, so waiting
+    callers are served in arrival order and never block each other's bookkeeping.
+    """
+
+    def __init__(self, rate, burst=1, clock=time.monotonic, sleep=time.sleep):
+        """Refill rate tokens per second up to burst tokens; the bucket starts full."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return the seconds to wait until it may be used."""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self):
+        """Wait for a token and return the seconds waited."""
+        wait = self.reserve()
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+
+def parse_endpoint_limits(spec, default_burst=HTTP_RATE_BURST):
+    """Parse a HTTP_ENDPOINT_RATE_LIMITS string into {endpoint: (rate, burst)}."""
+    limits = {}
+    for entry in (part.strip() for part in spec.split(",")):
+        if not entry:
+            continue
+        try:
+            endpoint, rule = entry.split("=", 1)
+            rate, _, burst = rule.partition(":")
+            endpoint = "/" + endpoint.strip().strip("/")
+            limits[endpoint] = (float(rate), int(burst) if burst else default_burst)
+        except ValueError as exc:
+            raise ValueError(
+                f"Invalid endpoint rate limit '{entry}', expected '/<endpoint>=<req/s>[:<burst>]'"
+            ) from exc
+    return limits
+
+
+class RateLimiter:
+    """Global and per-endpoint request pacing for every API client.
+
+    Each call takes a token from the global bucket (``HTTP_RATE_LIMIT``
+    req/s, bursts of ``HTTP_RATE_BURST``) and from its endpoint's bucket
+    when one is configured (``HTTP_ENDPOINT_RATE_LIMITS``, e.g.
+    ``/produtos=5,/carrinhos=5:10``). Calls from any number of threads
+    share the buckets, and so do the async clients, which take their wait
+    from ``reserve`` and sleep on the event loop; the time each call waited
+    is counted per endpoint.
+    """
+
+    _shared = None
+    _pid = None
+    _lock = threading.Lock()
+
+    def __init__(
+        self, rate=HTTP_RATE_LIMIT, burst=HTTP_RATE_BURST, endpoint_limits=None, clock=time.monotonic, sleep=time.sleep
+    ):
+        """Limit all calls to rate req/s (0: unlimited) and endpoints to their {endpoint: (rate, burst)} limits."""
+        if rate < 0:
+            raise ValueError("rate must not be negative")
+        if endpoint_limits is None:
+            endpoint_limits = parse_endpoint_limits(HTTP_ENDPOINT_RATE_LIMITS, burst)
+        self.bucket = TokenBucket(rate, burst, clock, sleep) if rate else None
+        self.endpoint_buckets = {
+            endpoint: TokenBucket(endpoint_rate, endpoint_burst, clock, sleep)
+            for endpoint, (endpoint_rate, endpoint_burst) in endpoint_limits.items()
+        }
+        self.sleep = sleep
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """Return the process-wide limiter when any limit is configured, else None."""
+        if not HTTP_RATE_LIMIT and not HTTP_ENDPOINT_RATE_LIMITS:
+            return None
+        if cls._shared is None or cls._pid != os.getpid():
+            with cls._lock:
+                if cls._shared is None or cls._pid != os.getpid():
+                    cls._shared = cls()
+                    cls._pid = os.getpid()
+        return cls._shared
+
+    def acquire(self, url):
+        """Wait until a call to url is allowed by the global and its endpoint's bucket; return the seconds waited."""
+        wait = self.reserve(url)
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    def reserve(self, url):
+        """Take the tokens of a call to url and return the seconds it must wait; the caller does the waiting."""
+        endpoint = endpoint_of(url)
+        # Reserve from both buckets first, then wait once for the later of the two
+        wait = self.bucket.reserve() if self.bucket is not None else 0.0
+        endpoint_bucket = self.endpoint_buckets.get(endpoint)
+        if endpoint_bucket is not None:
+            wait = max(wait, endpoint_bucket.reserve())
+        with self._stats_lock:
+            self._stats.setdefault(endpoint, RateLimitStats(endpoint)).add(wait)
+        return wait
+
+    def summary(self):
+        """Return RateLimitStats per endpoint, sorted by endpoint."""
+        with self._stats_lock:
+            return [RateLimitStats(**asdict(self._stats[endpoint])) for endpoint in sorted(self._stats)]
+
+    def export(self):
+        """Return the per-endpoint counters as JSON-serialisable dicts."""
+        return [asdict(stats) for stats in self.summary()]
+
+    def merge(self, exported):
+        """Add counters exported by another process, e.g. a pytest-xdist worker."""
+        with self._stats_lock:
+            for data in exported:
+                stats = RateLimitStats(**data)
+                self._stats.setdefault(stats.endpoint, RateLimitStats(stats.endpoint)).merge(stats)
@@ -1,59 +1,223 @@
-from dataclasses import dataclass
-
-import requests
+import time
 
+from config import HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT
+from utils.entity_tracker import EntityTracker
 from utils.logger import Logger
+from utils.metrics import LatencyRecorder
+from utils.rate_limiter import RateLimiter
+from utils.response_cache import ResponseCache
+from utils.retry import TRANSIENT_ERRORS, CircuitBreakers, RetryPolicy
+from utils.serializer import loads
+from utils.session import SessionManager, get_connect_time, reset_connect_time
+
+_UNDECODED = object()
 
 
-@dataclass
 class APIResponse:
-    """Lightweight container for HTTP response data."""
+    """Lightweight, slotted container for HTTP response data.
+
+    Only the raw body bytes are kept. ``text`` is decoded from them on each
+    access and ``as_dict`` is parsed on first access and cached, so responses
+    nobody reads (e.g. bulk seeding results) never hold a decoded copy.
+
+    ``elapsed`` is the wall time of the whole call in seconds, body included;
+    ``connect_time`` is the part spent on DNS, TCP and TLS setup, and is zero
+    when a pooled keep-alive connection was reused. ``rate_limit_wait`` is
+    the time the call was held back by the rate limiter before it was sent,
+    retries included; it is not part of ``elapsed``.
+    """
+
+    __slots__ = (
+        "status_code",
+        "content",
+        "encoding",
+        "headers",
+        "elapsed",
+        "connect_time",
+        "rate_limit_wait",
+        "_as_dict",
+    )
 
-    status_code: int
-    text: str
-    as_dict: object
-    headers: dict
+    def __init__(self, status_code, content, headers, elapsed=0.0, connect_time=0.0, encoding="utf-8"):
+        """Keep the status, raw body bytes, headers and timings of one call."""
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding
+        self.headers = headers
+        self.elapsed = elapsed
+        self.connect_time = connect_time
+        self.rate_limit_wait = 0.0
+        self._as_dict = _UNDECODED
+
+    @property
+    def text(self):
+        """Return the body decoded with the response encoding."""
+        return self.content.decode(self.encoding, errors="replace")
+
+    @property
+    def as_dict(self):
+        """Return the JSON body, parsed on first access; {} when the body is not JSON."""
+        if self._as_dict is _UNDECODED:
+            try:
+                self._as_dict = loads(self.content) if self.content else {}
+            except ValueError:
+                self._as_dict = {}
+        return self._as_dict
+
+    def __repr__(self):
+        """Show the status, size and timing of the response."""
+        return f"APIResponse(status_code={self.status_code}, bytes={len(self.content)}, elapsed={self.elapsed:.4f})"
 
 
 class APIRequest:
-    """Wrapper around requests with logging and unified responses."""
+    """Wrapper around a pooled requests session with logging, timing and unified responses."""
+
+    def __init__(self, session=None, timeout=None, cache=None, retry=None, limiter=None):
+        """Use the given session or fall back to the shared pooled one.
+
+        cache is a ResponseCache for GET calls; by default the process-wide
+        one is used when HTTP_CACHE_ENABLED is on, and nothing is cached otherwise.
+        retry is the RetryPolicy for failed calls (default: from config).
+        limiter is the RateLimiter pacing calls; by default the process-wide
+        one is used when a rate limit is configured.
+        """
+        self._session = session
+        self.timeout = timeout or (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+        self.cache = cache if cache is not None else ResponseCache.shared()
+        self.retry = retry or RetryPolicy()
+        self.limiter = limiter if limiter is not None else RateLimiter.shared()
+
+    @property
+    def session(self):
+        """Return the session used for outgoing calls."""
+        return self._session or SessionManager.get_session()
 
     def get_request(self, url, headers):
         """Execute a GET request."""
-        Logger.add_request(url, method="GET", headers=headers)
-        response = requests.get(url=url, headers=headers)
-        Logger.add_response(response)
-        return self.get_responses(response)
+        return self._send("GET", url, headers)
 
     def post_request(self, url, payload, headers):
         """Execute a POST request."""
-        Logger.add_request(url, method="POST", body=payload, headers=headers)
-        response = requests.post(url=url, data=payload, headers=headers)
-        Logger.add_response(response)
-        return self.get_responses(response)
+        return self._send("POST", url, headers, payload)
 
     def put_request(self, url, payload, headers):
         """Execute a PUT request."""
-        Logger.add_request(url, method="PUT", body=payload, headers=headers)
-        response = requests.put(url=url, data=payload, headers=headers)
-        Logger.add_response(response)
-        return self.get_responses(response)
+        return self._send("PUT", url, headers, payload)
 
     def delete_request(self, url, headers):
         """Execute a DELETE request."""
-        Logger.add_request(url, method="DELETE", headers=headers)
-        response = requests.delete(url=url, data=None, headers=headers)
-        Logger.add_response(response)
-        return self.get_responses(response)
+        return self._send("DELETE", url, headers)
+
+    def _send(self, method, url, headers, payload=None):
+        """Log, time and execute one call, then convert the response."""
+        cache = self.cache
+        if cache is not None and method == "GET":
+            return self._send_cached(cache, url, headers)
+
+        api_response = self._call(method, url, headers, payload)
+        if cache is not None:
+            cache.invalidate(url)
+        tracker = EntityTracker.active()
+        if tracker is not None:
+            tracker.observe(method, url, headers, api_response, payload)
+        return api_response
+
+    def _send_cached(self, cache, url, headers):
+        """Answer a GET from cache, revalidate a stale entry with If-None-Match, or fetch and store it."""
+        key = cache.key(url, headers)
+        entry, etag = cache.lookup(key)
+        if entry is not None:
+            return APIResponse(entry.status_code, entry.content, entry.headers, encoding=entry.encoding)
+
+        if etag:
+            headers = {**(headers or {}), "If-None-Match": etag}
+        generation = cache.generation(url)
+        api_response = self._call("GET", url, headers)
+        if api_response.status_code == 304 and etag:
+            entry = cache.revalidate(key)
+            if entry is not None:
+                return APIResponse(
+                    entry.status_code,
+                    entry.content,
+                    entry.headers,
+                    api_response.elapsed,
+                    api_response.connect_time,
+                    entry.encoding,
+                )
+        cache.store(
+            key,
+            api_response.status_code,
+            api_response.content,
+            api_response.headers,
+            api_response.encoding,
+            generation,
+        )
+        return api_response
+
+    def _call(self, method, url, headers, payload=None):
+        """Execute a call through its endpoint's circuit breaker and the rate limiter, retrying transient failures.
+
+        A response with a retryable status is returned once retries are
+        exhausted; a transport error is raised. While the breaker is open
+        CircuitOpenError is raised without sending anything.
+        """
+        breaker = CircuitBreakers.for_url(url)
+        retry = 0
+        waited = 0.0
+        while True:
+            breaker.before_call()
+            try:
+                if self.limiter is not None:
+                    waited += self.limiter.acquire(url)
+                api_response = self._attempt(method, url, headers, payload)
+            except TRANSIENT_ERRORS as error:
+                breaker.record_failure()
+                if not self.retry.retries(method, retry, error=error):
+                    if retry:
+                        breaker.record_exhausted()
+                    raise
+                wait = self.retry.delay(retry)
+            except BaseException:
+                # No verdict on the endpoint's health, but a half-open trial must not stay taken
+                breaker.release_trial()
+                raise
+            else:
+                status = api_response.status_code
+                if status == 429 or status >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if not self.retry.retries(method, retry, status):
+                    if retry and status in self.retry.statuses:
+                        breaker.record_exhausted()
+                    api_response.rate_limit_wait = waited
+                    return api_response
+                wait = self.retry.delay(retry, api_response.headers.get("Retry-After"))
+            retry += 1
+            breaker.record_retry()
+            time.sleep(wait)
+
+    def _attempt(self, method, url, headers, payload=None):
+        """Log, time and execute one HTTP call and convert the response."""
+        Logger.add_request(url, method=method, body=payload, headers=headers)
+        reset_connect_time()
+        started = time.perf_counter()
+        response = self.session.request(method, url=url, data=payload, headers=headers, timeout=self.timeout)
+        elapsed = time.perf_counter() - started
+        connect_time = get_connect_time()
+
+        LatencyRecorder.record(url, elapsed)
+        Logger.add_response(response, elapsed=elapsed, connect_time=connect_time)
+        return self.get_responses(response, elapsed, connect_time)
 
     @staticmethod
-    def get_responses(response):
+    def get_responses(response, elapsed=0.0, connect_time=0.0):
         """Convert a raw response into APIResponse."""
-        status_code = response.status_code
-        text = response.text
-        try:
-            as_dict = response.json()
-        except ValueError:
-            as_dict = {}
-        headers = response.headers
-        return APIResponse(status_code, text, as_dict, headers)
+        return APIResponse(
+            response.status_code,
+            response.content,
+            response.headers,
+            elapsed,
+            connect_time,
+            response.encoding or "utf-8",
+        )
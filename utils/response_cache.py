@@ -0,0 +1,177 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+
+from config import HTTP_CACHE_ENABLED, HTTP_CACHE_MAX_ENTRIES, HTTP_CACHE_TTL
+from utils.metrics import endpoint_of
+
+# Writes to one resource that change what another resource returns:
+# creating or closing a cart reserves or restocks products.
+RELATED_ENDPOINTS = {"/carrinhos": ("/produtos",)}
+
+
+@dataclass
+class CacheStats:
+    """Counters of a ResponseCache."""
+
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    stores: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    def merge(self, other):
+        """Add the counters of other, e.g. from a pytest-xdist worker."""
+        for field in fields(self):
+            setattr(self, field.name, getattr(self, field.name) + getattr(other, field.name))
+
+    @property
+    def hit_rate(self):
+        """Return the share of lookups answered without a full response body."""
+        lookups = self.hits + self.misses
+        return (self.hits + self.revalidated) / lookups if lookups else 0.0
+
+
+@dataclass
+class CacheEntry:
+    """One cached 200 response: raw parts, validator and expiry."""
+
+    status_code: int
+    content: bytes
+    headers: dict
+    encoding: str
+    etag: str
+    expires: float
+
+
+class ResponseCache:
+    """Thread-safe TTL + LRU cache of successful GET responses.
+
+    Entries are keyed by URL and Authorization header and expire ``ttl``
+    seconds after they were stored or revalidated. When more than
+    ``max_entries`` are held the least recently used is evicted. An expired
+    entry with an ETag is kept so the next request can revalidate it with
+    If-None-Match; a 304 answer refreshes it without a body. Any non-GET call
+    through the cache drops every entry of the resource it touched (and of
+    related resources, see RELATED_ENDPOINTS).
+    """
+
+    _shared = None
+    _pid = None
+    _lock = threading.Lock()
+
+    def __init__(self, ttl=HTTP_CACHE_TTL, max_entries=HTTP_CACHE_MAX_ENTRIES, clock=time.monotonic):
+        """Cache up to max_entries responses for ttl seconds each, measured with clock."""
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._keys_by_endpoint = {}
+        self._generations = {}
+        self._mutex = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """Return the process-wide cache when HTTP_CACHE_ENABLED is on, else None."""
+        if not HTTP_CACHE_ENABLED:
+            return None
+        if cls._shared is None or cls._pid != os.getpid():
+            with cls._lock:
+                if cls._shared is None or cls._pid != os.getpid():
+                    cls._shared = cls()
+                    cls._pid = os.getpid()
+        return cls._shared
+
+    @staticmethod
+    def key(url, headers):
+        """Return the cache key of a GET: its URL and the caller's Authorization header."""
+        return url, (headers or {}).get("Authorization") or None
+
+    def lookup(self, key):
+        """Return (fresh entry, None) on a hit, (None, etag) for a stale entry to revalidate, else (None, None)."""
+        with self._mutex:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None, None
+            self._entries.move_to_end(key)
+            if entry.expires > self.clock():
+                self.stats.hits += 1
+                return entry, None
+            self.stats.misses += 1
+            if entry.etag:
+                return None, entry.etag
+            self._remove(key)
+            return None, None
+
+    def generation(self, url):
+        """Return how often url's resource has been invalidated; pass it to store()."""
+        return self._generations.get(endpoint_of(url), 0)
+
+    def store(self, key, status_code, content, headers, encoding, generation=None):
+        """Cache a 200 response for key; other statuses are not cached.
+
+        When generation (read before the request was sent) is given and the
+        resource was invalidated since, the response may predate that write
+        and is not stored.
+        """
+        if status_code != 200:
+            return
+        endpoint = endpoint_of(key[0])
+        entry = CacheEntry(status_code, content, headers, encoding, headers.get("ETag"), self.clock() + self.ttl)
+        with self._mutex:
+            if generation is not None and self._generations.get(endpoint, 0) != generation:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._keys_by_endpoint.setdefault(endpoint, set()).add(key)
+            self.stats.stores += 1
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats.evictions += 1
+
+    def revalidate(self, key):
+        """Extend a stale entry after a 304 answer and return it, or None when it was dropped meanwhile."""
+        with self._mutex:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.expires = self.clock() + self.ttl
+            self.stats.revalidated += 1
+            return entry
+
+    def invalidate(self, url):
+        """Drop every entry of the resource url belongs to, and of related resources."""
+        endpoint = endpoint_of(url)
+        with self._mutex:
+            for affected in (endpoint, *RELATED_ENDPOINTS.get(endpoint, ())):
+                self._generations[affected] = self._generations.get(affected, 0) + 1
+                for key in list(self._keys_by_endpoint.get(affected, ())):
+                    self._remove(key)
+                    self.stats.invalidations += 1
+
+    def clear(self):
+        """Drop every entry; counters are kept."""
+        with self._mutex:
+            self._entries.clear()
+            self._keys_by_endpoint.clear()
+
+    def __len__(self):
+        """Return the number of cached responses."""
+        return len(self._entries)
+
+    def _remove(self, key):
+        """Drop key from the entries and the endpoint index; the caller holds the mutex."""
+        self._entries.pop(key, None)
+        keys = self._keys_by_endpoint.get(endpoint_of(key[0]))
+        if keys is not None:
+            keys.discard(key)
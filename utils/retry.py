@@ -0,0 +1,265 @@
+import os
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from config import (
+    HTTP_BREAKER_RESET_TIMEOUT,
+    HTTP_BREAKER_THRESHOLD,
+    HTTP_RETRY_ATTEMPTS,
+    HTTP_RETRY_BACKOFF,
+    HTTP_RETRY_BACKOFF_MAX,
+    HTTP_RETRY_METHODS,
+    HTTP_RETRY_STATUSES,
+)
+from utils.metrics import endpoint_of
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+# Order used to report the worst state of an endpoint across pytest-xdist workers
+STATE_SEVERITY = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+# Exceptions meaning the server did not answer: nothing was received, so the call may be repeated
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+
+def is_connect_error(error):
+    """Report whether error means no connection was opened, so the request never reached the server."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError) or isinstance(error, CircuitOpenError) or not error.args:
+        return False
+    # requests wraps urllib3's MaxRetryError, whose reason is the underlying failure
+    return isinstance(getattr(error.args[0], "reason", error.args[0]), NewConnectionError)
+
+
+def parse_retry_after(value, now=None):
+    """Return the seconds a Retry-After header asks to wait (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, moment.timestamp() - (time.time() if now is None else now))
+
+
+class RetryPolicy:
+    """Decide which failed calls are repeated and how long to wait in between.
+
+    Only idempotent methods are retried by default (``HTTP_RETRY_METHODS``);
+    POST has to be opted in because repeating it after a lost answer may
+    create a duplicate. Connection failures are retried for every method,
+    because those requests never reached the server. This is the only retry
+    layer: the session's adapter does not retry connections itself. A call is repeated after a transport error or a
+    status in ``statuses``, at most ``attempts`` times, waiting a random time
+    between zero and ``backoff * 2 ** retry`` (full jitter, capped at
+    ``backoff_max``) or as long as the server's Retry-After asks, capped the same.
+    """
+
+    def __init__(
+        self,
+        attempts=HTTP_RETRY_ATTEMPTS,
+        methods=HTTP_RETRY_METHODS,
+        statuses=HTTP_RETRY_STATUSES,
+        backoff=HTTP_RETRY_BACKOFF,
+        backoff_max=HTTP_RETRY_BACKOFF_MAX,
+        rng=None,
+    ):
+        """Retry up to attempts times for methods and statuses, backing off from backoff to backoff_max seconds."""
+        if attempts < 0:
+            raise ValueError("attempts must not be negative")
+        if backoff < 0 or backoff_max < 0:
+            raise ValueError("backoff and backoff_max must not be negative")
+        self.attempts = attempts
+        self.methods = frozenset(method.upper() for method in methods)
+        self.statuses = frozenset(statuses)
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.rng = rng or random.Random()
+
+    def retries(self, method, retry, status=None, error=None):
+        """Report whether a call that failed with status or error gets retry number retry + 1.
+
+        status is None for a transport error; error is that exception, if known.
+        """
+        if retry >= self.attempts:
+            return False
+        if error is not None and is_connect_error(error):
+            return True
+        if method.upper() not in self.methods:
+            return False
+        return status is None or status in self.statuses
+
+    def delay(self, retry, retry_after=None):
+        """Return the seconds to wait before retry number retry + 1."""
+        wait = parse_retry_after(retry_after)
+        if wait is None:
+            wait = self.rng.uniform(0, self.backoff * 2**retry)
+        return min(wait, self.backoff_max)
+
+
+@dataclass
+class BreakerStats:
+    """Retry and circuit breaker counters of one endpoint."""
+
+    endpoint: str
+    retries: int = 0
+    exhausted: int = 0
+    trips: int = 0
+    rejected: int = 0
+    state: str = CLOSED
+
+    def merge(self, other):
+        """Add the counters of other and keep the worse state."""
+        self.retries += other.retries
+        self.exhausted += other.exhausted
+        self.trips += other.trips
+        self.rejected += other.rejected
+        if STATE_SEVERITY[other.state] > STATE_SEVERITY[self.state]:
+            self.state = other.state
+
+
+class CircuitBreaker:
+    """Per-endpoint circuit breaker.
+
+    After ``threshold`` consecutive failures (transport errors, 429 and 5xx)
+    the circuit opens and calls fail fast with CircuitOpenError for
+    ``reset_timeout`` seconds. Then one trial call is let through
+    (half-open): success closes the circuit, failure opens it again. A
+    threshold of 0 disables the breaker; retries are still counted.
+    """
+
+    def __init__(
+        self, endpoint, threshold=HTTP_BREAKER_THRESHOLD, reset_timeout=HTTP_BREAKER_RESET_TIMEOUT, clock=time.monotonic
+    ):
+        """Guard endpoint, opening after threshold failures for reset_timeout seconds."""
+        if threshold < 0:
+            raise ValueError("threshold must not be negative")
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.stats = BreakerStats(endpoint)
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """Return the current state; an open circuit turns half-open once reset_timeout has passed."""
+        with self._lock:
+            return self._state()
+
+    def before_call(self):
+        """Let a call through, or raise CircuitOpenError while the circuit is open."""
+        with self._lock:
+            state = self._state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._trial:
+                self._trial = True
+                return
+            self.stats.rejected += 1
+        raise CircuitOpenError(f"Circuit breaker for {self.stats.endpoint} is {state}; call not sent")
+
+    def record_success(self):
+        """Close the circuit after an answered call."""
+        with self._lock:
+            self._failures = 0
+            self._trial = False
+            self.stats.state = CLOSED
+
+    def record_failure(self):
+        """Count a failed call and open the circuit when the threshold is reached or a trial failed."""
+        with self._lock:
+            self._failures += 1
+            if self.threshold and (self._trial or self._failures >= self.threshold):
+                if self.stats.state != OPEN:
+                    self.stats.trips += 1
+                self._opened_at = self.clock()
+                self._trial = False
+                self.stats.state = OPEN
+
+    def release_trial(self):
+        """Let another half-open trial through after one that ended without an answer or a transport error."""
+        with self._lock:
+            self._trial = False
+
+    def record_retry(self):
+        """Count a call about to be repeated."""
+        with self._lock:
+            self.stats.retries += 1
+
+    def record_exhausted(self):
+        """Count a call that still failed after its last retry."""
+        with self._lock:
+            self.stats.exhausted += 1
+
+    def _state(self):
+        """Return the state; the caller holds the lock."""
+        if self.stats.state == OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+            self.stats.state = HALF_OPEN
+        return self.stats.state
+
+
+class CircuitBreakers:
+    """Process-wide registry of circuit breakers, one per ServeRest endpoint."""
+
+    _breakers = {}
+    _pid = None
+    _lock = threading.Lock()
+    _merged = {}
+
+    @classmethod
+    def for_url(cls, url) -> CircuitBreaker:
+        """Return the breaker of url's endpoint, creating it on first use or after a fork."""
+        endpoint = endpoint_of(url)
+        if cls._pid != os.getpid():
+            with cls._lock:
+                if cls._pid != os.getpid():
+                    cls._breakers = {}
+                    cls._pid = os.getpid()
+        breaker = cls._breakers.get(endpoint)
+        if breaker is None:
+            with cls._lock:
+                breaker = cls._breakers.setdefault(endpoint, CircuitBreaker(endpoint))
+        return breaker
+
+    @classmethod
+    def summary(cls):
+        """Return BreakerStats per endpoint, merged with those of other processes, sorted by endpoint."""
+        with cls._lock:
+            breakers = list(cls._breakers.values()) if cls._pid == os.getpid() else []
+            merged = {endpoint: BreakerStats(**asdict(stats)) for endpoint, stats in cls._merged.items()}
+        for breaker in breakers:
+            stats = BreakerStats(**{**asdict(breaker.stats), "state": breaker.state})
+            merged.setdefault(stats.endpoint, BreakerStats(stats.endpoint)).merge(stats)
+        return [merged[endpoint] for endpoint in sorted(merged)]
+
+    @classmethod
+    def export(cls):
+        """Return the counters of this process as JSON-serialisable dicts."""
+        with cls._lock:
+            breakers = list(cls._breakers.values()) if cls._pid == os.getpid() else []
+        return [asdict(breaker.stats) for breaker in breakers]
+
+    @classmethod
+    def merge(cls, exported):
+        """Add counters exported by another process, e.g. a pytest-xdist worker."""
+        with cls._lock:
+            for data in exported:
+                stats = BreakerStats(**data)
+                cls._merged.setdefault(stats.endpoint, BreakerStats(stats.endpoint)).merge(stats)
@@ -0,0 +1,294 @@
+import copy
+from collections.abc import ItemsView, KeysView, MutableMapping, MutableSequence, ValuesView
+
+from utils.context_store import CARTS, PRODUCT_IDS, PRODUCTS, USERS, ContextStore, EntityIndex
+
+
+class _SeedProxy:
+    """Copy-on-write handle on a list or record of a seed key, as seen through one view.
+
+    Reads go to the seed's object while the key is unchanged and to the
+    view's copy afterwards. The first write copies the whole key into the
+    view, then applies the change to the copy of this object.
+    """
+
+    __slots__ = ("_view", "_key", "_obj")
+
+    def __init__(self, view, key, obj):
+        """Wrap obj, a value reachable from the seed's key, for view."""
+        self._view = view
+        self._key = key
+        self._obj = obj
+
+    def _target(self):
+        """Return the object reads should see."""
+        return self._view._resolve(self._key, self._obj)
+
+    def _writable(self):
+        """Copy the key into the view if needed and return the view's copy of the object."""
+        self._view._own(self._key)
+        return self._view._resolve(self._key, self._obj, detach=True)
+
+    def _wrap(self, value):
+        """Wrap nested lists and records so writes to them are copied too."""
+        return self._view._wrap(self._key, value)
+
+    def __eq__(self, other):
+        """Compare the underlying values."""
+        return self._target() == (other._target() if isinstance(other, _SeedProxy) else other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        """Show the underlying value."""
+        return repr(self._target())
+
+
+class SeedList(_SeedProxy, MutableSequence):
+    """Copy-on-write list of a seed key."""
+
+    __slots__ = ()
+
+    def __getitem__(self, index):
+        """Return an item, or a plain list of items for a slice."""
+        value = self._target()[index]
+        if isinstance(index, slice):
+            return [self._wrap(item) for item in value]
+        return self._wrap(value)
+
+    def __iter__(self):
+        """Iterate the items."""
+        return (self._wrap(item) for item in self._target())
+
+    def __len__(self):
+        """Return the number of items."""
+        return len(self._target())
+
+    def __setitem__(self, index, value):
+        """Replace an item in the view's copy."""
+        self._writable()[index] = value
+
+    def __delitem__(self, index):
+        """Remove an item from the view's copy."""
+        del self._writable()[index]
+
+    def insert(self, index, value):
+        """Insert an item into the view's copy."""
+        self._writable().insert(index, value)
+
+
+class SeedRecord(_SeedProxy, MutableMapping):
+    """Copy-on-write record (user, product, cart or cart item) of a seed key."""
+
+    __slots__ = ()
+
+    def __getitem__(self, field):
+        """Return a field."""
+        return self._wrap(self._target()[field])
+
+    def __iter__(self):
+        """Iterate the set fields."""
+        return iter(self._target())
+
+    def __len__(self):
+        """Return the number of set fields."""
+        return len(self._target())
+
+    def __setitem__(self, field, value):
+        """Set a field on the view's copy."""
+        self._writable()[field] = value
+
+    def __delitem__(self, field):
+        """Unset a field on the view's copy."""
+        del self._writable()[field]
+
+    def to_dict(self):
+        """Return a plain dict of the record, e.g. for JSON."""
+        target = self._target()
+        return target.to_dict() if hasattr(target, "to_dict") else dict(target)
+
+
+class SeedView(ContextStore):
+    """Copy-on-write view over a shared seed.
+
+    Nothing is copied while a test only reads: lists and records come back
+    as ``SeedList``/``SeedRecord`` handles on the seed's own objects, and
+    lookups use indexes shared by every view. The first change to a key,
+    made through the view or in place through one of those handles, deep
+    copies that key into the view and applies the change to the copy, so
+    the seed never changes. ``fresh`` keys start out absent, for tests that
+    create those entities themselves.
+    """
+
+    def __init__(self, base, indexes=None, fresh=()):
+        """Wrap the shared seed mapping and its shared lookup indexes, hiding the fresh keys."""
+        super().__init__()
+        self._base = base
+        self._base_indexes = {} if indexes is None else indexes
+        self._hidden = set(fresh)
+        # Per copied key: id of each seed object -> the view's copy of it
+        self._copies = {}
+
+    def _seeded(self, key):
+        """Report whether key is still read from the seed."""
+        return key not in self._hidden and not dict.__contains__(self, key) and key in self._base
+
+    def _own(self, key):
+        """Copy a seeded value into the view before it is changed."""
+        if self._seeded(key):
+            memo = {}
+            value = copy.deepcopy(self._base[key], memo)
+            self._copies[key] = memo
+            self[key] = value
+
+    def _resolve(self, key, obj, detach=False):
+        """Return the view's copy of the seed object obj, or obj itself while key is unchanged.
+
+        A handle outliving its key (the key was since replaced or deleted) no
+        longer belongs to the view; with detach its writes go to a private
+        copy instead of the seed.
+        """
+        if self._seeded(key):
+            return obj
+        copies = self._copies.setdefault(key, {})
+        found = copies.get(id(obj))
+        if found is None:
+            if not detach:
+                return obj
+            found = copies[id(obj)] = copy.deepcopy(obj)
+        return found
+
+    def _wrap(self, key, value):
+        """Return a copy-on-write handle for lists and records, else value itself."""
+        if isinstance(value, list):
+            return SeedList(self, key, value)
+        if isinstance(value, MutableMapping):
+            return SeedRecord(self, key, value)
+        return value
+
+    def __getitem__(self, key):
+        """Return the view's value of key, or a handle on the seed's while unchanged."""
+        if self._seeded(key):
+            return self._wrap(key, self._base[key])
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        """Return the value of key, or default when it is neither in the view nor seeded."""
+        if self._seeded(key):
+            return self._wrap(key, self._base[key])
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        """Report keys held by the view or still read from the seed."""
+        return super().__contains__(key) or self._seeded(key)
+
+    def __iter__(self):
+        """Iterate the seeded keys still visible, then the view's own keys."""
+        for key in self._base:
+            if self._seeded(key):
+                yield key
+        yield from dict.__iter__(self)
+
+    def __len__(self):
+        """Return the number of visible keys."""
+        return dict.__len__(self) + sum(1 for key in self._base if self._seeded(key))
+
+    def keys(self):
+        """Return the visible keys."""
+        return KeysView(self)
+
+    def items(self):
+        """Return the visible (key, value) pairs."""
+        return ItemsView(self)
+
+    def values(self):
+        """Return the visible values."""
+        return ValuesView(self)
+
+    def __delitem__(self, key):
+        """Remove key from the view; a seeded key stays hidden afterwards."""
+        if self._seeded(key):
+            self._hidden.add(key)
+            self._indexes.pop(key, None)
+            return
+        super().__delitem__(key)
+        self._hidden.add(key)
+
+    def pop(self, key, *default):
+        """Remove key from the view and return its value; a seeded key stays hidden afterwards."""
+        if self._seeded(key):
+            value = self[key]
+            self._hidden.add(key)
+            self._indexes.pop(key, None)
+            return value
+        self._hidden.add(key)
+        return super().pop(key, *default)
+
+    def clear(self):
+        """Remove every key, hiding the seeded ones."""
+        super().clear()
+        self._hidden.update(self._base)
+
+    def _index(self, key) -> EntityIndex:
+        """Return the shared index of a seeded key, or the view's own index."""
+        if not self._seeded(key):
+            return super()._index(key)
+        records = self._base[key]
+        index = self._base_indexes.get(key)
+        if index is None or not index.is_current(records):
+            index = self._base_indexes[key] = EntityIndex(records)
+        return index
+
+    def _lookup(self, key, record):
+        """Return a handle on a record found through a seeded key's index."""
+        return self._wrap(key, record) if self._seeded(key) else record
+
+    def user(self, user_id):
+        """Return the user with user_id."""
+        return self._lookup(USERS, super().user(user_id))
+
+    def user_by_email(self, email):
+        """Return the user registered with email."""
+        return self._lookup(USERS, super().user_by_email(email))
+
+    def admins(self) -> list:
+        """Return the admin users."""
+        return [self._lookup(USERS, user) for user in super().admins()]
+
+    def product(self, product_id):
+        """Return the product with product_id."""
+        return self._lookup(PRODUCTS, super().product(product_id))
+
+    def cart(self, cart_id):
+        """Return the cart with cart_id."""
+        return self._lookup(CARTS, super().cart(cart_id))
+
+    def _add(self, key, records):
+        """Append records to the view's own copy of key."""
+        self._own(key)
+        super()._add(key, records)
+
+    def add_products(self, products):
+        """Append created products and their ids to the view's own copies."""
+        self._own(PRODUCT_IDS)
+        super().add_products(products)
+
+
+class SeedDataset:
+    """Entities and creation responses seeded once and shared across tests."""
+
+    def __init__(self):
+        """Start with an empty seed."""
+        self.data = {}
+        self.responses = {}
+        self.indexes = {}
+
+    def view(self, fresh=()):
+        """Return a copy-on-write view of the seeded entities without the fresh keys."""
+        return SeedView(self.data, self.indexes, fresh)
+
+    def get_responses(self, phase):
+        """Return the creation responses recorded for a seeding phase."""
+        if phase not in self.responses:
+            raise ValueError(f"Seed has no responses for phase '{phase}'")
+        return list(self.responses[phase])
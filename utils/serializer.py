@@ -0,0 +1,86 @@
+import json
+from collections.abc import MutableSequence
+
+from config import JSON_BACKEND
+from utils.models import Record
+
+BACKENDS = ("auto", "stdlib", "orjson")
+
+
+def _import_orjson():
+    """Import the optional orjson package with a helpful error."""
+    try:
+        import orjson
+    except ImportError as exc:
+        raise ImportError("JSON_BACKEND=orjson requires the 'orjson' package (pip install orjson)") from exc
+    return orjson
+
+
+def _default(value):
+    """Encode values json does not know: slotted records and seed views of them become dicts, seed lists lists."""
+    if isinstance(value, Record) or hasattr(value, "to_dict"):
+        return value.to_dict()
+    if isinstance(value, MutableSequence):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class StdlibSerializer:
+    """Encode and decode with the standard library json module."""
+
+    name = "stdlib"
+
+    def __init__(self):
+        """Build one encoder up front; json.dumps with options would build one per call."""
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_default)
+
+    def dumps(self, value) -> bytes:
+        """Return value as compact UTF-8 JSON bytes."""
+        return self._encoder.encode(value).encode("utf-8")
+
+    def loads(self, data):
+        """Parse JSON from bytes or str."""
+        return json.loads(data)
+
+
+class OrjsonSerializer:
+    """Encode and decode with orjson, which returns UTF-8 bytes directly."""
+
+    name = "orjson"
+
+    def __init__(self):
+        """Bind orjson's functions, failing with ImportError when it is not installed."""
+        orjson = _import_orjson()
+        self._dumps = orjson.dumps
+        self.loads = orjson.loads
+
+    def dumps(self, value) -> bytes:
+        """Return value as compact UTF-8 JSON bytes."""
+        return self._dumps(value, default=_default)
+
+
+def get_serializer(backend=JSON_BACKEND):
+    """Return the serializer for backend; 'auto' prefers orjson and falls back to the stdlib."""
+    if backend not in BACKENDS:
+        raise ValueError(f"JSON backend must be one of {BACKENDS}, got '{backend}'")
+    if backend == "stdlib":
+        return StdlibSerializer()
+    if backend == "orjson":
+        return OrjsonSerializer()
+    try:
+        return OrjsonSerializer()
+    except ImportError:
+        return StdlibSerializer()
+
+
+serializer = get_serializer()
+
+
+def dumps(value) -> bytes:
+    """Encode a request payload with the configured backend."""
+    return serializer.dumps(value)
+
+
+def loads(data):
+    """Decode a response body with the configured backend."""
+    return serializer.loads(data)
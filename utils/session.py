@@ -0,0 +1,126 @@
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from config import (
+    HTTP_KEEP_ALIVE,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+)
+
+_connect_timer = threading.local()
+
+
+def reset_connect_time():
+    """Start a new connect-time measurement for the current thread."""
+    _connect_timer.elapsed = 0.0
+
+
+def get_connect_time():
+    """Return seconds spent opening connections (DNS, TCP, TLS) since the last reset.
+
+    Zero means the call reused a pooled keep-alive connection.
+    """
+    return getattr(_connect_timer, "elapsed", 0.0)
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """HTTP connection that records how long connect() takes."""
+
+    def connect(self):
+        """Open the socket and add the time spent to the thread's connect timer."""
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_timer.elapsed = get_connect_time() + time.perf_counter() - started
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    """HTTPS connection that records how long connect() and the TLS handshake take."""
+
+    def connect(self):
+        """Open the socket, negotiate TLS and add the time spent to the thread's connect timer."""
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_timer.elapsed = get_connect_time() + time.perf_counter() - started
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    """HTTP pool creating timed connections."""
+
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    """HTTPS pool creating timed connections."""
+
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """Transport adapter whose pools report connection setup time."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Swap the default pool classes for timed ones."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+class SessionManager:
+    """Own the process-wide pooled requests.Session shared by API clients."""
+
+    _session = None
+    _pid = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """Return the shared session, creating it on first use or after a fork."""
+        if cls._session is None or cls._pid != os.getpid():
+            with cls._lock:
+                if cls._session is None or cls._pid != os.getpid():
+                    cls._session = cls.create_session()
+                    cls._pid = os.getpid()
+        return cls._session
+
+    @classmethod
+    def close(cls):
+        """Close pooled connections held by the shared session."""
+        with cls._lock:
+            if cls._session is not None and cls._pid == os.getpid():
+                cls._session.close()
+            cls._session = None
+            cls._pid = None
+
+    @staticmethod
+    def create_session(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        keep_alive=HTTP_KEEP_ALIVE,
+    ) -> requests.Session:
+        """Build a session with a sized connection pool."""
+        # The adapter sends every request once. Connection failures are retried
+        # by RetryPolicy in APIRequest, so each attempt passes the circuit breaker.
+        adapter = TimedHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=0,
+        )
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+        return session
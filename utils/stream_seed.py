@@ -0,0 +1,154 @@
+"""Generate and seed very large ServeRest datasets as streams.
+
+Records are generated (or read from NDJSON files), sent and written one at a
+time with at most SEED_STREAM_WINDOW of them in flight, so memory use does not
+grow with the dataset size. Examples::
+
+    python -m utils.stream_seed --users 1000000 --products 1000000 --generate-only --output soak --seed 42
+    python -m utils.stream_seed --input soak --output soak_created --base-uri http://127.0.0.1:3000
+    python -m utils.stream_seed --users 50000 --products 50000 --fake-server
+
+``--output soak`` writes ``tests/data/soak_users.ndjson`` and
+``tests/data/soak_products.ndjson``; created records carry their ``_id``.
+Generated emails and product names never repeat: each carries a running
+number (``ana.lima42.17@example.com``, ``Robust hub 18``) rather than being
+remembered in a set, which would grow with the stream. ``--seed`` (default:
+DATA_SEED, else a fresh seed that is printed) makes the records reproducible.
+"""
+
+import argparse
+import contextlib
+import logging
+import sys
+from collections import Counter
+
+import config
+from fake_serverest import FakeServeRest
+from services.serverest_api.api.products import Products
+from services.serverest_api.api.users import Users
+from utils.bulk_seeder import BulkSeeder
+from utils.data_generator import DataGenerator
+from utils.file_manager import FileManager
+from utils.token_manager import TokenManager
+
+logger = logging.getLogger(__name__)
+
+RESOURCES = ("users", "products")
+
+
+class StreamSeeder:
+    """Create users and products from record streams without materialising them."""
+
+    def __init__(self, base_uri=None, window=config.SEED_STREAM_WINDOW, max_workers=config.SEED_CONCURRENCY):
+        """Target base_uri (default: BASE_URI) with up to window records in flight on max_workers threads."""
+        self.base_uri = base_uri
+        self.window = window
+        self.seeder = BulkSeeder(max_workers)
+        self.created = Counter()
+        self.failed = Counter()
+        self.tokens = TokenManager(base_uri)
+
+    def users(self, records):
+        """Create every user record and yield the created ones with their _id."""
+        return self._create("stream_user", Users(self.base_uri).create_user, records)
+
+    def products(self, records):
+        """Create every product record with a pre-warmed admin token and yield the created ones with their _id.
+
+        Tokens are taken per record from the token manager, which renews them
+        before they expire, so streams longer than a token's life keep working.
+        """
+        client = Products(self.base_uri)
+        return self._create(
+            "stream_product",
+            lambda record: client.create_product(record, self.tokens.admin_token()),
+            records,
+        )
+
+    def prewarm_admins(self, count=1):
+        """Register count fresh admins and log them in for the product stream."""
+        admins = DataGenerator.batch_user_data(count)
+        client = Users(self.base_uri)
+        for admin in admins:
+            admin["administrador"] = "true"
+            response = client.create_user(admin)
+            if response.status_code != 201:
+                raise ValueError(f"Failed to create seeding admin: {response.as_dict}")
+        if self.tokens.prewarm_admins(admins) != count:
+            raise ValueError("Failed to login the seeding admins")
+
+    def _create(self, phase, call, records):
+        """Stream records through call, counting failures instead of stopping on them."""
+        for record, response in self.seeder.stream(phase, call, records, window=self.window):
+            record_id = (response.as_dict or {}).get("_id")
+            if response.status_code != 201 or not record_id:
+                self.failed[phase] += 1
+                logger.warning(f"Seeding phase '{phase}' rejected a record: {response.as_dict}")
+                continue
+            self.created[phase] += 1
+            yield {**record, "_id": record_id}
+
+
+def drain(records, output, resource):
+    """Consume records, writing them to '<output>_<resource>.ndjson' when output is set; return the count."""
+    if output:
+        return FileManager.write_ndjson(f"{output}_{resource}", records)
+    return sum(1 for _ in records)
+
+
+def main(argv=None):
+    """Parse arguments, stream the datasets and print per-resource counts; return an exit code."""
+    parser = argparse.ArgumentParser(description="Generate and seed large ServeRest datasets as streams.")
+    parser.add_argument("--users", type=int, default=0, help="user records to generate")
+    parser.add_argument("--products", type=int, default=0, help="product records to generate")
+    parser.add_argument("--input", help="read '<input>_users.ndjson' and '<input>_products.ndjson' instead")
+    parser.add_argument("--output", help="write records to '<output>_users.ndjson' and '<output>_products.ndjson'")
+    parser.add_argument("--generate-only", action="store_true", help="write generated records without seeding")
+    parser.add_argument("--seed", type=int, default=config.DATA_SEED, help="seed for generated records")
+    parser.add_argument("--admins", type=int, default=1, help="admin tokens products are created with")
+    parser.add_argument("--window", type=int, default=config.SEED_STREAM_WINDOW, help="records in flight")
+    parser.add_argument("--base-uri", default=config.BASE_URI, help="API to seed (default: BASE_URI)")
+    parser.add_argument("--fake-server", action="store_true", help="seed a local in-memory ServeRest instead")
+    args = parser.parse_args(argv)
+    if args.generate_only and not args.output:
+        parser.error("--generate-only requires --output")
+    if args.generate_only and args.input:
+        parser.error("--generate-only cannot be combined with --input")
+    if args.window < 1:
+        parser.error("--window must be at least 1")
+    if args.admins < 1:
+        parser.error("--admins must be at least 1")
+
+    seed = DataGenerator.seed(args.seed, sequential=True)
+    print(f"data seed: {seed}")
+
+    def source(resource):
+        """Return the record stream for resource."""
+        if args.input:
+            return FileManager.read_ndjson(f"{args.input}_{resource}")
+        if resource == "users":
+            return DataGenerator.iter_user_data(args.users)
+        return DataGenerator.iter_product_data(args.products)
+
+    if args.generate_only:
+        for resource in RESOURCES:
+            print(f"{resource:<9} {drain(source(resource), args.output, resource):>9} written")
+        return 0
+
+    with FakeServeRest() if args.fake_server else contextlib.nullcontext() as server:
+        seeder = StreamSeeder(server.url if server else args.base_uri, window=args.window)
+        drain(seeder.users(source("users")), args.output, "users")
+        seeder.prewarm_admins(args.admins)
+        drain(seeder.products(source("products")), args.output, "products")
+        seeder.tokens.close()
+
+    timings = BulkSeeder.summary()
+    for resource, phase in zip(RESOURCES, ("stream_user", "stream_product"), strict=True):
+        timing = timings.get(phase)
+        rate = f"{timing.rate:>9.1f}/s" if timing else ""
+        print(f"{resource:<9} {seeder.created[phase]:>9} created {seeder.failed[phase]:>7} failed {rate}")
+    return 1 if sum(seeder.failed.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+import gzip
+import io
+from pathlib import Path
+
+from config import STRUCTURED_LOG_COMPRESSION, STRUCTURED_LOG_MAX_BYTES
+
+EXTENSIONS = {"none": ".jsonl", "gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+
+def _import_zstandard():
+    """Import the optional zstandard package with a helpful error."""
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise ImportError("zstd compression requires the 'zstandard' package (pip install zstandard)") from exc
+    return zstandard
+
+
+def open_log(path, mode="r"):
+    """Open a plain, gzip or zstd JSON Lines file as a text stream.
+
+    The compression is picked from the file extension; mode is "r" or "w".
+    """
+    path = Path(path)
+    if path.suffix == ".gz":
+        return gzip.open(path, f"{mode}t", encoding="utf-8")
+    if path.suffix == ".zst":
+        zstandard = _import_zstandard()
+        # The zstd stream takes ownership of the raw file and closes it
+        raw = open(path, f"{mode}b")  # noqa: SIM115
+        if mode == "r":
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        else:
+            stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class RotatingLogStream:
+    """Writable text stream that starts a new numbered file after max_bytes.
+
+    Files are named ``<prefix>_0000.jsonl[.gz|.zst]``, ``<prefix>_0001...``
+    so a lexical sort returns them in write order.
+    """
+
+    def __init__(
+        self,
+        directory,
+        prefix,
+        compression=STRUCTURED_LOG_COMPRESSION,
+        max_bytes=STRUCTURED_LOG_MAX_BYTES,
+    ):
+        """Configure naming, compression and the rotation threshold."""
+        if compression not in EXTENSIONS:
+            raise ValueError(f"compression must be one of {tuple(EXTENSIONS)}, got '{compression}'")
+        if compression == "zstd":
+            _import_zstandard()
+
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.extension = EXTENSIONS[compression]
+        self.max_bytes = max_bytes
+        self.index = 0
+        self._stream = None
+        self._written = 0
+
+    def write(self, text):
+        """Write text, rotating first if it would push the file past max_bytes."""
+        if not text:
+            return 0
+        size = len(text.encode("utf-8"))
+        if self._stream is None or (self._written and self._written + size > self.max_bytes):
+            self._rotate()
+        self._written += size
+        return self._stream.write(text)
+
+    def flush(self):
+        """Flush the current file so readers can see complete records."""
+        if self._stream is not None:
+            self._stream.flush()
+
+    def close(self):
+        """Close the current file."""
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def __enter__(self):
+        """Support use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the stream when leaving the context."""
+        self.close()
+
+    def _rotate(self):
+        """Close the current file and open the next one."""
+        self.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{self.prefix}_{self.index:04d}{self.extension}"
+        self.index += 1
+        self._stream = open_log(path, "w")
+        self._written = 0
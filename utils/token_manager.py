@@ -0,0 +1,299 @@
+import base64
+import heapq
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, fields
+
+import config
+from config import TOKEN_AUTO_REFRESH, TOKEN_REFRESH_MARGIN, TOKEN_TTL
+from services.serverest_api.api.login import Login
+from utils.bulk_seeder import BulkSeeder
+from utils.metrics import attribute_to
+from utils.request import APIResponse
+from utils.serializer import loads
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TokenStats:
+    """Counters of a TokenManager; refresh_time is the seconds spent renewing tokens."""
+
+    hits: int = 0
+    logins: int = 0
+    refreshes: int = 0
+    failures: int = 0
+    refresh_time: float = 0.0
+
+    def merge(self, other):
+        """Add the counters of other, e.g. from a pytest-xdist worker."""
+        for field in fields(self):
+            setattr(self, field.name, getattr(self, field.name) + getattr(other, field.name))
+
+
+@dataclass
+class TokenEntry:
+    """One cached login: the response, its token and when to renew it."""
+
+    response: APIResponse
+    authorization: str
+    expires: float
+    refresh_at: float
+
+
+def token_expiry(authorization, issued_at, default_ttl=TOKEN_TTL):
+    """Return when authorization expires: the exp claim of a JWT, else issued_at + default_ttl."""
+    _, _, token = authorization.partition(" ")
+    parts = (token or authorization).split(".")
+    if len(parts) == 3:
+        try:
+            claims = loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+            return float(claims["exp"])
+        except (ValueError, TypeError, KeyError):
+            pass
+    return issued_at + default_ttl
+
+
+class TokenManager:
+    """Thread-safe cache of login tokens per credential, renewed before they expire.
+
+    ``login`` and ``login_many`` answer from the cache while a token is fresh
+    and only call POST /login for credentials without one. A token is renewed
+    ``refresh_margin`` seconds before it expires (or half way through its life
+    when that is shorter): by a background thread when ``auto_refresh`` is on,
+    otherwise by the next call that needs it. ``prewarm_admins`` logs admin
+    users in up front and ``admin_token`` hands their tokens out in turn.
+    """
+
+    _shared = None
+    _pid = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        base_uri=None,
+        refresh_margin=TOKEN_REFRESH_MARGIN,
+        default_ttl=TOKEN_TTL,
+        auto_refresh=TOKEN_AUTO_REFRESH,
+        clock=time.time,
+    ):
+        """Cache tokens of base_uri (default: BASE_URI when logging in) and renew them refresh_margin seconds early."""
+        if refresh_margin < 0:
+            raise ValueError("refresh_margin must not be negative")
+        if default_ttl <= 0:
+            raise ValueError("default_ttl must be positive")
+        self.base_uri = base_uri
+        self.refresh_margin = refresh_margin
+        self.default_ttl = default_ttl
+        self.auto_refresh = auto_refresh
+        self.clock = clock
+        self.stats = TokenStats()
+        self._entries = {}
+        self._heap = []
+        self._admins = []
+        self._next_admin = 0
+        self._condition = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    @classmethod
+    def shared(cls):
+        """Return the process-wide token manager."""
+        if cls._shared is None or cls._pid != os.getpid():
+            with cls._shared_lock:
+                if cls._shared is None or cls._pid != os.getpid():
+                    cls._shared = cls()
+                    cls._pid = os.getpid()
+        return cls._shared
+
+    @classmethod
+    def close_shared(cls):
+        """Stop the refresher of the process-wide manager, if one was created in this process."""
+        if cls._shared is not None and cls._pid == os.getpid():
+            cls._shared.close()
+
+    def login(self, credentials) -> APIResponse:
+        """Return the login response for credentials (a user record or login payload), from the cache while fresh."""
+        return self.login_many([credentials])[0]
+
+    def login_many(self, credentials_list) -> list:
+        """Return login responses in the order of credentials_list; only missing tokens are requested, concurrently."""
+        credentials_list = [_payload(credentials) for credentials in credentials_list]
+        responses = [None] * len(credentials_list)
+        missing = []
+        with self._condition:
+            now = self.clock()
+            for position, credentials in enumerate(credentials_list):
+                entry = self._entries.get(self._key(credentials))
+                if entry is not None and entry.refresh_at > now:
+                    self.stats.hits += 1
+                    responses[position] = _copy(entry.response)
+                else:
+                    missing.append(position)
+
+        fresh = self._request([credentials_list[position] for position in missing], "login")
+        for position, response in zip(missing, fresh, strict=True):
+            responses[position] = response
+        return responses
+
+    def token(self, credentials) -> str:
+        """Return a fresh token for credentials, logging in when needed."""
+        response = self.login(credentials)
+        authorization = response.as_dict.get("authorization")
+        if response.status_code != 200 or not authorization:
+            raise ValueError(f"Failed to login user {credentials.get('email')}: {response.as_dict}")
+        return authorization
+
+    def prewarm_admins(self, users) -> int:
+        """Log the admin users among users in and add them to the admin pool; return how many were added."""
+        admins = [_payload(user) for user in users if user.get("administrador") == "true"]
+        warmed = 0
+        for credentials, response in zip(admins, self.login_many(admins), strict=True):
+            if response.status_code != 200 or "authorization" not in response.as_dict:
+                logger.warning(f"Could not pre-warm admin {credentials['email']}: {response.as_dict}")
+                continue
+            with self._condition:
+                if credentials not in self._admins:
+                    self._admins.append(credentials)
+                    warmed += 1
+        return warmed
+
+    def admin_token(self) -> str:
+        """Return the token of the next pre-warmed admin, round robin."""
+        with self._condition:
+            if not self._admins:
+                raise ValueError("No admin tokens pre-warmed. Call prewarm_admins with admin users first.")
+            credentials = self._admins[self._next_admin % len(self._admins)]
+            self._next_admin += 1
+        return self.token(credentials)
+
+    def discard(self, credentials):
+        """Forget the cached token of credentials, e.g. after a 401 or a password change."""
+        with self._condition:
+            self._entries.pop(self._key(_payload(credentials)), None)
+
+    def clear(self):
+        """Forget every cached token and the admin pool; counters are kept."""
+        with self._condition:
+            self._entries.clear()
+            self._heap.clear()
+            self._admins.clear()
+
+    def close(self):
+        """Stop the background refresher."""
+        with self._condition:
+            self._closed = True
+            thread, self._thread = self._thread, None
+            self._condition.notify_all()
+        if thread is not None:
+            thread.join()
+
+    def __len__(self):
+        """Return the number of cached tokens."""
+        return len(self._entries)
+
+    def _key(self, credentials):
+        """Return the cache key of credentials: API address, email and password."""
+        return self.base_uri or config.BASE_URI, credentials["email"], credentials["password"]
+
+    def _request(self, credentials_list, phase):
+        """POST /login for every credential concurrently and cache the tokens received."""
+        if not credentials_list:
+            return []
+        login = Login(self.base_uri).login
+        if phase == "token_refresh":
+            login = _attributed(login, phase)
+        # Renewals are not seeding: they are timed in stats.refresh_time instead of the bulk-seeding summary
+        started = time.perf_counter()
+        responses = BulkSeeder(record_timings=phase != "token_refresh").run(phase, login, credentials_list)
+        elapsed = time.perf_counter() - started
+        with self._condition:
+            if phase == "token_refresh":
+                self.stats.refresh_time += elapsed
+            now = self.clock()
+            for credentials, response in zip(credentials_list, responses, strict=True):
+                key = self._key(credentials)
+                authorization = response.as_dict.get("authorization") if response.status_code == 200 else None
+                if not authorization:
+                    self.stats.failures += 1
+                    self._entries.pop(key, None)
+                    continue
+                if phase == "login":
+                    self.stats.logins += 1
+                else:
+                    self.stats.refreshes += 1
+                expires = token_expiry(authorization, now, self.default_ttl)
+                if expires <= now:
+                    # Already expired by our clock, e.g. skewed from the server's: not worth caching
+                    self._entries.pop(key, None)
+                    continue
+                refresh_at = expires - min(self.refresh_margin, (expires - now) / 2)
+                self._entries[key] = TokenEntry(_copy(response), authorization, expires, refresh_at)
+                heapq.heappush(self._heap, (refresh_at, key))
+            if self.auto_refresh and self._entries:
+                self._ensure_started()
+            self._condition.notify_all()
+        return responses
+
+    def _ensure_started(self):
+        """Start the refresher thread on first use; the caller holds the condition."""
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(target=self._run, name="token-refresh", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """Renew tokens as they reach their refresh time."""
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        return
+                    due = self._due(self.clock())
+                    if due:
+                        break
+                    self._condition.wait(self._heap[0][0] - self.clock() if self._heap else None)
+            try:
+                self._request([{"email": email, "password": password} for _, email, password in due], "token_refresh")
+            except Exception as exc:
+                # Entries stay stale, so the next caller logs in on its own
+                logger.warning(f"Background token refresh failed: {exc!r}")
+
+    def _due(self, now):
+        """Pop the keys whose cached token should be renewed by now; the caller holds the condition."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            refresh_at, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            # Skip heap items superseded by a newer login or dropped entries
+            if entry is not None and entry.refresh_at == refresh_at:
+                due.append(key)
+        return due
+
+
+def _attributed(function, operation):
+    """Wrap function so its requests are recorded under operation, in whichever thread it runs."""
+
+    def call(*args, **kwargs):
+        with attribute_to(operation):
+            return function(*args, **kwargs)
+
+    return call
+
+
+def _payload(credentials):
+    """Return the POST /login body of a user record or login payload."""
+    return {"email": credentials["email"], "password": credentials["password"]}
+
+
+def _copy(response):
+    """Return a new APIResponse over the same bytes, so callers never share a parsed body."""
+    return APIResponse(
+        response.status_code,
+        response.content,
+        response.headers,
+        response.elapsed,
+        response.connect_time,
+        response.encoding,
+    )
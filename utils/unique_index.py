@@ -0,0 +1,86 @@
+import itertools
+
+
+class UniqueIndex:
+    """Hand out values that were never handed out before, in O(1) per claim.
+
+    Values live in a hash set. A colliding value gets the next free numbered
+    variant (``make_variant(value, 2)``, ``3``, ...). The last number used for
+    each base value is remembered, so repeated collisions on one value do not
+    rescan the numbers already taken. An index only knows its own process's
+    values; concurrent processes keep theirs apart with a namespace (see
+    DataGenerator.seed).
+    """
+
+    def __init__(self, make_variant):
+        """Build variants of a taken value with make_variant(value, number)."""
+        self.make_variant = make_variant
+        self._taken = set()
+        self._last_number = {}
+
+    def claim(self, value):
+        """Reserve and return value, or its first free numbered variant when value is taken."""
+        if value not in self._taken:
+            self._taken.add(value)
+            return value
+
+        number = self._last_number.get(value, 1)
+        while True:
+            number += 1
+            candidate = self.make_variant(value, number)
+            if candidate not in self._taken:
+                break
+        self._last_number[value] = number
+        self._taken.add(candidate)
+        return candidate
+
+    def add(self, value):
+        """Mark value as taken, e.g. when it already exists on the server."""
+        self._taken.add(value)
+
+    def clear(self):
+        """Forget every claimed value."""
+        self._taken.clear()
+        self._last_number.clear()
+
+    def __contains__(self, value):
+        """Report whether value was claimed or added."""
+        return value in self._taken
+
+    def __len__(self):
+        """Return how many values are taken."""
+        return len(self._taken)
+
+
+class SequenceIndex:
+    """Hand out unique values without remembering them, in O(1) memory.
+
+    Every claimed value gets the next running number as its variant
+    (``make_variant(value, 1)``, ``2``, ...), so no two claims are equal
+    whatever the base values are. Used for streams too long to keep every
+    value in a set, at the price of a number on every value.
+    """
+
+    def __init__(self, make_variant):
+        """Build the claimed values with make_variant(value, number)."""
+        self.make_variant = make_variant
+        self._count = itertools.count(1)
+
+    def claim(self, value):
+        """Return value with the next running number."""
+        return self.make_variant(value, next(self._count))
+
+    def clear(self):
+        """Start numbering from 1 again."""
+        self._count = itertools.count(1)
+
+
+def email_variant(email, number):
+    """Return email with number (or a namespace tag) appended to its local part: a.b@x.com -> a.b.2@x.com."""
+    local, _, domain = email.partition("@")
+    return f"{local}.{number}@{domain}"
+
+
+def name_variant(name, number):
+    """Return name with number (or a namespace tag) appended: 'Robust hub' -> 'Robust hub 2'."""
+    return f"{name} {number}"